@@ -0,0 +1,295 @@
+import json
+from datetime import date
+from itertools import islice
+
+from flask import Blueprint, Response, current_app, request, stream_with_context
+
+from models import Venue, Artist
+from queries import (VENUE_FIELDS, ARTIST_FIELDS, venue_detail, artist_detail, entity_rows,
+                     related_shows, encode_id_cursor, decode_id_cursor, show_page, show_window,
+                     window_args, show_days)
+from routing import read_only
+from scheduling import schedule_shows
+from search import find_venues, find_artists, find_all
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+api = Blueprint('api', __name__, url_prefix='/api/v1')
+
+SHOW_FIELDS = ['venue_id', 'venue_name', 'artist_id', 'artist_name', 'artist_image_link',
+               'start_time']
+SEARCH_FIELDS = ['id', 'name', 'num_upcoming_shows']
+COMBINED_SEARCH_FIELDS = ['type', 'id', 'name', 'city', 'state', 'num_upcoming_shows']
+EMBEDS = ['shows']
+EMBEDDED_SHOWS = ('past_shows', 'upcoming_shows')
+
+#----------------------------------------------------------------------------#
+# Serialization.
+#----------------------------------------------------------------------------#
+
+def _default(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError('{!r} is not JSON serializable'.format(value))
+
+
+def dumps(value):
+    # orjson when installed (it serializes datetimes natively), else the
+    # standard library with the same compact output.
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, separators=(',', ':')).encode()
+
+
+def _json(value, status=200):
+    return Response(dumps(value), status=status, mimetype='application/json')
+
+
+def _error(status, message):
+    return _json({'error': message}, status)
+
+
+def _stream(items, trailer, buffer_size=65536):
+    # {"data":[...],<trailer>} written as the items are produced, in chunks
+    # of about `buffer_size` bytes. `trailer` is called once the items are
+    # exhausted (e.g. to report the next cursor).
+    buffer = [b'{"data":[']
+    size = 0
+    for i, item in enumerate(items):
+        chunk = dumps(item)
+        buffer.append(b',' + chunk if i else chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            yield b''.join(buffer)
+            buffer, size = [], 0
+    buffer.append(b'],' + dumps(trailer())[1:])
+    yield b''.join(buffer)
+
+#----------------------------------------------------------------------------#
+# Request arguments.
+#----------------------------------------------------------------------------#
+
+class BadRequest(ValueError):
+    pass
+
+
+def _fields(allowed):
+    # ?fields=id,name: a subset of `allowed`, in the requested order.
+    raw = request.args.get('fields')
+    if not raw:
+        return list(allowed)
+    fields = [field.strip() for field in raw.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise BadRequest('unknown fields: {}; allowed: {}'.format(
+            ', '.join(unknown), ', '.join(allowed)))
+    return fields
+
+
+def _embeds():
+    embeds = [embed for embed in request.args.get('embed', '').split(',') if embed]
+    unknown = [embed for embed in embeds if embed not in EMBEDS]
+    if unknown:
+        raise BadRequest('unknown embeds: {}; allowed: {}'.format(
+            ', '.join(unknown), ', '.join(EMBEDS)))
+    return embeds
+
+
+def _limit():
+    limit = request.args.get('limit', current_app.config['API_PER_PAGE'], type=int)
+    return max(1, min(limit, current_app.config['API_MAX_PER_PAGE']))
+
+
+def _only(item, fields):
+    # `item` is a dict or a record of readmodels.py.
+    if not isinstance(item, dict):
+        item = item._asdict()
+    return {field: _records(item[field]) if field in EMBEDDED_SHOWS else item[field]
+            for field in fields}
+
+
+def _records(shows):
+    # The records of readmodels.py are namedtuples, which would be written
+    # as arrays.
+    return [show._asdict() for show in shows]
+
+
+@api.errorhandler(BadRequest)
+def bad_request(error):
+    return _error(400, str(error))
+
+#----------------------------------------------------------------------------#
+# Venues and artists.
+#----------------------------------------------------------------------------#
+
+def _with_shows(model, items, chunk):
+    # Adds past_shows/upcoming_shows to each item, one query per `chunk`.
+    while True:
+        batch = list(islice(items, chunk))
+        if not batch:
+            return
+        shows = related_shows(model, [item['id'] for item in batch])
+        for item in batch:
+            item['past_shows'], item['upcoming_shows'] = shows[item['id']]
+            yield item
+
+
+def _collection(model, allowed):
+    fields = _fields(allowed)
+    embeds = _embeds()
+    limit = _limit()
+    try:
+        after = request.args.get('after')
+        after_id = decode_id_cursor(after) if after else None
+    except ValueError as e:
+        raise BadRequest(str(e))
+    chunk = current_app.config['API_STREAM_CHUNK']
+    # One row past the page tells whether there is a next one.
+    rows = entity_rows(model, fields, after_id, limit + 1, chunk)
+    if 'shows' in embeds:
+        rows = _with_shows(model, rows, chunk)
+        fields = fields + list(EMBEDDED_SHOWS)
+
+    cursor = {'next_cursor': None}
+
+    def items():
+        last = None
+        for i, row in enumerate(rows):
+            if i == limit:
+                cursor['next_cursor'] = encode_id_cursor(last)
+                return
+            last = row['id']
+            yield _only(row, fields)
+
+    return Response(stream_with_context(_stream(items(), lambda: cursor)),
+                    mimetype='application/json')
+
+
+def _detail(item, allowed):
+    if item is None:
+        return _error(404, 'not found')
+    fields = _fields(allowed)
+    if 'shows' in _embeds():
+        fields = fields + list(EMBEDDED_SHOWS)
+    return _json({'data': _only(item, fields)})
+
+
+@api.route('/venues')
+@read_only
+def venues():
+    return _collection(Venue, VENUE_FIELDS)
+
+
+@api.route('/venues/<int:venue_id>')
+@read_only
+def venue(venue_id):
+    return _detail(venue_detail(venue_id), VENUE_FIELDS)
+
+
+@api.route('/artists')
+@read_only
+def artists():
+    return _collection(Artist, ARTIST_FIELDS)
+
+
+@api.route('/artists/<int:artist_id>')
+@read_only
+def artist(artist_id):
+    return _detail(artist_detail(artist_id), ARTIST_FIELDS)
+
+#----------------------------------------------------------------------------#
+# Shows.
+#----------------------------------------------------------------------------#
+
+def _window(required=False):
+    # The ShowWindow of ?from=&to=&city=: None without them, or from today
+    # if `required`.
+    start = request.args.get('from') or (date.today().isoformat() if required else None)
+    try:
+        return show_window(start, request.args.get('to'), request.args.get('city'),
+                           default_days=current_app.config['CALENDAR_DEFAULT_DAYS'],
+                           max_days=current_app.config['CALENDAR_MAX_DAYS'])
+    except ValueError as e:
+        raise BadRequest(str(e))
+
+
+@api.route('/shows')
+@read_only
+def shows():
+    fields = _fields(SHOW_FIELDS)
+    window = _window()
+    try:
+        shows, pager = show_page(_limit(), after=request.args.get('after'),
+                                 before=request.args.get('before'),
+                                 chunk=current_app.config['API_STREAM_CHUNK'], window=window)
+    except ValueError as e:
+        raise BadRequest(str(e))
+    items = (_only(show, fields) for show in shows)
+    return Response(stream_with_context(_stream(items, lambda: pager)),
+                    mimetype='application/json')
+
+
+@api.route('/shows/days')
+@read_only
+def show_day_counts():
+    # The number of shows on each day of ?from=&to=&city= that has any,
+    # from today when no range is given.
+    window = _window(required=True)
+    return _json(dict(window_args(window), data=[{'date': day, 'shows': count}
+                                                 for day, count in show_days(window)]))
+
+
+@api.route('/shows', methods=['POST'])
+def schedule():
+    # Body: a list of {venue_id, artist_id, start_time}, or {"shows": [...]}.
+    # All or nothing: 201 with the created shows, or 422 with the rejected
+    # rows and nothing scheduled.
+    body = request.get_json(silent=True)
+    rows = body.get('shows') if isinstance(body, dict) else body
+    if not isinstance(rows, list) or not rows:
+        raise BadRequest('expected a non-empty JSON list of shows')
+    limit = current_app.config['SCHEDULE_MAX_BATCH']
+    if len(rows) > limit:
+        raise BadRequest('at most {} shows per request'.format(limit))
+    created, rejects = schedule_shows(rows)
+    if rejects:
+        return _json({'error': 'no shows were scheduled', 'rejects': rejects}, 422)
+    return _json({'data': created}, 201)
+
+#----------------------------------------------------------------------------#
+# Search.
+#----------------------------------------------------------------------------#
+
+def _search_term():
+    return request.args.get('q', request.args.get('search_term', ''))
+
+
+@api.route('/venues/search')
+@read_only
+def search_venues():
+    fields = _fields(SEARCH_FIELDS)
+    results = find_venues(_search_term())
+    return _json({'count': results['count'],
+                  'data': [_only(item, fields) for item in results['data']]})
+
+
+@api.route('/artists/search')
+@read_only
+def search_artists():
+    fields = _fields(SEARCH_FIELDS)
+    results = find_artists(_search_term())
+    return _json({'count': results['count'],
+                  'data': [_only(item, fields) for item in results['data']]})
+
+
+@api.route('/search')
+@read_only
+def search():
+    fields = _fields(COMBINED_SEARCH_FIELDS)
+    page = max(1, request.args.get('page', 1, type=int))
+    results = find_all(_search_term(), page)
+    results['data'] = [_only(item, fields) for item in results['data']]
+    return _json(results)
@@ -0,0 +1,194 @@
+#----------------------------------------------------------------------------#
+# ASGI entry point.
+#
+#   uvicorn asgi:application
+#
+# The read pages (/venues, /artists, /shows and the venue and artist pages)
+# are served from async_queries on the event loop, so a slow query only
+# holds its own request; /venues and /artists are streamed, LISTING_CHUNK
+# rows at a time, through Jinja's async mode. Everything else (forms,
+# writes, the JSON API, static files) goes to the Flask app on a thread
+# pool.
+#----------------------------------------------------------------------------#
+
+import asyncio
+import io
+import re
+
+from flask import render_template, request, session
+from uvicorn.middleware.wsgi import WSGIMiddleware, build_environ
+
+import async_queries
+from app import app
+from queries import show_window, window_args, show_calendar
+
+async_queries.init_engine(app.config)
+sync_application = WSGIMiddleware(app, workers=app.config['ASGI_SYNC_THREADS'])
+
+#----------------------------------------------------------------------------#
+# Pages.
+#----------------------------------------------------------------------------#
+
+# Each page returns (status, body), or None to hand the request to the
+# Flask app instead. The body is the html, or for the listings an async
+# iterator of it, rendered as the rows stream in.
+
+# Jinja in async mode, so templates can loop over async iterators. Its own
+# template cache: compiled templates differ between the two modes. (Jinja
+# 3.0's overlay() doesn't take enable_async, which just sets is_async.)
+async_jinja_env = app.jinja_env.overlay(cache_size=400)
+async_jinja_env.is_async = True
+
+async def stream_template(template_name, **context):
+  # views.stream_template on the event loop: the html in pieces of about
+  # STREAM_BUFFER_SIZE characters. Closing the render generator on the way
+  # out closes the server-side cursors of its loops.
+  app.update_template_context(context)
+  pieces = async_jinja_env.get_template(template_name).generate_async(context)
+  size = app.config['STREAM_BUFFER_SIZE']
+  buffer, buffered = [], 0
+  try:
+    async for piece in pieces:
+      buffer.append(piece)
+      buffered += len(piece)
+      if buffered >= size:
+        yield ''.join(buffer)
+        buffer, buffered = [], 0
+    yield ''.join(buffer)
+  finally:
+    await pieces.aclose()
+
+async def venues():
+  areas = async_queries.venue_directory(app.config['LISTING_CHUNK'])
+  return 200, stream_template('pages/venues.html', areas=areas)
+
+async def artists():
+  data = async_queries.artist_list(app.config['LISTING_CHUNK'])
+  return 200, stream_template('pages/artists.html', artists=data)
+
+async def shows():
+  per_page = request.args.get('per_page', app.config['SHOWS_PER_PAGE'], type=int)
+  per_page = max(1, min(per_page, app.config['SHOWS_MAX_PER_PAGE']))
+  try:
+    window = show_window(request.args.get('from'), request.args.get('to'), request.args.get('city'),
+                         default_days=app.config['CALENDAR_DEFAULT_DAYS'],
+                         max_days=app.config['CALENDAR_MAX_DAYS'])
+    page = async_queries.show_page(
+      per_page, after=request.args.get('after'), before=request.args.get('before'), window=window)
+    if window is None:
+      (data, pager), months = await page, None
+    else:
+      (data, pager), days = await asyncio.gather(page, async_queries.show_days(window))
+      months = show_calendar(window, days)
+  except ValueError:
+    return None
+  return 200, render_template('pages/shows.html', shows=data, pager=pager, per_page=per_page,
+                              window=window, window_args=window_args(window) if window else {},
+                              months=months)
+
+async def show_venue(venue_id):
+  data = await async_queries.venue_detail(int(venue_id))
+  if data is None:
+    return 404, render_template('errors/404.html')
+  return 200, render_template('pages/show_venue.html', venue=data)
+
+async def show_artist(artist_id):
+  data = await async_queries.artist_detail(int(artist_id))
+  if data is None:
+    return 404, render_template('errors/404.html')
+  return 200, render_template('pages/show_artist.html', artist=data)
+
+ROUTES = [
+  (re.compile(r'/venues$'), venues),
+  (re.compile(r'/artists$'), artists),
+  (re.compile(r'/shows$'), shows),
+  (re.compile(r'/venues/(\d+)$'), show_venue),
+  (re.compile(r'/artists/(\d+)$'), show_artist),
+]
+
+#----------------------------------------------------------------------------#
+# Application.
+#----------------------------------------------------------------------------#
+
+def _route(scope):
+  if scope['method'] != 'GET':
+    return None, None
+  for pattern, page in ROUTES:
+    match = pattern.match(scope['path'])
+    if match:
+      return page, match
+  return None, None
+
+async def _serve(scope, send, page, match):
+  # Runs the page inside a Flask request context, for url_for, request.args
+  # and the session in the templates, and sends its response. False hands
+  # the request to the Flask app.
+  ctx = app.request_context(build_environ(scope, {'type': 'http.request'}, io.BytesIO()))
+  ctx.push()
+  try:
+    # Pending flash messages are shown and cleared by the Flask app, which
+    # saves the session afterwards.
+    if session.get('_flashes'):
+      return False
+    try:
+      result = await page(*match.groups())
+      if result is None:
+        return False
+      status, body = result
+      if isinstance(body, str):
+        await _send(send, status, body)
+        return True
+      # The first piece runs the first query, so a failing one still gets
+      # the error page.
+      first = await body.__anext__()
+    except Exception:
+      app.logger.exception('Exception on %s [GET]', scope['path'])
+      await _send(send, 500, render_template('errors/500.html'))
+      return True
+    await _send_stream(scope, send, status, first, body)
+    return True
+  finally:
+    ctx.pop()
+
+def _start(status, *headers):
+  return {
+    'type': 'http.response.start',
+    'status': status,
+    'headers': [(b'content-type', b'text/html; charset=utf-8'), *headers],
+  }
+
+async def _send(send, status, html):
+  body = html.encode('utf-8')
+  await send(_start(status, (b'content-length', str(len(body)).encode())))
+  await send({'type': 'http.response.body', 'body': body})
+
+async def _send_stream(scope, send, status, first, pieces):
+  await send(_start(status))
+  try:
+    await send({'type': 'http.response.body', 'body': first.encode('utf-8'), 'more_body': True})
+    async for piece in pieces:
+      await send({'type': 'http.response.body', 'body': piece.encode('utf-8'), 'more_body': True})
+  except Exception:
+    # Too late for the error page; the response is cut short.
+    app.logger.exception('Exception on %s [GET]', scope['path'])
+  finally:
+    await pieces.aclose()
+  await send({'type': 'http.response.body', 'body': b''})
+
+async def _lifespan(receive, send):
+  while True:
+    message = await receive()
+    if message['type'] == 'lifespan.startup':
+      await send({'type': 'lifespan.startup.complete'})
+    elif message['type'] == 'lifespan.shutdown':
+      await async_queries.dispose_engine()
+      await send({'type': 'lifespan.shutdown.complete'})
+      return
+
+async def application(scope, receive, send):
+  if scope['type'] == 'lifespan':
+    return await _lifespan(receive, send)
+
+  page, match = _route(scope) if scope['type'] == 'http' else (None, None)
+  if not (page and await _serve(scope, send, page, match)):
+    return await sync_application(scope, receive, send)
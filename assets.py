@@ -0,0 +1,272 @@
+import glob
+import gzip
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import re
+import shutil
+
+import click
+from flask import current_app, request, send_from_directory, url_for
+from flask.cli import AppGroup
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+#----------------------------------------------------------------------------#
+# Static assets.
+#----------------------------------------------------------------------------#
+
+# `flask assets build` turns the sources under static/ into a build in
+# static/<ASSETS_DIR>. The build holds minified bundles, copies and image
+# variants under content-hashed names, plus a manifest.json. Text files
+# also get .gz (and .br, with the brotli package) twins. Built files are
+# served with far-future immutable caching and the best precompressed
+# encoding the client accepts. Pages link the build through asset_urls()
+# and asset_srcset(). Before the first build, or with ASSETS_BUILD off, they
+# link the source files instead.
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.map')
+
+# (encoding, suffix, compress), in order of preference.
+ENCODINGS = [('gzip', '.gz', lambda data: gzip.compress(data, 9, mtime=0))]
+if brotli is not None:
+    ENCODINGS.insert(0, ('br', '.br', lambda data: brotli.compress(data, quality=11)))
+
+
+class Assets:
+    def __init__(self):
+        self.manifest = None
+
+    def init_app(self, app):
+        self.folder = os.path.join(app.static_folder, app.config['ASSETS_DIR'])
+        manifest = os.path.join(self.folder, 'manifest.json')
+        if app.config['ASSETS_BUILD'] and os.path.exists(manifest):
+            with open(manifest) as f:
+                self.manifest = json.load(f)
+        app.extensions['assets'] = self
+        # Matched ahead of the app's /static rule, whose static prefix is
+        # shorter.
+        app.add_url_rule('{}/{}/<path:filename>'.format(app.static_url_path, app.config['ASSETS_DIR']),
+                         'assets', self.send)
+        app.jinja_env.globals.update(asset_urls=self.urls, asset_srcset=self.srcset)
+
+    def urls(self, name):
+        # The URLs to link for a bundle or a single file: its build, or its
+        # sources when there is no build.
+        if self.manifest is not None and name in self.manifest['files']:
+            return [url_for('assets', filename=self.manifest['files'][name])]
+        sources = current_app.config['ASSET_BUNDLES'].get(name, [name])
+        return [url_for('static', filename=source) for source in sources]
+
+    def srcset(self, name, format):
+        # "url 480w, url 960w, ..." for the `format` variants of an image;
+        # empty when there is no build.
+        if self.manifest is None:
+            return ''
+        variants = self.manifest['images'].get(name, {}).get(format, [])
+        return ', '.join('{} {}w'.format(url_for('assets', filename=filename), width)
+                         for width, filename in variants)
+
+    def send(self, filename):
+        # Built names change with their content, so they can be cached for
+        # good; encodings are picked per request from the .br/.gz twins.
+        encodings = self.manifest['encodings'].get(filename, []) if self.manifest else []
+        encoding = next((encoding for encoding in encodings
+                         if request.accept_encodings[encoding]), None)
+        suffix = {encoding: suffix for encoding, suffix, _ in ENCODINGS}.get(encoding, '')
+        response = send_from_directory(self.folder, filename + suffix,
+                                       mimetype=mimetypes.guess_type(filename)[0],
+                                       max_age=current_app.config['ASSETS_MAX_AGE'])
+        if encoding:
+            response.content_encoding = encoding
+        if encodings:
+            response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+
+assets = Assets()
+
+#----------------------------------------------------------------------------#
+# Build.
+#----------------------------------------------------------------------------#
+
+def _hashed(name, content):
+    root, ext = os.path.splitext(name)
+    return '{}.{}{}'.format(root, hashlib.sha256(content).hexdigest()[:12], ext)
+
+
+_CSS_TOKEN = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|(/\*!.*?\*/)|/\*.*?\*/', re.S)
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+
+
+def _squeeze(css):
+    css = _CSS_PUNCTUATION.sub(r'\1', re.sub(r'\s+', ' ', css))
+    return css.replace(';}', '}')
+
+
+def minify_css(css):
+    # Drops comments (but not /*! license */ ones) and collapses
+    # whitespace outside strings. Space is only removed around punctuation
+    # where it can't be significant, so "a :hover" and "calc(1px + 2px)"
+    # keep theirs.
+    out, code, position = [], [], 0
+    for match in _CSS_TOKEN.finditer(css):
+        code.append(css[position:match.start()])
+        if match.group(1) or match.group(2):
+            out.append(_squeeze(''.join(code)))
+            out.append(match.group(0))
+            code = []
+        position = match.end()
+    code.append(css[position:])
+    out.append(_squeeze(''.join(code)))
+    return ''.join(out).strip()
+
+
+_CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+def _rebase_css(css, source, target, build_dir, emit):
+    # Relative url()s of `source` rewritten for the bundle at `target` in
+    # `build_dir` (paths relative to static/): files that exist are emitted
+    # to the build and linked by their hashed name, anything else keeps
+    # pointing at its original location.
+    def rebase(match):
+        url = match.group(2)
+        if url.startswith(('data:', '/', 'http:', 'https:', '#')):
+            return match.group(0)
+        path, query = re.match(r'([^?#]*)(.*)', url).groups()
+        name = os.path.normpath(os.path.join(os.path.dirname(source), path)).replace(os.sep, '/')
+        built = emit(name)
+        if built is None:
+            relative = os.path.relpath(name, os.path.join(build_dir, os.path.dirname(target)))
+        else:
+            relative = os.path.relpath(built, os.path.dirname(target))
+        return 'url("{}{}")'.format(relative.replace(os.sep, '/'), query)
+    return _CSS_URL.sub(rebase, css)
+
+
+def _bundle(static, build_dir, name, sources, emit):
+    if name.endswith('.css'):
+        parts = []
+        for source in sources:
+            with open(os.path.join(static, source), encoding='utf-8') as f:
+                parts.append(_rebase_css(f.read(), source, name, build_dir, emit))
+        return minify_css('\n'.join(parts)).encode()
+    # Scripts are joined as they are (they ship minified); the separator
+    # keeps one file's last statement from running into the next.
+    parts = []
+    for source in sources:
+        with open(os.path.join(static, source), 'rb') as f:
+            parts.append(re.sub(rb'\n//# sourceMappingURL=\S+\s*$', b'', f.read()).rstrip())
+    return b';\n'.join(parts) + b'\n'
+
+
+def _image_variants(static, name, widths, write):
+    # {format: [(width, built name)]}: the image resized to each of `widths`
+    # (as they fit in the original), as JPEG and WebP.
+    from PIL import Image
+
+    variants = {'jpeg': [], 'webp': []}
+    with Image.open(os.path.join(static, name)) as image:
+        icc_profile = image.info.get('icc_profile')
+        image = image.convert('RGB')
+        for width in sorted(width for width in widths if width <= image.width) or [image.width]:
+            resized = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+            root = '{}-{}w'.format(os.path.splitext(name)[0], width)
+            for format, ext, options in (
+                ('jpeg', '.jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+                ('webp', '.webp', {'quality': 80, 'method': 6}),
+            ):
+                buffer = io.BytesIO()
+                resized.save(buffer, format.upper(), icc_profile=icc_profile, **options)
+                variants[format].append((width, write(root + ext, buffer.getvalue())))
+    return variants
+
+
+def build(app, clean=True):
+    # Writes the build and its manifest; returns [(name, built name, size,
+    # {encoding: compressed size})] for the report.
+    static = app.static_folder
+    folder = os.path.join(static, app.config['ASSETS_DIR'])
+    if clean and os.path.isdir(folder):
+        shutil.rmtree(folder)
+    manifest = {'files': {}, 'images': {}, 'encodings': {}}
+    report = []
+
+    def write(name, content):
+        built = _hashed(name, content)
+        path = os.path.join(folder, built)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+        compressed_sizes = {}
+        if built.endswith(COMPRESSIBLE):
+            for encoding, suffix, compress in ENCODINGS:
+                compressed = compress(content)
+                if len(compressed) < len(content):
+                    with open(path + suffix, 'wb') as f:
+                        f.write(compressed)
+                    manifest['encodings'].setdefault(built, []).append(encoding)
+                    compressed_sizes[encoding] = len(compressed)
+        report.append((name, built, len(content), compressed_sizes))
+        return built
+
+    def emit(name):
+        # A file referenced from a bundle, copied into the build once.
+        if name in manifest['files']:
+            return manifest['files'][name]
+        path = os.path.join(static, name)
+        if not os.path.isfile(path):
+            return None
+        with open(path, 'rb') as f:
+            manifest['files'][name] = write(name, f.read())
+        return manifest['files'][name]
+
+    for name, sources in app.config['ASSET_BUNDLES'].items():
+        manifest['files'][name] = write(name, _bundle(static, app.config['ASSETS_DIR'], name, sources, emit))
+    for pattern in app.config['ASSET_FILES']:
+        for path in sorted(glob.glob(os.path.join(static, pattern))):
+            emit(os.path.relpath(path, static).replace(os.sep, '/'))
+    for name, widths in app.config['ASSET_IMAGES'].items():
+        try:
+            variants = _image_variants(static, name, widths, write)
+        except ImportError:
+            click.echo('skipping {}: image variants need Pillow'.format(name), err=True)
+            continue
+        manifest['images'][name] = variants
+        manifest['files'][name] = variants['jpeg'][-1][1]
+
+    with open(os.path.join(folder, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return report
+
+#----------------------------------------------------------------------------#
+# Commands.
+#----------------------------------------------------------------------------#
+
+assets_cli = AppGroup('assets', help='Build the static asset bundles.')
+
+
+@assets_cli.command('build')
+@click.option('--clean/--keep', default=True, show_default=True,
+              help='Remove the previous build first, or keep its files for pages still linking them.')
+def build_command(clean):
+    """Minify, bundle, fingerprint and precompress static/ into the build."""
+    app = current_app._get_current_object()
+    if brotli is None:
+        click.echo('brotli is not installed: writing gzip only', err=True)
+    click.echo('{:<52} {:>9} {:>9} {:>9}'.format('file', 'bytes', 'gzip', 'br'))
+    total, sent = 0, 0
+    for name, built, size, compressed in build(app, clean):
+        total += size
+        sent += min([size] + list(compressed.values()))
+        click.echo('{:<52} {:>9} {:>9} {:>9}'.format(
+            built, size, compressed.get('gzip', '-'), compressed.get('br', '-')))
+    click.echo('{} bytes built, {} bytes sent at best'.format(total, sent))
@@ -0,0 +1,125 @@
+import asyncio
+from datetime import datetime as dt
+
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from models import Venue, Artist, Show
+from queries import (venue_directory_select, detail_select, detail_page,
+                     related_shows_select, related_show, show_page_select, show_page_rows,
+                     show_days_select)
+from readmodels import Area, AreaVenue, ListedArtist
+
+#----------------------------------------------------------------------------#
+# Engine.
+#----------------------------------------------------------------------------#
+
+# The async read path (asgi.py) talks to Postgres through asyncpg with the
+# same URL and pool settings as the sync engine. Each query checks out its
+# own connection, so independent queries of one page run concurrently.
+
+_engine = None
+
+
+def init_engine(config):
+    global _engine
+    url = make_url(config['SQLALCHEMY_DATABASE_URI']).set(drivername='postgresql+asyncpg')
+    options = {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
+    if config['DB_STATEMENT_TIMEOUT_MS']:
+        options['connect_args'] = {
+            'server_settings': {'statement_timeout': str(config['DB_STATEMENT_TIMEOUT_MS'])}
+        }
+    _engine = create_async_engine(url, **options)
+    return _engine
+
+
+async def dispose_engine():
+    if _engine is not None:
+        await _engine.dispose()
+
+
+async def _all(statement):
+    async with _engine.connect() as conn:
+        return (await conn.execute(statement)).all()
+
+
+async def _stream(statement, chunk):
+    # The rows through a server-side cursor, fetched `chunk` at a time.
+    # The connection is held until the iterator is exhausted or closed.
+    async with _engine.connect() as conn:
+        result = await conn.stream(statement)
+        async for rows in result.partitions(chunk):
+            for row in rows:
+                yield row
+
+#----------------------------------------------------------------------------#
+# Listings.
+#----------------------------------------------------------------------------#
+
+# The listings are async iterators, for templates rendered in Jinja's async
+# mode (asgi.py), so a page never holds more than a chunk of rows.
+
+async def venue_directory(chunk=500):
+    # The Areas of queries.venue_areas, each yielded once complete with its
+    # venues as a list.
+    area, venues = None, []
+    async for row in _stream(venue_directory_select(), chunk):
+        if (row.city, row.state) != area:
+            if venues:
+                yield Area(*area, venues)
+            area, venues = (row.city, row.state), []
+        venues.append(AreaVenue(row.id, row.name, row.num_upcoming_shows))
+    if venues:
+        yield Area(*area, venues)
+
+
+async def artist_list(chunk=500):
+    async for id, name in _stream(select(Artist.id, Artist.name).order_by(Artist.id), chunk):
+        yield ListedArtist(id, name)
+
+
+async def show_page(per_page, after=None, before=None, window=None):
+    # Same (shows, pager) as queries.show_page; ValueError on a bad cursor.
+    statement, backwards = show_page_select(per_page, after, before, window)
+    pager = {'prev_cursor': None, 'next_cursor': None}
+    rows = await _all(statement)
+    return show_page_rows(rows, per_page, after, backwards, pager), pager
+
+
+async def show_days(window):
+    return await _all(show_days_select(window))
+
+#----------------------------------------------------------------------------#
+# Detail pages.
+#----------------------------------------------------------------------------#
+
+async def _detail(model, id, now):
+    # The entity's page from three concurrent queries: its columns, its
+    # past shows and its upcoming shows.
+    now = now or dt.now()
+    shows, key = related_shows_select(model)
+    shows = shows.where(key == id)
+    entity, past_shows, upcoming_shows = await asyncio.gather(
+        _all(detail_select(model, id)),
+        _all(shows.where(Show.start_time <= now)),
+        _all(shows.where(Show.start_time > now))
+    )
+    if not entity:
+        return None
+    return detail_page(model, entity[0], [related_show(model, row) for row in past_shows],
+                       [related_show(model, row) for row in upcoming_shows])
+
+
+async def venue_detail(venue_id, now=None):
+    return await _detail(Venue, venue_id, now)
+
+
+async def artist_detail(artist_id, now=None):
+    return await _detail(Artist, artist_id, now)
@@ -0,0 +1,140 @@
+# Throughput of the read pages on the sync Flask path against the async
+# path in asgi.py, at high concurrency.
+#
+#   DATABASE_URL=postgresql://localhost:5432/fyyur_bench \
+#   python -m benchmarks.async_throughput [--concurrency 64] [--duration 10]
+#
+# Both sides run under uvicorn in one process each: asgi:sync_application
+# (the Flask app on ASGI_SYNC_THREADS threads) and asgi:application (the
+# read pages on asyncpg). The page cache is off for both. Requests come from
+# `--concurrency` keep-alive connections for `--duration` seconds per route.
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.run import percentile
+
+SERVERS = [
+    ('sync', 'asgi:sync_application', ['--lifespan', 'off']),
+    ('async', 'asgi:application', []),
+]
+
+
+def start_server(target, port, extra):
+    env = dict(os.environ, CACHE_BACKEND='none', PYTHONWARNINGS='ignore')
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', target, '--port', str(port),
+         '--log-level', 'warning', '--no-access-log'] + extra,
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    sys.exit('{} did not start on port {}'.format(target, port))
+
+
+async def _request(reader, writer, path):
+    writer.write('GET {} HTTP/1.1\r\nHost: localhost\r\n\r\n'.format(path).encode())
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    headers = dict(line.split(b': ', 1) for line in head.split(b'\r\n')[1:] if b': ' in line)
+    headers = {name.lower(): value for name, value in headers.items()}
+    if b'content-length' in headers:
+        await reader.readexactly(int(headers[b'content-length']))
+    else:
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).strip(), 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    return status
+
+
+async def _client(port, paths, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            status = await _request(reader, writer, paths())
+            if status >= 500:
+                errors.append(status)
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        writer.close()
+
+
+async def load(port, paths, concurrency, duration):
+    latencies, errors = [], []
+    deadline = time.monotonic() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*[_client(port, paths, deadline, latencies, errors)
+                           for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies),
+        'p99_ms': percentile(latencies, 0.99),
+        'errors': len(errors),
+    }
+
+
+def routes(rng):
+    from app import app
+    from models import db, Venue, Artist
+
+    with app.app_context():
+        venue_ids = [id for id, in db.session.query(Venue.id).limit(1000)]
+        artist_ids = [id for id, in db.session.query(Artist.id).limit(1000)]
+    if not venue_ids or not artist_ids:
+        sys.exit('no data: seed the database first (python -m benchmarks.seed)')
+    return [
+        ('GET /venues/<id>', lambda: '/venues/{}'.format(rng.choice(venue_ids))),
+        ('GET /artists/<id>', lambda: '/artists/{}'.format(rng.choice(artist_ids))),
+        ('GET /shows', lambda: '/shows'),
+        ('GET /artists', lambda: '/artists'),
+        ('GET /venues', lambda: '/venues'),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10, help='seconds per route')
+    parser.add_argument('--route', action='append', help='only run routes containing this text')
+    parser.add_argument('--port', type=int, default=8801)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    selected = [(name, paths) for name, paths in routes(rng)
+                if not args.route or any(text in name for text in args.route)]
+
+    print('{:<20} {:<6} {:>9} {:>9} {:>9} {:>7}'.format(
+        'route', 'path', 'req/s', 'p50 ms', 'p99 ms', 'errors'))
+    for offset, (label, target, extra) in enumerate(SERVERS):
+        process = start_server(target, args.port + offset, extra)
+        try:
+            for name, paths in selected:
+                # Warm the pools and caches before measuring.
+                asyncio.run(load(args.port + offset, paths, args.concurrency, 1))
+                result = asyncio.run(load(args.port + offset, paths, args.concurrency, args.duration))
+                print('{:<20} {:<6} {rps:>9.1f} {p50_ms:>9.2f} {p99_ms:>9.2f} {errors:>7}'.format(
+                    name, label, **result))
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
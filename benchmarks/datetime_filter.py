@@ -0,0 +1,57 @@
+# Per-row cost of the `datetime` Jinja filter over a /shows-sized listing.
+#
+#   python -m benchmarks.datetime_filter [--rows 10000] [--distinct 500]
+#
+# `legacy` is the original filter: str() the datetime, parse it back with
+# dateutil and let Babel parse the pattern on every call.
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import babel.dates
+import dateutil.parser
+
+from views import format_datetime, _format_datetime
+
+
+def legacy_format_datetime(value, format='medium'):
+    date = dateutil.parser.parse(value)
+    if format == 'full':
+        format = "EEEE MMMM, d, y 'at' h:mma"
+    elif format == 'medium':
+        format = "EE MM, dd, y h:mma"
+    return babel.dates.format_datetime(date, format, locale='en')
+
+
+def run(label, fn, values):
+    start = time.perf_counter()
+    for value in values:
+        fn(value, 'full')
+    elapsed = time.perf_counter() - start
+    print('{:<28} {:>9.2f} ms total {:>8.2f} us/row'.format(
+        label, elapsed * 1000, elapsed * 1e6 / len(values)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--distinct', type=int, default=500,
+                        help='distinct start times among the rows')
+    args = parser.parse_args()
+
+    base = datetime(2026, 1, 1, 20, 0)
+    values = [base + timedelta(hours=i % args.distinct) for i in range(args.rows)]
+    unique = [base + timedelta(minutes=i) for i in range(args.rows)]
+    assert all(legacy_format_datetime(str(v), 'full') == format_datetime(v, 'full')
+               for v in values[:args.distinct])
+
+    run('legacy', lambda v, f: legacy_format_datetime(str(v), f), values)
+    _format_datetime.cache_clear()
+    run('compiled, all distinct', format_datetime, unique)
+    _format_datetime.cache_clear()
+    run('compiled + memo, repeated', format_datetime, values)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+# Checks that the main query of each read page is served by its index.
+#
+#   DATABASE_URL=postgresql://localhost:5432/fyyur_bench \
+#   python -m benchmarks.explain [--route /shows ...]
+#
+# Each page is requested once through the Flask test client with the page
+# cache off. Every SELECT it runs is EXPLAINed with the same parameters
+# (queries read through a server-side cursor are EXPLAINed as a cursor,
+# since Postgres plans those for fast first rows), and the page passes when
+# one of them reads its table through the expected index without also
+# reading it with a sequential scan. Run it against seeded data (python -m
+# benchmarks.seed): on a near-empty table Postgres rightly prefers a
+# sequential scan. Exits 1 when any page fails. tests/test_query_plans.py
+# runs the same checks on a small table with sequential scans disabled,
+# which leaves one in a plan only where no index can serve the query.
+
+import argparse
+import os
+import random
+import sys
+import warnings
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SCANS = ('Index Scan', 'Index Only Scan', 'Bitmap Heap Scan', 'Bitmap Index Scan')
+
+
+def build_cases(app, rng):
+    # (name, path, table, index) for each read page.
+    from models import db, Venue, Artist
+
+    with app.app_context():
+        venue_ids = [id for id, in db.session.query(Venue.id).limit(1000)]
+        city = db.session.query(Venue.city).limit(1).scalar()
+        artist_ids = [id for id, in db.session.query(Artist.id).limit(1000)]
+    if not venue_ids or not artist_ids:
+        sys.exit('no data: seed the database first (python -m benchmarks.seed)')
+    return [
+        ('GET /venues', '/venues', 'Venue', 'ix_Venue_city_state'),
+        ('GET /artists', '/artists', 'Artist', 'Artist_pkey'),
+        ('GET /shows', '/shows', 'Show', 'ix_Show_start_time_id'),
+        ('GET /venues/<id>', '/venues/{}'.format(rng.choice(venue_ids)),
+         'Show', 'ix_Show_venue_id_start_time'),
+        ('GET /artists/<id>', '/artists/{}'.format(rng.choice(artist_ids)),
+         'Show', 'ix_Show_artist_id_start_time'),
+        ('GET /api/v1/venues', '/api/v1/venues', 'Venue', 'Venue_pkey'),
+        ('GET /shows?from&to', '/shows?from=2026-10-01&to=2026-10-31', 'Show', 'ix_Show_start_time_id'),
+        ('GET /shows?city', '/shows?from=2026-10-01&to=2026-10-31&city={}'.format(city),
+         'Venue', 'ix_Venue_city_lower'),
+    ]
+
+
+def capture(app, path):
+    # [(statement, parameters, server_side)] for every SELECT the page runs.
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters, bool(getattr(cursor, 'name', None))))
+
+    event.listen(Engine, 'before_cursor_execute', record)
+    try:
+        response = app.test_client().get(path)
+        response.get_data()
+    finally:
+        event.remove(Engine, 'before_cursor_execute', record)
+    if response.status_code != 200:
+        raise RuntimeError('{} returned {}'.format(path, response.status_code))
+    return statements
+
+
+def plan_scans(conn, statement, parameters, server_side):
+    # [(node type, relation, index)] for every scan node in the plan.
+    if server_side:
+        conn.exec_driver_sql('BEGIN')
+        try:
+            rows = conn.exec_driver_sql(
+                'EXPLAIN (FORMAT JSON) DECLARE explain_cursor CURSOR FOR ' + statement, parameters).all()
+        finally:
+            conn.exec_driver_sql('ROLLBACK')
+    else:
+        rows = conn.exec_driver_sql('EXPLAIN (FORMAT JSON) ' + statement, parameters).all()
+
+    scans, nodes = [], [rows[0][0][0]['Plan']]
+    while nodes:
+        node = nodes.pop()
+        nodes.extend(node.get('Plans', []))
+        if node['Node Type'].endswith('Scan'):
+            scans.append((node['Node Type'], node.get('Relation Name'), node.get('Index Name')))
+    return scans
+
+
+def check(app, path, table, index, seqscan=True):
+    # (passed, [scans on `table`]) across the page's queries. With
+    # seqscan=False the planner only picks a sequential scan when nothing
+    # else can answer the query.
+    from models import db
+
+    scans, passed = [], False
+    with app.app_context(), db.engine.connect() as conn:
+        conn = conn.execution_options(isolation_level='AUTOCOMMIT')
+        if not seqscan:
+            conn.exec_driver_sql('SET enable_seqscan = off')
+        try:
+            for statement, parameters, server_side in capture(app, path):
+                found = [scan for scan in plan_scans(conn, statement, parameters, server_side)
+                         if scan[1] == table or (scan[1] is None and scan[2] == index)]
+                scans.extend(found)
+                passed = passed or (any(node in SCANS and name == index for node, _, name in found)
+                                    and not any(node == 'Seq Scan' for node, _, _ in found))
+        finally:
+            if not seqscan:
+                conn.exec_driver_sql('RESET enable_seqscan')
+    return passed, scans
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--route', action='append', help='only check routes containing this text')
+    args = parser.parse_args()
+
+    os.environ.setdefault('CACHE_BACKEND', 'none')
+    from app import app
+    # After the import: flask_wtf installs an 'always' filter for its
+    # Form deprecation warning, which would otherwise print per request.
+    warnings.simplefilter('ignore')
+    app.logger.disabled = True
+
+    failures = 0
+    for name, path, table, index in build_cases(app, random.Random(0)):
+        if args.route and not any(text in name for text in args.route):
+            continue
+        passed, scans = check(app, path, table, index)
+        failures += not passed
+        print('{:<4} {:<20} expects {} on "{}"'.format('ok' if passed else 'FAIL', name, index, table))
+        for node, _, used in sorted(set(scans)):
+            print('       {}{}'.format(node, ' using ' + used if used else ''))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+# Memory per row and render time of the read models behind the listing and
+# detail pages.
+#
+#   DATABASE_URL=postgresql://localhost:5432/fyyur_bench \
+#   python -m benchmarks.read_models [--runs 5]
+#
+# For each page the rows are loaded and held in full (as a non-streamed
+# render would), then the template is rendered from them. `load` is query
+# plus row building, `KB peak` the most memory held while loading, `B/row`
+# what the loaded rows keep alive, and `render` the template alone. The
+# detail pages use the venue and the artist with the most shows.
+
+import argparse
+import statistics
+import time
+import tracemalloc
+import warnings
+
+
+def _held(area):
+    area.venues = list(area.venues)
+    return area
+
+
+def _held_page(page):
+    shows, pager = page
+    return list(shows), pager
+
+
+def pages(app):
+    from forms import VenueForm
+    from models import db, Show
+    from queries import venue_directory, artist_listing, show_page, venue_detail, artist_detail
+
+    with app.app_context():
+        venue_id, = db.session.query(Show.venue_id).group_by(Show.venue_id).order_by(
+            db.func.count().desc()).first()
+        artist_id, = db.session.query(Show.artist_id).group_by(Show.artist_id).order_by(
+            db.func.count().desc()).first()
+
+    def shows(page):
+        return len(page.past_shows) + len(page.upcoming_shows) + 1
+
+    max_per_page = app.config['SHOWS_MAX_PER_PAGE']
+    return [
+        ('/venues', 'pages/venues.html',
+         lambda: {'areas': [_held(area) for area in venue_directory()]},
+         lambda data: sum(len(area.venues) for area in data['areas'])),
+        ('/artists', 'pages/artists.html',
+         lambda: {'artists': list(artist_listing())},
+         lambda data: len(data['artists'])),
+        ('/shows?per_page={}'.format(max_per_page), 'pages/shows.html',
+         lambda: dict(zip(('shows', 'pager'), _held_page(show_page(max_per_page))),
+                      per_page=max_per_page),
+         lambda data: len(data['shows'])),
+        ('/venues/{}'.format(venue_id), 'pages/show_venue.html',
+         lambda: {'venue': venue_detail(venue_id), 'form': VenueForm()},
+         lambda data: shows(data['venue'])),
+        ('/artists/{}'.format(artist_id), 'pages/show_artist.html',
+         lambda: {'artist': artist_detail(artist_id)},
+         lambda data: shows(data['artist'])),
+    ]
+
+
+def measure(app, path, template, load, count, runs):
+    from flask import render_template
+    from models import db
+
+    loads, renders = [], []
+    for _ in range(runs + 1):
+        with app.test_request_context(path):
+            start = time.perf_counter()
+            data = load()
+            loads.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            render_template(template, **data)
+            renders.append((time.perf_counter() - start) * 1000)
+            db.session.remove()
+
+    with app.test_request_context(path):
+        tracemalloc.start()
+        data = load()
+        held, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rows = count(data)
+        db.session.remove()
+    # The first run warms the statement and template caches.
+    return rows, statistics.median(loads[1:]), peak / 1024, held / max(rows, 1), statistics.median(renders[1:])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    from app import app
+    warnings.simplefilter('ignore')
+    app.logger.disabled = True
+
+    print('{:<22} {:>7} {:>9} {:>9} {:>8} {:>10}'.format(
+        'page', 'rows', 'load ms', 'KB peak', 'B/row', 'render ms'))
+    for path, template, load, count in pages(app):
+        rows, load_ms, peak_kb, per_row, render_ms = measure(app, path, template, load, count, args.runs)
+        print('{:<22} {:>7} {:>9.2f} {:>9.1f} {:>8.0f} {:>10.2f}'.format(
+            path.split('?')[0], rows, load_ms, peak_kb, per_row, render_ms))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+# Latency, query and memory benchmark for every route in app.py.
+#
+#   DATABASE_URL=postgresql://localhost:5432/fyyur_bench \
+#   python -m benchmarks.run [--seed-venues 10000 ...] [--requests 50]
+#                            [--save-baseline | --check]
+#
+# Requests go through the Flask test client with the page cache off, so
+# every hit does its full query and render work. --check compares
+# against benchmarks/baseline.json and exits 1 on a regression.
+
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timedelta
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def with_csrf(client, data):
+    # Forms keep CSRF on (the templates render the token), so POSTs carry a
+    # token issued to this client's session.
+    token = getattr(client, 'csrf_token', None)
+    if token is None:
+        page = client.get('/venues/create').get_data(as_text=True)
+        token = client.csrf_token = re.search(r'name="csrf_token" type="hidden" value="([^"]+)"', page).group(1)
+    return dict(data, csrf_token=token)
+
+
+def venue_form(rng):
+    return {
+        'name': 'Bench Venue {}'.format(rng.randrange(10 ** 6)), 'city': 'San Francisco',
+        'state': 'CA', 'address': '1 Bench St', 'phone': '555-555-5555', 'genres': ['Jazz'],
+        'facebook_link': 'https://www.facebook.com/bench', 'image_link': '',
+        'website_link': '', 'seeking_description': '',
+    }
+
+
+def artist_form(rng):
+    return {
+        'name': 'Bench Artist {}'.format(rng.randrange(10 ** 6)), 'city': 'San Francisco',
+        'state': 'CA', 'phone': '555-555-5555', 'genres': ['Jazz'],
+        'facebook_link': 'https://www.facebook.com/bench', 'image_link': '',
+        'website_link': '', 'seeking_description': '',
+    }
+
+
+def build_routes(app, rng):
+    # (name, callable(client)) for every route; ids are drawn from the data
+    # so detail pages are spread over the tables.
+    from models import db, Venue, Artist
+
+    with app.app_context():
+        venue_ids = [id for id, in db.session.query(Venue.id).limit(1000)]
+        artist_ids = [id for id, in db.session.query(Artist.id).limit(1000)]
+    if not venue_ids or not artist_ids:
+        sys.exit('no data: seed the database first (python -m benchmarks.seed)')
+    start_time = (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d %H:%M:%S')
+
+    def delete_venue(client):
+        # Each delete needs its own venue, created outside the timing loop.
+        with app.app_context():
+            venue = Venue(name='Bench Delete', city='Nowhere', state='CA', address='1 Bench St',
+                          genres=['Jazz'])
+            db.session.add(venue)
+            db.session.commit()
+            venue_id = venue.id
+        return lambda: client.delete('/venues/{}'.format(venue_id))
+
+    return [
+        ('GET /', lambda c: lambda: c.get('/')),
+        ('GET /venues', lambda c: lambda: c.get('/venues')),
+        ('GET /artists', lambda c: lambda: c.get('/artists')),
+        ('GET /shows', lambda c: lambda: c.get('/shows')),
+        ('GET /search', lambda c: lambda: c.get('/search?search_term=San Francisco, CA')),
+        ('POST /venues/search', lambda c: lambda: c.post('/venues/search', data={'search_term': 'Hop'})),
+        ('POST /artists/search', lambda c: lambda: c.post('/artists/search', data={'search_term': 'Band'})),
+        ('GET /venues/<id>', lambda c: lambda: c.get('/venues/{}'.format(rng.choice(venue_ids)))),
+        ('GET /artists/<id>', lambda c: lambda: c.get('/artists/{}'.format(rng.choice(artist_ids)))),
+        ('GET /venues/<id>/edit', lambda c: lambda: c.get('/venues/{}/edit'.format(rng.choice(venue_ids)))),
+        ('GET /artists/<id>/edit', lambda c: lambda: c.get('/artists/{}/edit'.format(rng.choice(artist_ids)))),
+        ('GET /venues/create', lambda c: lambda: c.get('/venues/create')),
+        ('GET /artists/create', lambda c: lambda: c.get('/artists/create')),
+        ('GET /shows/create', lambda c: lambda: c.get('/shows/create')),
+        ('POST /venues/create', lambda c: lambda: c.post(
+            '/venues/create', data=with_csrf(c, venue_form(rng)))),
+        ('POST /artists/create', lambda c: lambda: c.post(
+            '/artists/create', data=with_csrf(c, artist_form(rng)))),
+        ('POST /venues/<id>/edit', lambda c: lambda: c.post(
+            '/venues/{}/edit'.format(rng.choice(venue_ids)), data=with_csrf(c, venue_form(rng)))),
+        ('POST /artists/<id>/edit', lambda c: lambda: c.post(
+            '/artists/{}/edit'.format(rng.choice(artist_ids)), data=with_csrf(c, artist_form(rng)))),
+        ('POST /shows/create', lambda c: lambda: c.post('/shows/create', data=with_csrf(c, {
+            'venue_id': rng.choice(venue_ids), 'artist_id': rng.choice(artist_ids),
+            'start_time': start_time}))),
+        ('DELETE /venues/<id>', delete_venue),
+    ]
+
+
+def measure(app, counter, route, requests, warmup=3):
+    client = app.test_client()
+    timings, queries = [], []
+    for i in range(warmup + requests):
+        request = route(client)
+        counter.count = 0
+        start = time.perf_counter()
+        response = request()
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code >= 500:
+            raise RuntimeError('{} returned {}'.format(route, response.status_code))
+        if i >= warmup:
+            timings.append(elapsed)
+            queries.append(counter.count)
+
+    request = route(client)
+    tracemalloc.start()
+    request()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'p50_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'p99_ms': round(percentile(timings, 0.99), 3),
+        'queries': max(queries),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, tolerance, slack_ms):
+    # A route regresses when it issues more queries than the baseline, or
+    # its p95 grows past baseline * tolerance + slack_ms (the slack keeps
+    # millisecond-scale routes from failing on scheduler noise).
+    failures = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result['queries'] > expected['queries']:
+            failures.append('{}: {} queries (baseline {})'.format(
+                name, result['queries'], expected['queries']))
+        if result['p95_ms'] > expected['p95_ms'] * tolerance + slack_ms:
+            failures.append('{}: p95 {:.2f}ms (baseline {:.2f}ms, tolerance x{} + {}ms)'.format(
+                name, result['p95_ms'], expected['p95_ms'], tolerance, slack_ms))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=50, help='timed requests per route')
+    parser.add_argument('--seed-venues', type=int, default=0)
+    parser.add_argument('--seed-artists', type=int, default=0)
+    parser.add_argument('--seed-shows', type=int, default=0)
+    parser.add_argument('--route', action='append', help='only run routes containing this text')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--check', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=1.5)
+    parser.add_argument('--slack-ms', type=float, default=5.0)
+    args = parser.parse_args()
+    if args.check and not os.path.exists(args.baseline):
+        sys.exit('no baseline at {}: record one with --save-baseline'.format(args.baseline))
+
+    os.environ.setdefault('CACHE_BACKEND', 'none')
+    from app import app
+    from models import db
+    # After the import: flask_wtf installs an 'always' filter for its
+    # Form deprecation warning, which would otherwise print per request.
+    warnings.simplefilter('ignore')
+    app.logger.disabled = True
+
+    if args.seed_venues or args.seed_artists or args.seed_shows:
+        from benchmarks.seed import seed
+        with app.app_context():
+            seed(args.seed_venues, args.seed_artists, args.seed_shows)
+
+    rng = random.Random(0)
+    with app.app_context():
+        counter = QueryCounter(db.engine)
+    results = {}
+    print('{:<26} {:>9} {:>9} {:>9} {:>8} {:>10}'.format(
+        'route', 'p50 ms', 'p95 ms', 'p99 ms', 'queries', 'peak KB'))
+    for name, route in build_routes(app, rng):
+        if args.route and not any(text in name for text in args.route):
+            continue
+        result = results[name] = measure(app, counter, route, args.requests)
+        print('{:<26} {p50_ms:>9.2f} {p95_ms:>9.2f} {p99_ms:>9.2f} {queries:>8} {peak_kb:>10.1f}'.format(
+            name, **result))
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print('baseline written to {}'.format(args.baseline))
+    if args.check:
+        with open(args.baseline) as f:
+            failures = compare(results, json.load(f), args.tolerance, args.slack_ms)
+        for failure in failures:
+            print('REGRESSION ' + failure)
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
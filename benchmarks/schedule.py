@@ -0,0 +1,98 @@
+# Show scheduling throughput, in shows per second.
+#
+#   DATABASE_URL=postgresql://localhost:5432/fyyur_bench \
+#   python -m benchmarks.schedule [--shows 2000] [--batch 1 --batch 100 ...]
+#
+# Schedules `--shows` new shows through POST /shows/create (one show per
+# form post) and through POST /api/v1/shows in each `--batch` size, with the
+# page cache on as in production. Start times are spaced past
+# SHOW_LENGTH_MINUTES and after every stored show, so no row conflicts.
+# The shows are kept: run it against benchmark data.
+
+import argparse
+import random
+import sys
+import time
+import warnings
+from datetime import datetime, timedelta
+
+from benchmarks.run import percentile
+
+
+def slots(app, rng, venue_ids, artist_ids):
+    # Endless (venue_id, artist_id, start_time) that clash with nothing.
+    from models import db, Show
+
+    with app.app_context():
+        latest = db.session.query(db.func.max(Show.start_time)).scalar()
+    start = max(latest or datetime.now(), datetime.now()).replace(microsecond=0) + timedelta(days=1)
+    step = timedelta(minutes=app.config['SHOW_LENGTH_MINUTES'] + 1)
+    while True:
+        yield rng.choice(venue_ids), rng.choice(artist_ids), start
+        start += step
+
+
+def measure(client, request, batches):
+    # (shows per second, p50 ms, p99 ms per request)
+    timings, shows = [], 0
+    started = time.perf_counter()
+    for batch in batches:
+        start = time.perf_counter()
+        response = request(client, batch)
+        timings.append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            raise RuntimeError('{}: {}'.format(response.status_code, response.get_data(as_text=True)))
+        shows += len(batch)
+    elapsed = time.perf_counter() - started
+    return shows / elapsed, percentile(timings, 0.5), percentile(timings, 0.99)
+
+
+def form_post(client, batch):
+    venue_id, artist_id, start_time = batch[0]
+    response = client.post('/shows/create', data={
+        'venue_id': venue_id, 'artist_id': artist_id,
+        'start_time': start_time.strftime('%Y-%m-%d %H:%M:%S')})
+    if b'could not be listed' in response.data:
+        raise RuntimeError('show was not listed: {}'.format(batch[0]))
+    return response
+
+
+def api_post(client, batch):
+    return client.post('/api/v1/shows', json=[
+        {'venue_id': venue_id, 'artist_id': artist_id, 'start_time': start_time.isoformat()}
+        for venue_id, artist_id, start_time in batch])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--shows', type=int, default=2000, help='shows per mode')
+    parser.add_argument('--batch', type=int, action='append', help='API batch sizes (default 1, 100, 1000)')
+    args = parser.parse_args()
+
+    from app import app
+    from models import db, Venue, Artist
+    # After the import: flask_wtf installs an 'always' filter for its
+    # Form deprecation warning, which would otherwise print per request.
+    warnings.simplefilter('ignore')
+    app.logger.disabled = True
+
+    with app.app_context():
+        venue_ids = [id for id, in db.session.query(Venue.id).limit(1000)]
+        artist_ids = [id for id, in db.session.query(Artist.id).limit(1000)]
+    if not venue_ids or not artist_ids:
+        sys.exit('no data: seed the database first (python -m benchmarks.seed)')
+    source = slots(app, random.Random(0), venue_ids, artist_ids)
+
+    modes = [('POST /shows/create', form_post, 1)]
+    modes += [('POST /api/v1/shows', api_post, size) for size in args.batch or [1, 100, 1000]]
+    print('{:<22} {:>6} {:>10} {:>10} {:>10}'.format('route', 'batch', 'shows/s', 'p50 ms', 'p99 ms'))
+    for name, request, size in modes:
+        client = app.test_client()
+        count = max(size, args.shows // size * size)
+        batches = [[next(source) for _ in range(size)] for _ in range(count // size)]
+        rate, p50, p99 = measure(client, request, batches)
+        print('{:<22} {:>6} {:>10.1f} {:>10.2f} {:>10.2f}'.format(name, size, rate, p50, p99))
+
+
+if __name__ == '__main__':
+    main()
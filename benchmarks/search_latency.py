@@ -0,0 +1,59 @@
+# Compares the ranked search service against the original ILIKE search.
+#
+#   python -m benchmarks.search_latency [--runs N] [term ...]
+#
+# Runs against the database configured in config.py, so seed it first.
+
+import argparse
+import statistics
+import time
+from datetime import datetime as dt
+
+from app import app
+from models import db, Venue, Artist, Show
+from search import find_all
+
+DEFAULT_TERMS = ['Hop', 'Music', 'band', 'San Francisco, CA', 'Jazz']
+
+
+def ilike_search(term):
+    # The pre-index search path: one ILIKE scan per table plus one upcoming
+    # count query per hit.
+    results = []
+    for model, column in ((Venue, Show.venue_id), (Artist, Show.artist_id)):
+        for row in model.query.filter(model.name.ilike('%{}%'.format(term))).all():
+            num_upcoming_shows = Show.query.filter(
+                column == row.id, Show.start_time > dt.now()).count()
+            results.append((row.id, row.name, num_upcoming_shows))
+    return results
+
+
+def measure(fn, term, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(term)
+        timings.append((time.perf_counter() - start) * 1000)
+        db.session.remove()
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('terms', nargs='*', default=DEFAULT_TERMS)
+    args = parser.parse_args()
+
+    print('{:<24} {:>12} {:>12} {:>12} {:>12}'.format(
+        'term', 'ilike p50', 'ilike p95', 'ranked p50', 'ranked p95'))
+    with app.test_request_context():
+        for term in args.terms:
+            ilike = measure(ilike_search, term, args.runs)
+            ranked = measure(find_all, term, args.runs)
+            print('{:<24} {:>10.2f}ms {:>10.2f}ms {:>10.2f}ms {:>10.2f}ms'.format(
+                term, *(ilike + ranked)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+# Synthetic data for benchmarks.
+#
+#   DATABASE_URL=postgresql://localhost:5432/fyyur_bench \
+#   python -m benchmarks.seed --venues 10000 --artists 10000 --shows 100000
+#
+# Rows go in with batched executemany inserts; counters are recounted at the
+# end. --reset drops and recreates the tables first.
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from forms import genre_choices, state_choices
+from models import db, Venue, Artist, Show
+
+CITIES = [
+    ('San Francisco', 'CA'), ('Los Angeles', 'CA'), ('Oakland', 'CA'), ('New York', 'NY'),
+    ('Brooklyn', 'NY'), ('Austin', 'TX'), ('Houston', 'TX'), ('Chicago', 'IL'),
+    ('Seattle', 'WA'), ('Portland', 'OR'), ('Denver', 'CO'), ('Nashville', 'TN'),
+    ('New Orleans', 'LA'), ('Atlanta', 'GA'), ('Miami', 'FL'), ('Boston', 'MA'),
+    ('Philadelphia', 'PA'), ('Detroit', 'MI'), ('Minneapolis', 'MN'), ('Phoenix', 'AZ'),
+]
+WORDS = [
+    'Musical', 'Hop', 'Park', 'Square', 'Live', 'Music', 'Coffee', 'Dueling', 'Pianos',
+    'Bar', 'Wild', 'Sax', 'Band', 'Guns', 'Petals', 'Electric', 'Velvet', 'Copper',
+    'Moon', 'Harbor', 'Echo', 'Neon', 'Basement', 'Garden', 'Hall', 'Lounge', 'Club',
+]
+GENRES = [value for value, _ in genre_choices]
+STATES = [value for value, _ in state_choices]
+BATCH = 5000
+
+
+def _name(rng, i):
+    return 'The {} {} {}'.format(rng.choice(WORDS), rng.choice(WORDS), i)
+
+
+def _location(rng):
+    # Mostly real cities so /venues has realistic area groups, plus a tail
+    # of one-off areas.
+    if rng.random() < 0.9:
+        return rng.choice(CITIES)
+    return 'Town {}'.format(rng.randrange(1000)), rng.choice(STATES)
+
+
+def _insert(table, rows):
+    for start in range(0, len(rows), BATCH):
+        db.session.execute(table.insert(), rows[start:start + BATCH])
+    db.session.commit()
+
+
+def seed(venues, artists, shows, random_seed=0, now=None):
+    rng = random.Random(random_seed)
+    now = now or datetime.now()
+    first_venue = (db.session.query(db.func.max(Venue.id)).scalar() or 0) + 1
+    first_artist = (db.session.query(db.func.max(Artist.id)).scalar() or 0) + 1
+
+    rows = []
+    for i in range(venues):
+        city, state = _location(rng)
+        rows.append({
+            'id': first_venue + i, 'name': _name(rng, first_venue + i), 'city': city,
+            'state': state, 'address': '{} Main St'.format(rng.randrange(1, 9999)),
+            'phone': '555-{:03d}-{:04d}'.format(rng.randrange(1000), rng.randrange(10000)),
+            'genres': rng.sample(GENRES, rng.randint(1, 4)),
+            'image_link': 'https://images.example.com/venues/{}.jpg'.format(i),
+            'facebook_link': 'https://www.facebook.com/venue{}'.format(i),
+            'website_link': 'https://venue{}.example.com'.format(i),
+            'seeking_talent': rng.random() < 0.5, 'seeking_description': 'Looking for bands',
+        })
+    _insert(Venue.__table__, rows)
+
+    rows = []
+    for i in range(artists):
+        city, state = _location(rng)
+        rows.append({
+            'id': first_artist + i, 'name': _name(rng, first_artist + i), 'city': city,
+            'state': state,
+            'phone': '555-{:03d}-{:04d}'.format(rng.randrange(1000), rng.randrange(10000)),
+            'genres': rng.sample(GENRES, rng.randint(1, 3)),
+            'image_link': 'https://images.example.com/artists/{}.jpg'.format(i),
+            'facebook_link': 'https://www.facebook.com/artist{}'.format(i),
+            'website_link': 'https://artist{}.example.com'.format(i),
+            'seeking_venue': rng.random() < 0.5, 'seeking_description': 'Looking for gigs',
+        })
+    _insert(Artist.__table__, rows)
+
+    # Two years of history and one year ahead, on the hour.
+    rows = []
+    for _ in range(shows):
+        rows.append({
+            'venue_id': first_venue + rng.randrange(venues),
+            'artist_id': first_artist + rng.randrange(artists),
+            'start_time': (now + timedelta(hours=rng.randrange(-2 * 8760, 8760))).replace(
+                minute=0, second=0, microsecond=0),
+        })
+        if len(rows) == BATCH:
+            _insert(Show.__table__, rows)
+            rows = []
+    _insert(Show.__table__, rows)
+
+    # Explicit ids bypass the sequences on Postgres; move them past the data.
+    if db.engine.dialect.name == 'postgresql':
+        for table in ('Venue', 'Artist'):
+            db.session.execute(db.text(
+                'SELECT setval(pg_get_serial_sequence(\'"{0}"\', \'id\'), '
+                'coalesce(max(id), 1)) FROM "{0}"'.format(table)))
+        db.session.commit()
+
+    from counters import refresh
+    refresh(Venue, Show.venue_id, now=now)
+    refresh(Artist, Show.artist_id, now=now)
+    db.session.commit()
+
+
+def reset():
+    db.drop_all()
+    db.create_all()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--venues', type=int, default=10000)
+    parser.add_argument('--artists', type=int, default=10000)
+    parser.add_argument('--shows', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--reset', action='store_true')
+    args = parser.parse_args()
+
+    from app import app
+    with app.app_context():
+        if args.reset:
+            reset()
+        start = time.perf_counter()
+        seed(args.venues, args.artists, args.shows, args.seed)
+        print('seeded {} venues, {} artists, {} shows in {:.1f}s'.format(
+            args.venues, args.artists, args.shows, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
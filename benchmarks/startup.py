@@ -0,0 +1,78 @@
+# Import and worker boot time.
+#
+#   DATABASE_URL=postgresql://localhost:5432/fyyur_bench \
+#   python -m benchmarks.startup [--runs 5] [--top 15]
+#
+# Each stage runs in fresh interpreters: `models` is what migrations,
+# commands and scripts pay, `create_app` is a worker booting, and `first
+# request` adds the first page it serves (templates compiled, pool
+# connected). Wall times are medians over --runs, less the bare interpreter
+# start. Import times come from `python -X importtime`; the heaviest
+# modules are listed for the create_app stage.
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+STAGES = [
+    ('models', 'import models'),
+    ('create_app', 'from app import create_app; create_app()'),
+    ('first request', 'from app import create_app; create_app().test_client().get("/")'),
+]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)')
+
+
+def wall_ms(code, runs):
+    env = dict(os.environ, PYTHONWARNINGS='ignore', CACHE_BACKEND='none')
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def import_times(code):
+    # (total ms, [(cumulative ms, module)]) from one -X importtime run.
+    env = dict(os.environ, PYTHONWARNINGS='ignore', CACHE_BACKEND='none')
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, env=env,
+                            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            text=True).stderr
+    total, modules = 0, []
+    for match in IMPORT_LINE.finditer(stderr):
+        cumulative, depth, module = int(match.group(2)) / 1000, len(match.group(3)), match.group(4)
+        modules.append((cumulative, module))
+        if depth == 0:
+            total += cumulative
+    return total, modules
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help='heaviest imports to list')
+    args = parser.parse_args()
+
+    bare = wall_ms('pass', args.runs)
+    print('{:<16} {:>10} {:>12} {:>9}'.format('stage', 'wall ms', 'imports ms', 'modules'))
+    heaviest = []
+    for name, code in STAGES:
+        total, modules = import_times(code)
+        print('{:<16} {:>10.1f} {:>12.1f} {:>9}'.format(
+            name, wall_ms(code, args.runs) - bare, total, len(modules)))
+        if name == 'create_app':
+            heaviest = sorted(modules, reverse=True)[:args.top]
+
+    print('\nheaviest imports at create_app (cumulative ms):')
+    for cumulative, module in heaviest:
+        print('  {:>8.1f}  {}'.format(cumulative, module))
+
+
+if __name__ == '__main__':
+    main()
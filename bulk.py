@@ -0,0 +1,321 @@
+import csv
+import json
+import sys
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import select
+from werkzeug.datastructures import MultiDict
+
+from cache import cache
+from forms import VenueForm, ArtistForm, ShowForm
+from models import db, Venue, Artist, Show
+from scheduling import schedule_shows
+from search import invalidate as invalidate_search
+
+#----------------------------------------------------------------------------#
+# Row formats.
+#----------------------------------------------------------------------------#
+
+# CSV and JSON Lines rows use the form field names. In CSV, genres are one
+# cell separated by commas and booleans are true/false; JSON Lines may use
+# lists and booleans directly. Shows reference their venue and artist by
+# venue_id/artist_id or by exact venue_name/artist_name.
+
+START_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+FALSE_VALUES = ('', '0', 'false', 'f', 'no', 'n', 'off')
+
+KINDS = {
+    'venues': (Venue, VenueForm, ['name', 'city', 'state', 'address', 'phone', 'genres',
+                                  'image_link', 'facebook_link', 'website_link',
+                                  'seeking_talent', 'seeking_description']),
+    'artists': (Artist, ArtistForm, ['name', 'city', 'state', 'phone', 'genres',
+                                     'image_link', 'facebook_link', 'website_link',
+                                     'seeking_venue', 'seeking_description']),
+    'shows': (Show, ShowForm, ['venue_id', 'artist_id', 'start_time']),
+}
+BOOLEANS = ('seeking_talent', 'seeking_venue')
+MAX_GENRES = {'venues': 4}
+
+
+class Unreadable(Exception):
+    # A line that does not hold a row, in place of the row.
+
+    def __init__(self, text, message):
+        super().__init__(message)
+        self.text = text
+
+
+def read_rows(stream, format):
+    # Yields (line number, row). A JSON Lines line that does not decode to
+    # an object comes back as Unreadable, so one bad line is one reject.
+    if format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line, text in enumerate(stream, 1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError as e:
+            row = Unreadable(text.rstrip('\n'), 'Invalid JSON: {}'.format(e))
+        else:
+            if not isinstance(row, dict):
+                row = Unreadable(text.rstrip('\n'), 'Expected a JSON object, got {}.'.format(
+                    type(row).__name__))
+        yield line, row
+
+
+def _form_data(row):
+    # TypeError for values that are neither text, numbers nor booleans
+    # (or, for genres, a list of those).
+    data = MultiDict()
+    for key, value in row.items():
+        # A None key holds the extra cells of a long CSV record.
+        if value is None or key is None:
+            continue
+        if key == 'genres':
+            if isinstance(value, str):
+                value = [genre.strip() for genre in value.split(',') if genre.strip()]
+            elif isinstance(value, list) and all(_scalar(genre) for genre in value):
+                value = [str(genre).strip() for genre in value]
+            else:
+                raise TypeError(key)
+            data.setlist(key, value)
+        elif not _scalar(value):
+            raise TypeError(key)
+        elif key in BOOLEANS:
+            if str(value).strip().lower() not in FALSE_VALUES:
+                data[key] = 'y'
+        else:
+            data[key] = str(value).strip()
+    return data
+
+
+def _scalar(value):
+    return isinstance(value, (str, int, float, bool))
+
+#----------------------------------------------------------------------------#
+# Import.
+#----------------------------------------------------------------------------#
+
+class Importer:
+    # Validates rows with the same form classes as the web views, inserts
+    # the valid ones `batch_size` at a time (one commit per batch) and
+    # collects every rejected row with its line number and errors.
+
+    def __init__(self, kind, batch_size=1000):
+        self.kind = kind
+        self.model, self.form_class, self.fields = KINDS[kind]
+        self.batch_size = batch_size
+        self.imported = 0
+        self.rejects = []
+        # One form, re-processed for every row.
+        self._form = self.form_class(meta={'csrf': False})
+        self._max_lengths = {
+            column.name: column.type.length for column in self.model.__table__.columns
+            if getattr(column.type, 'length', None)
+        }
+
+    def _reject(self, line, row, errors):
+        self.rejects.append({'line': line, 'errors': errors, 'row': row})
+
+    def _validate(self, line, row):
+        if isinstance(row, Unreadable):
+            self._reject(line, row.text, {'row': [str(row)]})
+            return None
+        try:
+            data = _form_data(row)
+        except TypeError as e:
+            self._reject(line, row, {str(e): ['Expected text, a number or a boolean.']})
+            return None
+        form = self._form
+        form.process(formdata=data)
+        errors = {}
+        if not form.validate():
+            errors.update(form.errors)
+        # ShowForm falls back to a default start time when the field is
+        # missing, which is fine for the web form but not for an import.
+        if 'start_time' in form and not data.get('start_time'):
+            errors['start_time'] = ['This field is required.']
+        limit = MAX_GENRES.get(self.kind)
+        if limit and len(form.data.get('genres') or []) > limit:
+            errors['genres'] = ['Please select up to {} genres'.format(limit)]
+        for field, length in self._max_lengths.items():
+            value = form.data.get(field)
+            if isinstance(value, str) and len(value) > length:
+                errors.setdefault(field, []).append(
+                    'Field cannot be longer than {} characters.'.format(length))
+        if errors:
+            self._reject(line, row, errors)
+            return None
+        return {field: form.data[field] for field in self.fields}
+
+    def _resolve(self, batch):
+        # Shows: map venue/artist names to ids and check that every id
+        # exists, with one query per referenced table per batch.
+        for model, ref in ((Venue, 'venue'), (Artist, 'artist')):
+            names = {row.get(ref + '_name') for _, row, values in batch
+                     if not values[ref + '_id'] and row.get(ref + '_name')}
+            by_name = {}
+            if names:
+                for id, name in db.session.query(model.id, model.name).filter(model.name.in_(names)):
+                    by_name.setdefault(name, []).append(id)
+            for _, row, values in batch:
+                if not values[ref + '_id'] and row.get(ref + '_name'):
+                    ids = by_name.get(row[ref + '_name'], [])
+                    values[ref + '_id'] = ids[0] if len(ids) == 1 else ('ambiguous' if ids else None)
+
+            numeric = {int(values[ref + '_id']) for _, _, values in batch
+                       if str(values[ref + '_id']).isdigit()}
+            known = {id for id, in db.session.query(model.id).filter(model.id.in_(numeric))}
+            for _, _, values in batch:
+                id = values[ref + '_id']
+                if str(id).isdigit():
+                    values[ref + '_id'] = int(id) if int(id) in known else None
+
+        resolved = []
+        for line, row, values in batch:
+            errors = {}
+            for ref in ('venue', 'artist'):
+                id = values[ref + '_id']
+                if id == 'ambiguous':
+                    errors[ref + '_name'] = ['More than one {} has this name.'.format(ref)]
+                elif not isinstance(id, int):
+                    errors[ref + '_id'] = ['No such {}.'.format(ref)]
+            if errors:
+                self._reject(line, row, errors)
+            else:
+                resolved.append((line, row, values))
+        return resolved
+
+    def _schedule(self, batch):
+        # Shows go through schedule_shows(), with the same double-booking
+        # checks as the web form and the API. It adds a batch all or
+        # nothing, so the rows it rejects are recorded and the rest are
+        # submitted again.
+        while batch:
+            created, rejects = schedule_shows([values for _, _, values in batch])
+            if not rejects:
+                self.imported += len(created)
+                return
+            for reject in rejects:
+                line, row, _ = batch[reject['index']]
+                self._reject(line, row, reject['errors'])
+            rejected = {reject['index'] for reject in rejects}
+            batch = [item for n, item in enumerate(batch) if n not in rejected]
+
+    def _insert(self, batch):
+        if self.kind == 'shows':
+            self._schedule(self._resolve(batch))
+            return
+        rows = [values for _, _, values in batch]
+        if not rows:
+            return
+        db.session.execute(self.model.__table__.insert(), rows)
+        db.session.commit()
+        cache.invalidate(self.kind)
+        # Only this process's memory search index: web workers using the
+        # memory backend find the imported rows after their next write or
+        # restart. The trigram backend reads the table and needs nothing.
+        invalidate_search(self.model)
+        self.imported += len(rows)
+
+    def run(self, rows):
+        # `rows` are (line number, row) pairs, as from read_rows().
+        batch = []
+        for line, row in rows:
+            values = self._validate(line, row)
+            if values is not None:
+                batch.append((line, row, values))
+            if len(batch) == self.batch_size:
+                self._insert(batch)
+                batch = []
+        self._insert(batch)
+        return self.imported, self.rejects
+
+#----------------------------------------------------------------------------#
+# Export.
+#----------------------------------------------------------------------------#
+
+def export_rows(kind, batch_size=1000):
+    # Yields dicts through a server-side cursor (stream_results), fetching
+    # `batch_size` rows at a time, so memory stays flat whatever the size
+    # of the table.
+    model, _, fields = KINDS[kind]
+    columns = [model.__table__.c.id] + [model.__table__.c[field] for field in fields]
+    query = select(*columns).order_by(model.__table__.c.id)
+    result = db.session.connection().execution_options(
+        stream_results=True, max_row_buffer=batch_size).execute(query)
+    for partition in result.partitions(batch_size):
+        for row in partition:
+            yield dict(row._mapping)
+
+
+def write_rows(rows, stream, format, fields):
+    if format == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            if row.get('genres') is not None:
+                row['genres'] = ','.join(row['genres'])
+            if 'start_time' in row:
+                row['start_time'] = row['start_time'].strftime(START_TIME_FORMAT)
+            writer.writerow(row)
+    else:
+        for row in rows:
+            if 'start_time' in row:
+                row['start_time'] = row['start_time'].strftime(START_TIME_FORMAT)
+            stream.write(json.dumps(row) + '\n')
+
+#----------------------------------------------------------------------------#
+# Commands.
+#----------------------------------------------------------------------------#
+
+data_cli = AppGroup('data', help='Bulk import and export of venues, artists and shows.')
+
+
+def _format(format, filename):
+    if format:
+        return format
+    return 'jsonl' if filename.endswith(('.jsonl', '.json')) else 'csv'
+
+
+@data_cli.command('import')
+@click.argument('kind', type=click.Choice(sorted(KINDS)))
+@click.argument('source', type=click.File('r', encoding='utf-8'))
+@click.option('--format', 'format', type=click.Choice(['csv', 'jsonl']),
+              help='Input format (default: from the file extension, else csv).')
+@click.option('--batch-size', type=int, default=1000, show_default=True)
+@click.option('--rejects', type=click.File('w', encoding='utf-8'),
+              help='Write rejected rows here as JSON Lines.')
+def import_command(kind, source, format, batch_size, rejects):
+    """Import venues, artists or shows from CSV or JSON Lines ('-' for stdin)."""
+    format = _format(format, source.name)
+    importer = Importer(kind, batch_size)
+    imported, rejected = importer.run(read_rows(source, format))
+    for reject in rejected:
+        if rejects:
+            rejects.write(json.dumps(reject) + '\n')
+    for reject in rejected[:20]:
+        click.echo('line {}: {}'.format(reject['line'], json.dumps(reject['errors'])), err=True)
+    if len(rejected) > 20:
+        click.echo('... and {} more'.format(len(rejected) - 20), err=True)
+    click.echo('imported {} {}, rejected {}'.format(imported, kind, len(rejected)))
+    if rejected:
+        sys.exit(1)
+
+
+@data_cli.command('export')
+@click.argument('kind', type=click.Choice(sorted(KINDS)))
+@click.argument('target', type=click.File('w', encoding='utf-8'), default='-')
+@click.option('--format', 'format', type=click.Choice(['csv', 'jsonl']),
+              help='Output format (default: from the file extension, else csv).')
+@click.option('--batch-size', type=int, default=1000, show_default=True)
+def export_command(kind, target, format, batch_size):
+    """Stream every venue, artist or show to CSV or JSON Lines ('-' for stdout)."""
+    format = _format(format, target.name)
+    fields = ['id'] + KINDS[kind][2]
+    write_rows(export_rows(kind, batch_size), target, format, fields)
@@ -0,0 +1,221 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+from functools import wraps
+
+from flask import current_app, g, jsonify, make_response, request, session
+
+from models import db, Show
+
+#----------------------------------------------------------------------------#
+# Backends.
+#----------------------------------------------------------------------------#
+
+# A backend stores rendered page bodies under string keys and keeps integer
+# generations (see ResponseCache.invalidate) that must never be evicted.
+
+class LRUBackend:
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generation(self, key):
+        return self._generations.get(key, 0)
+
+    def incr(self, key):
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    # Works with any client exposing get/setex/incr (redis.Redis, or a stub).
+
+    def __init__(self, client, prefix='fyyur:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl):
+        self.client.setex(self.prefix + key, ttl, value)
+
+    def generation(self, key):
+        return int(self.client.get(self.prefix + key) or 0)
+
+    def incr(self, key):
+        self.client.incr(self.prefix + key)
+
+
+class NullBackend:
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def generation(self, key):
+        return 0
+
+    def incr(self, key):
+        pass
+
+#----------------------------------------------------------------------------#
+# Response cache.
+#----------------------------------------------------------------------------#
+
+class ResponseCache:
+    # Caches the body of successful GET responses per group, where a group is
+    # a route ('venues') or an entity page ('venue:3'). Invalidating a group
+    # bumps its generation, which is part of every key in it.
+
+    def __init__(self):
+        self.backend = NullBackend()
+        self.ttl = 60
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def init_app(self, app, client=None):
+        kind = app.config.get('CACHE_BACKEND', 'memory')
+        if kind == 'memory':
+            self.backend = LRUBackend(app.config.get('CACHE_MAX_ENTRIES', 1024))
+        elif kind == 'redis':
+            if client is None:
+                import redis
+                client = redis.Redis.from_url(app.config['CACHE_REDIS_URL'])
+            self.backend = RedisBackend(client)
+        else:
+            self.backend = NullBackend()
+        self.ttl = app.config.get('CACHE_DEFAULT_TTL', 60)
+        app.extensions['response_cache'] = self
+        if app.debug or app.config.get('DIAGNOSTICS_ENDPOINTS'):
+            app.add_url_rule('/cache/stats', 'cache_stats', self.stats_view)
+
+    def _key(self, group, suffix):
+        generation = self.backend.generation('gen:' + group)
+        return 'page:{}:{}:{}'.format(group, generation, suffix)
+
+    def cached(self, group, vary_on_query=False, vary=None):
+        # `group` is formatted with the view arguments, e.g. 'venue:{venue_id}'.
+        # `vary` returns more of the key for what the query string leaves
+        # implicit, such as a date range that defaults to today. Under
+        # @conditional the page's version is part of the key too: writes
+        # that don't invalidate this process's cache (other workers, the
+        # CLI, plain SQL) still change it.
+        def decorator(view):
+            @wraps(view)
+            def wrapper(**kwargs):
+                # Pending flash messages are rendered into the page, so those
+                # requests neither read nor fill the cache.
+                if request.method != 'GET' or session.get('_flashes'):
+                    return view(**kwargs)
+
+                route = group.split(':')[0]
+                suffix = request.query_string.decode() if vary_on_query else ''
+                if vary is not None:
+                    suffix += '|' + vary()
+                if 'page_version' in g:
+                    suffix += '|' + g.page_version
+                key = self._key(group.format(**kwargs), suffix)
+                body = self.backend.get(key)
+                if body is not None:
+                    self.hits[route] += 1
+                    response = current_app.response_class(body, mimetype='text/html')
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                self.misses[route] += 1
+                response = make_response(view(**kwargs))
+                # Streamed pages are sent as they render and are not stored.
+                if response.status_code == 200 and not response.is_streamed:
+                    self.backend.set(key, response.get_data(), self.ttl)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self, *groups):
+        for group in groups:
+            self.backend.incr('gen:' + group)
+
+    def stats(self):
+        routes = sorted(set(self.hits) | set(self.misses))
+        return {
+            'hits': sum(self.hits.values()),
+            'misses': sum(self.misses.values()),
+            'routes': {route: {
+                'hits': self.hits[route],
+                'misses': self.misses[route]
+            } for route in routes}
+        }
+
+    def stats_view(self):
+        return jsonify(self.stats())
+
+
+cache = ResponseCache()
+
+#----------------------------------------------------------------------------#
+# Invalidation.
+#----------------------------------------------------------------------------#
+
+def _played_at(venue_id):
+    return [artist_id for artist_id, in db.session.query(Show.artist_id).filter(
+        Show.venue_id == venue_id).distinct()]
+
+
+def _venues_played_by(artist_id):
+    return [venue_id for venue_id, in db.session.query(Show.venue_id).filter(
+        Show.artist_id == artist_id).distinct()]
+
+
+def invalidate_venue(venue_id, artist_ids=None):
+    # The venue's name and image also appear on /shows and on the pages of
+    # every artist that played there. Pass `artist_ids` when the venue's
+    # shows are about to be deleted.
+    if artist_ids is None:
+        artist_ids = _played_at(venue_id)
+    cache.invalidate('venues', 'venue:{}'.format(venue_id), 'shows',
+                     *['artist:{}'.format(id) for id in artist_ids])
+
+
+def invalidate_artist(artist_id):
+    cache.invalidate('artists', 'artist:{}'.format(artist_id), 'shows',
+                     *['venue:{}'.format(id) for id in _venues_played_by(artist_id)])
+
+
+def invalidate_venue_list():
+    cache.invalidate('venues')
+
+
+def invalidate_artist_list():
+    cache.invalidate('artists')
+
+
+def invalidate_show(venue_id, artist_id):
+    cache.invalidate('venues', 'shows', 'venue:{}'.format(venue_id),
+                     'artist:{}'.format(artist_id))
@@ -0,0 +1,116 @@
+import hashlib
+from datetime import datetime as dt, timezone
+from functools import wraps
+
+from flask import current_app, g, make_response, request, session
+from sqlalchemy import case, func, select
+
+from models import db, Venue, Artist, Show
+
+#----------------------------------------------------------------------------#
+# Versions.
+#----------------------------------------------------------------------------#
+
+# A version is (last_modified, etag) for the data behind a page. Detail
+# pages also change when an upcoming show becomes a past one, so the start
+# time of the latest show that has begun counts as a modification.
+
+def _aware(value):
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        # Show.start_time is naive local time, like dt.now() elsewhere.
+        value = value.astimezone()
+    return value.astimezone(timezone.utc)
+
+
+def _version(kind, ident, count, *timestamps):
+    timestamps = [_aware(value) for value in timestamps if value is not None]
+    last_modified = max(timestamps) if timestamps else None
+    raw = '{}:{}:{}:{}'.format(kind, ident, count, last_modified and last_modified.isoformat())
+    return last_modified, hashlib.md5(raw.encode()).hexdigest()
+
+
+def _detail_version(kind, model, show_column, counterpart, counterpart_column, id):
+    now = dt.now()
+    row = db.session.query(
+        model.updated_at,
+        func.max(Show.updated_at),
+        func.max(counterpart.updated_at),
+        func.max(case((Show.start_time <= now, Show.start_time))),
+        func.count(Show.id)
+    ).outerjoin(
+        Show, show_column == model.id
+    ).outerjoin(
+        counterpart, counterpart.id == counterpart_column
+    ).filter(model.id == id).group_by(model.id).first()
+    if row is None:
+        return None
+    updated_at, shows_updated_at, counterparts_updated_at, last_started, count = row
+    return _version(kind, id, count, updated_at, shows_updated_at,
+                    counterparts_updated_at, last_started)
+
+
+def venue_version(venue_id):
+    return _detail_version('venue', Venue, Show.venue_id, Artist, Show.artist_id, venue_id)
+
+
+def artist_version(artist_id):
+    return _detail_version('artist', Artist, Show.artist_id, Venue, Show.venue_id, artist_id)
+
+
+def listing_version(kind, *models, vary=''):
+    # Row counts catch deletes; the newest updated_at catches everything else.
+    # `vary` adds what the query string leaves implicit, as cache.cached().
+    columns = []
+    for model in models:
+        columns.append(select(func.count(model.id)).scalar_subquery())
+        columns.append(select(func.max(model.updated_at)).scalar_subquery())
+    row = db.session.query(*columns).one()
+    ident = request.query_string.decode()
+    if vary:
+        ident += '|' + vary
+    return _version(kind, ident, row[0::2], *row[1::2])
+
+#----------------------------------------------------------------------------#
+# Conditional responses.
+#----------------------------------------------------------------------------#
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def conditional(version):
+    # Answers If-None-Match / If-Modified-Since with 304 before the view (and
+    # the page cache) runs. `version` takes the view arguments and returns
+    # (last_modified, etag), or None to let the view handle a missing entity.
+    # The etag is left in g.page_version, which cache.cached() keys on, so a
+    # page cached before the data moved is never sent under the new etag.
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**kwargs):
+            if request.method != 'GET' or session.get('_flashes'):
+                return view(**kwargs)
+            current = version(**kwargs)
+            if current is None:
+                return view(**kwargs)
+
+            last_modified, etag = current
+            g.page_version = etag
+            if _not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(**kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
@@ -3,13 +3,185 @@ SECRET_KEY = os.urandom(32)
 # Grabs the folder where the script runs.
 basedir = os.path.abspath(os.path.dirname(__file__))
 
-# Enable debug mode.
-DEBUG = True
-
 SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+# Blueprints app.create_app() imports and registers, as module:attribute.
+BLUEPRINTS = ['views:pages', 'api:api']
+
 # Connect to the database
 
 
-# TODO IMPLEMENT DATABASE URL
-SQLALCHEMY_DATABASE_URI = 'postgresql://localhost:5432/fyuur'
\ No newline at end of file
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def _env_bool(name, default):
+    return os.environ.get(name, str(default)).lower() in ('1', 'true', 'yes', 'on')
+
+
+# Enable debug mode.
+DEBUG = _env_bool('DEBUG', True)
+
+
+SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'postgresql://localhost:5432/fyuur')
+
+# Read replicas, comma-separated. Views marked @read_only (routing.py) read
+# from one of them; writes and everything else use the primary, and a
+# client stays on the primary for READ_YOUR_WRITES_SECONDS after a write.
+# Keep that above the usual replica lag. Pages cached from a lagging replica
+# can stay stale for up to CACHE_DEFAULT_TTL.
+SQLALCHEMY_REPLICA_URIS = [url for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url]
+READ_YOUR_WRITES_SECONDS = _env_int('READ_YOUR_WRITES_SECONDS', 10)
+
+# Engine/pool settings, sized per gunicorn worker. DB_POOL_MODE=null hands
+# every checkout straight to the server, for use behind PgBouncer.
+DB_POOL_MODE = os.environ.get('DB_POOL_MODE', 'queue')
+DB_POOL_SIZE = _env_int('DB_POOL_SIZE', 5)
+DB_MAX_OVERFLOW = _env_int('DB_MAX_OVERFLOW', 10)
+DB_POOL_TIMEOUT = _env_int('DB_POOL_TIMEOUT', 30)
+DB_POOL_RECYCLE = _env_int('DB_POOL_RECYCLE', 1800)
+DB_POOL_PRE_PING = _env_bool('DB_POOL_PRE_PING', True)
+# Postgres statement_timeout in ms, sent as a startup option; 0 disables it
+# (PgBouncer rejects startup options unless told to ignore them).
+DB_STATEMENT_TIMEOUT_MS = _env_int('DB_STATEMENT_TIMEOUT_MS', 0)
+
+SQLALCHEMY_ENGINE_OPTIONS = {}
+if not SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
+    SQLALCHEMY_ENGINE_OPTIONS['pool_pre_ping'] = DB_POOL_PRE_PING
+    if DB_POOL_MODE == 'null':
+        from sqlalchemy.pool import NullPool
+        SQLALCHEMY_ENGINE_OPTIONS['poolclass'] = NullPool
+    else:
+        from pool_stats import InstrumentedQueuePool
+        SQLALCHEMY_ENGINE_OPTIONS.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+if SQLALCHEMY_DATABASE_URI.startswith('postgresql') and DB_STATEMENT_TIMEOUT_MS:
+    SQLALCHEMY_ENGINE_OPTIONS['connect_args'] = {
+        'options': '-c statement_timeout={}'.format(DB_STATEMENT_TIMEOUT_MS)
+    }
+
+# Keyset pagination for /shows: default and maximum rows per page.
+SHOWS_PER_PAGE = 50
+SHOWS_MAX_PER_PAGE = 200
+
+# Calendar (/shows?from=&to=&city=): days shown when `to` is left out, and
+# the longest range asked for at once. The per-day counts cost about one
+# index entry per show in the range, so keep it to a few months.
+CALENDAR_DEFAULT_DAYS = 31
+CALENDAR_MAX_DAYS = 92
+
+# Listing pages (/venues, /artists, /shows) read their rows through a
+# server-side cursor, LISTING_CHUNK rows per fetch. With STREAM_LISTINGS on,
+# the HTML is sent as it renders, in writes of about STREAM_BUFFER_SIZE
+# characters, instead of being built in full; the page cache is bypassed.
+LISTING_CHUNK = 500
+STREAM_LISTINGS = _env_bool('STREAM_LISTINGS', False)
+STREAM_BUFFER_SIZE = 16384
+
+# ASGI entry point (asgi.py, `uvicorn asgi:application`): the read pages run
+# on asyncpg with the DB_POOL_* settings above; every other route runs on
+# the Flask app in a pool of ASGI_SYNC_THREADS threads.
+ASGI_SYNC_THREADS = _env_int('ASGI_SYNC_THREADS', 10)
+
+# Search backend for /venues/search and /artists/search: 'trigram' (Postgres
+# pg_trgm indexes), 'memory' (in-process index, e.g. SQLite or tests) or
+# 'auto' to pick by database dialect.
+SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'auto')
+SEARCH_RESULT_LIMIT = 50
+SEARCH_PER_PAGE = 20
+
+# JSON API (/api/v1): default and maximum items per page, and how many rows
+# are fetched per round trip while a collection response streams.
+API_PER_PAGE = 50
+API_MAX_PER_PAGE = 1000
+API_STREAM_CHUNK = 500
+
+# Show scheduling (scheduling.py): how long a show holds its venue and
+# artist, for double-booking checks, and the most rows POST /api/v1/shows
+# takes at once.
+SHOW_LENGTH_MINUTES = 120
+SCHEDULE_MAX_BATCH = 5000
+
+# How far back `flask shows rollover` looks for shows that have started.
+# Keep it comfortably above the cron interval the command runs at.
+SHOW_COUNTERS_ROLLOVER_MINUTES = 60
+
+# Rendered-page cache for the listing and detail pages: 'memory' (per-process
+# LRU), 'redis' (shared, needs the redis package) or 'none'.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+CACHE_DEFAULT_TTL = 60
+CACHE_MAX_ENTRIES = 1024
+
+# Per-request SQL profiling (profiler.py): statements slower than this are
+# logged, and a statement shape repeated this many times in one request is
+# reported as a likely N+1.
+SQL_SLOW_QUERY_MS = 100
+SQL_REPEAT_THRESHOLD = 5
+SQL_KEEP_SLOWEST = 5
+
+# Diagnostics endpoints such as /debug/queries report internals of the
+# worker that serves them, so they are only registered in debug mode or
+# when DIAGNOSTICS_ENDPOINTS is set.
+DIAGNOSTICS_ENDPOINTS = _env_bool('DIAGNOSTICS_ENDPOINTS', False)
+
+# Static assets (assets.py): `flask assets build` writes the bundles, copies
+# and image variants below to static/<ASSETS_DIR> under content-hashed names,
+# served with ASSETS_MAX_AGE and `immutable`. Paths are relative to static/.
+# Turn ASSETS_BUILD off to link the source files while editing them.
+ASSETS_BUILD = _env_bool('ASSETS_BUILD', True)
+ASSETS_DIR = 'dist'
+ASSETS_MAX_AGE = 365 * 24 * 3600
+ASSET_BUNDLES = {
+    'css/site.css': ['css/bootstrap.min.css', 'css/layout.main.css', 'css/main.css',
+                     'css/main.responsive.css', 'css/main.quickfix.css'],
+    'js/head.js': ['js/libs/modernizr-2.8.2.min.js', 'js/script.js'],
+    'js/site.js': ['js/libs/bootstrap-3.1.1.min.js', 'js/plugins.js'],
+}
+# Single files linked by their own name (glob patterns).
+ASSET_FILES = ['js/libs/jquery-1.11.1.min.js', 'js/libs/respond-1.4.2.min.js']
+# Images and the widths of their JPEG and WebP variants.
+ASSET_IMAGES = {
+    'img/front-splash.jpg': [480, 960, 1440],
+}
+
+# Image proxy (images.py): venue and artist images are fetched once, kept
+# in IMAGE_CACHE_DIR (least recently used files go past IMAGE_CACHE_MAX_BYTES)
+# and served as thumbnails fitting IMAGE_SIZES, (width, height) boxes sized
+# for 2x screens. A failing link is retried after IMAGE_FETCH_RETRY_SECONDS.
+# IMAGE_FETCH_ALLOW_PRIVATE lets it fetch from loopback and private
+# addresses, e.g. a local fixture server.
+IMAGE_CACHE_DIR = os.environ.get('IMAGE_CACHE_DIR', os.path.join(basedir, 'instance', 'images'))
+IMAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+IMAGE_SIZES = {
+    'tile': (640, 400),
+    'page': (1110, 1000),
+}
+IMAGE_MAX_AGE = 365 * 24 * 3600
+IMAGE_FETCH_TIMEOUT = 5
+IMAGE_FETCH_MAX_BYTES = 10 * 1024 * 1024
+IMAGE_FETCH_RETRY_SECONDS = 300
+IMAGE_FETCH_ALLOW_PRIVATE = _env_bool('IMAGE_FETCH_ALLOW_PRIVATE', False)
+
+# Background jobs (jobs.py): 'local' runs them on JOBS_LOCAL_WORKERS threads
+# of each web process, 'database' queues them in the Job table for
+# `flask jobs work` processes, so they survive restarts and spread across
+# machines. A failing job is retried after JOBS_RETRY_BASE_SECONDS, doubling
+# up to JOBS_RETRY_MAX_SECONDS, JOBS_MAX_ATTEMPTS times in all. A job running
+# for over JOBS_TIMEOUT_SECONDS is presumed dead with its worker and queued
+# again. Finished jobs, and the idempotency keys they hold, are pruned after
+# JOBS_KEEP_FINISHED_HOURS; /jobs/stats reports on the last JOBS_STATS_MINUTES.
+JOBS_BACKEND = os.environ.get('JOBS_BACKEND', 'local')
+JOBS_LOCAL_WORKERS = _env_int('JOBS_LOCAL_WORKERS', 2)
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_BASE_SECONDS = 10
+JOBS_RETRY_MAX_SECONDS = 3600
+JOBS_TIMEOUT_SECONDS = 600
+JOBS_POLL_SECONDS = 1.0
+JOBS_KEEP_FINISHED_HOURS = 7 * 24
+JOBS_STATS_MINUTES = 15
@@ -0,0 +1,131 @@
+from datetime import datetime as dt, timedelta
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import ARRAY, Integer, bindparam, case, column, func, select, update
+
+from cache import cache
+from models import db, Venue, Artist, Show
+
+#----------------------------------------------------------------------------#
+# Show counters.
+#----------------------------------------------------------------------------#
+
+# Venue/Artist.upcoming_shows_count and past_shows_count are split at the
+# time of the last write or roll-over, so a show that starts between two
+# `flask shows rollover` runs is still counted as upcoming until the next one.
+
+def shows_added(shows, now=None):
+    # Counts a batch of new (venue_id, artist_id, start_time) shows: the
+    # deltas are summed per venue and artist and applied with one
+    # UPDATE ... FROM unnest(...) per table.
+    now = now or dt.now()
+    for model, index in ((Venue, 0), (Artist, 1)):
+        deltas = {}
+        for show in shows:
+            delta = deltas.setdefault(show[index], [0, 0])
+            delta[0 if show[2] > now else 1] += 1
+        if not deltas:
+            continue
+        ids = sorted(deltas)
+        counts = func.unnest(
+            bindparam('ids', ids, type_=ARRAY(Integer)),
+            bindparam('upcoming', [deltas[id][0] for id in ids], type_=ARRAY(Integer)),
+            bindparam('past', [deltas[id][1] for id in ids], type_=ARRAY(Integer))
+        ).table_valued(
+            column('id', Integer), column('upcoming', Integer), column('past', Integer)
+        ).render_derived(name='counts')
+        db.session.execute(update(model).where(model.id == counts.c.id).values(
+            upcoming_shows_count=model.upcoming_shows_count + counts.c.upcoming,
+            past_shows_count=model.past_shows_count + counts.c.past
+        ).execution_options(synchronize_session=False))
+
+
+def venue_removed(venue_id, now=None):
+    # Call before deleting the venue: its shows go with it (cascade), so the
+    # counters of every artist that played there have to be taken down.
+    now = now or dt.now()
+    rows = db.session.query(
+        Show.artist_id,
+        func.sum(case((Show.start_time > now, 1), else_=0)),
+        func.sum(case((Show.start_time > now, 0), else_=1))
+    ).filter(Show.venue_id == venue_id).group_by(Show.artist_id).all()
+    for artist_id, upcoming, past in rows:
+        db.session.query(Artist).filter(Artist.id == artist_id).update({
+            'upcoming_shows_count': Artist.upcoming_shows_count - upcoming,
+            'past_shows_count': Artist.past_shows_count - past
+        }, synchronize_session=False)
+
+
+def refresh(model, show_column, ids=None, now=None):
+    # Recount from Show for all rows or only `ids` (a list or a SELECT of
+    # ids): zero them, then apply one grouped aggregate with UPDATE ... FROM.
+    now = now or dt.now()
+    counts = select(
+        show_column.label('id'),
+        func.sum(case((Show.start_time > now, 1), else_=0)).label('upcoming'),
+        func.sum(case((Show.start_time > now, 0), else_=1)).label('past')
+    ).group_by(show_column)
+    reset = update(model).values(upcoming_shows_count=0, past_shows_count=0)
+    if ids is not None:
+        counts = counts.where(show_column.in_(ids))
+        reset = reset.where(model.id.in_(ids))
+    counts = counts.subquery()
+
+    db.session.execute(reset.execution_options(synchronize_session=False))
+    db.session.execute(update(model).where(model.id == counts.c.id).values(
+        upcoming_shows_count=counts.c.upcoming,
+        past_shows_count=counts.c.past
+    ).execution_options(synchronize_session=False))
+
+
+def roll_over(since, now=None):
+    # Recount only the venues and artists with a show that started in
+    # (since, now]; overlapping windows are harmless. Returns the
+    # (venue_id, artist_id) of those shows.
+    now = now or dt.now()
+    started = (Show.start_time > since, Show.start_time <= now)
+    pairs = db.session.query(Show.venue_id, Show.artist_id).filter(*started).distinct().all()
+    refresh(Venue, Show.venue_id, select(Show.venue_id).where(*started), now)
+    refresh(Artist, Show.artist_id, select(Show.artist_id).where(*started), now)
+    return pairs
+
+
+def _invalidate(venue_ids, artist_ids):
+    # The commands run in their own process, so this only reaches a shared
+    # (redis) page cache. Web workers with a memory cache see the change
+    # through the page versions of conditional.py instead: the counter
+    # UPDATEs move updated_at (the set_updated_at trigger), and a cached
+    # page is keyed on its version.
+    cache.invalidate('venues', 'artists',
+                     *['venue:{}'.format(id) for id in sorted(venue_ids)],
+                     *['artist:{}'.format(id) for id in sorted(artist_ids)])
+
+#----------------------------------------------------------------------------#
+# Commands.
+#----------------------------------------------------------------------------#
+
+shows_cli = AppGroup('shows', help='Maintain the denormalized show counters.')
+
+
+@shows_cli.command('rollover')
+@click.option('--window', type=int, default=None,
+              help='Minutes to look back (default: SHOW_COUNTERS_ROLLOVER_MINUTES).')
+def rollover_command(window):
+    """Move shows that have started from upcoming to past. Run from cron."""
+    window = window or current_app.config['SHOW_COUNTERS_ROLLOVER_MINUTES']
+    now = dt.now()
+    started = roll_over(now - timedelta(minutes=window), now)
+    db.session.commit()
+    _invalidate({venue_id for venue_id, _ in started}, {artist_id for _, artist_id in started})
+
+
+@shows_cli.command('recount')
+def recount_command():
+    """Recompute every venue and artist counter from the Show table."""
+    now = dt.now()
+    refresh(Venue, Show.venue_id, now=now)
+    refresh(Artist, Show.artist_id, now=now)
+    db.session.commit()
+    _invalidate([id for id, in db.session.query(Venue.id)], [id for id, in db.session.query(Artist.id)])
@@ -0,0 +1,412 @@
+import hashlib
+import io
+import ipaddress
+import os
+import re
+import socket
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from flask import abort, current_app, request, send_file, url_for
+
+from jobs import job, jobs
+from models import db, Venue, Artist
+from routing import read_only
+
+#----------------------------------------------------------------------------#
+# Image proxy.
+#----------------------------------------------------------------------------#
+
+# Venue and artist images are served from /images/<kind>/<id>/<size>?v=...
+# instead of hot-linked. `v` is a hash of the image_link, so a URL always
+# names the same image and is cached by browsers for good. The first request
+# for a link looks it up by id, fetches it once and stores the original;
+# each size is a thumbnail made from it on first request, unless the
+# 'images.warm' job queued by the write that set the link made it first.
+# Only links stored on a venue or artist are ever fetched.
+
+class FetchError(Exception):
+    pass
+
+
+class HTTPFetcher:
+    # The default fetcher: http(s) only, at most `max_bytes`, image content
+    # types only and, unless `allow_private`, no loopback, private or
+    # link-local addresses (also after redirects). The host is resolved
+    # once per connection and the connection made to the address that was
+    # checked, so a name that resolves differently on a second lookup
+    # can't slip past; the Host header and TLS server name stay those of
+    # the URL. Environment proxies are not used. Any callable taking a URL
+    # and returning (bytes, content type), or raising FetchError, can stand
+    # in for it.
+
+    def __init__(self, timeout=5, max_bytes=10 * 1024 * 1024, allow_private=False):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.allow_private = allow_private
+        self.opener = urllib.request.build_opener(
+            urllib.request.ProxyHandler({}), _PinnedHTTPHandler(self._resolve),
+            _PinnedHTTPSHandler(self._resolve), _CheckedRedirects(self._check))
+
+    def _check(self, url):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise FetchError('not an http(s) URL: {}'.format(url))
+
+    def _resolve(self, host, port):
+        # The addresses to connect to for `host`, all of them public unless
+        # `allow_private`.
+        try:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise FetchError('cannot resolve {}: {}'.format(host, e))
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        if not self.allow_private:
+            for address in addresses:
+                address = ipaddress.ip_address(address.split('%')[0])
+                if not address.is_global:
+                    raise FetchError('{} resolves to non-public address {}'.format(host, address))
+        return addresses
+
+    def __call__(self, url):
+        self._check(url)
+        try:
+            with self.opener.open(url, timeout=self.timeout) as response:
+                content_type = response.headers.get_content_type()
+                if not content_type.startswith('image/'):
+                    raise FetchError('{} is {}, not an image'.format(url, content_type))
+                data = response.read(self.max_bytes + 1)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise FetchError('cannot fetch {}: {}'.format(url, e))
+        if len(data) > self.max_bytes:
+            raise FetchError('{} is larger than {} bytes'.format(url, self.max_bytes))
+        return data, content_type
+
+
+def _pinned(connection_class, resolve):
+    # `connection_class` connecting only to addresses from resolve(host,
+    # port). It keeps the URL's host name for the Host header, TLS SNI and
+    # certificate checks.
+    def connect(address, timeout=socket._GLOBAL_DEFAULT_TIMEOUT, source_address=None):
+        host, port = address
+        error = None
+        for ip in resolve(host, port):
+            try:
+                return socket.create_connection((ip, port), timeout, source_address)
+            except OSError as e:
+                error = e
+        raise error
+
+    def make(host, **kwargs):
+        connection = connection_class(host, **kwargs)
+        connection._create_connection = connect
+        return connection
+    return make
+
+
+class _PinnedHTTPHandler(urllib.request.HTTPHandler):
+    def __init__(self, resolve):
+        super().__init__()
+        self.resolve = resolve
+
+    def do_open(self, http_class, req, **kwargs):
+        return super().do_open(_pinned(http_class, self.resolve), req, **kwargs)
+
+
+class _PinnedHTTPSHandler(urllib.request.HTTPSHandler):
+    def __init__(self, resolve):
+        super().__init__()
+        self.resolve = resolve
+
+    def do_open(self, http_class, req, **kwargs):
+        return super().do_open(_pinned(http_class, self.resolve), req, **kwargs)
+
+
+class _CheckedRedirects(urllib.request.HTTPRedirectHandler):
+    def __init__(self, check):
+        self.check = check
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        self.check(newurl)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+#----------------------------------------------------------------------------#
+# Disk cache.
+#----------------------------------------------------------------------------#
+
+class DiskCache:
+    # Files under `root`, evicted least recently used first once they total
+    # more than `max_bytes`. Reads bump the file's atime explicitly (mount
+    # options can't be relied on for that), and a sweep runs after every
+    # tenth of `max_bytes` written by this process, and on its first write.
+    # Workers share the directory: writes are atomic renames, and a file
+    # evicted under a reader is treated as a miss.
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._written = max_bytes
+        self._lock = threading.Lock()
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def get(self, name):
+        # The file's path, or None when it isn't cached.
+        path = self.path(name)
+        try:
+            os.utime(path, (time.time(), os.stat(path).st_mtime))
+        except FileNotFoundError:
+            return None
+        return path
+
+    def read(self, name):
+        path = self.get(name)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, name, data):
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self._written += len(data)
+            sweep = self._written >= self.max_bytes // 10
+            if sweep:
+                self._written = 0
+        if sweep:
+            self.sweep()
+        return path
+
+    def sweep(self):
+        # Removes the least recently used files until the cache is back
+        # under 90% of max_bytes. Returns the bytes in use afterwards.
+        files, total = [], 0
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_atime, stat.st_size, path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return total
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        return total
+
+#----------------------------------------------------------------------------#
+# Thumbnails.
+#----------------------------------------------------------------------------#
+
+FORMATS = {'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+
+def link_version(link):
+    return hashlib.sha256(link.encode()).hexdigest()[:16]
+
+
+def _original_name(digest):
+    return 'originals/{}/{}'.format(digest[:2], digest)
+
+
+def _thumbnail_name(digest, size, format):
+    return 'thumbnails/{}/{}-{}.{}'.format(digest[:2], digest, size, format)
+
+
+def make_thumbnail(data, box, format):
+    # `data` scaled down to fit in `box`, as WebP or JPEG bytes. OSError
+    # when it can't be read, as for any undecodable image.
+    from PIL import Image, ImageOps
+
+    try:
+        image = Image.open(io.BytesIO(data))
+    except Image.DecompressionBombError as e:
+        # Too many pixels to decode safely; not an OSError itself.
+        raise OSError(str(e))
+    with image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(box, Image.LANCZOS)
+        if format == 'jpeg' or image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+            if format == 'jpeg':
+                background = Image.new('RGB', image.size, 'white')
+                background.paste(image, mask=image.getchannel('A'))
+                image = background
+        buffer = io.BytesIO()
+        if format == 'webp':
+            image.save(buffer, 'WEBP', quality=80, method=4)
+        else:
+            image.save(buffer, 'JPEG', quality=82, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+class ImageProxy:
+    MODELS = {'venue': Venue, 'artist': Artist}
+
+    def __init__(self):
+        self.failures = {}
+        # Striped locks, so a link is fetched (and a size made) once per
+        # process even when a page asks for it many times at once.
+        self._locks = [threading.Lock() for _ in range(64)]
+
+    def init_app(self, app, fetcher=None):
+        config = app.config
+        self.fetcher = fetcher or HTTPFetcher(config['IMAGE_FETCH_TIMEOUT'], config['IMAGE_FETCH_MAX_BYTES'],
+                                              config['IMAGE_FETCH_ALLOW_PRIVATE'])
+        self.cache = DiskCache(config['IMAGE_CACHE_DIR'], config['IMAGE_CACHE_MAX_BYTES'])
+        app.extensions['image_proxy'] = self
+        app.add_url_rule('/images/<kind>/<int:id>/<size>', 'image', read_only(self.view))
+        app.jinja_env.globals['image_url'] = self.url
+
+    def url(self, kind, id, link, size):
+        # The proxy URL for a venue's or artist's image_link; empty links
+        # stay empty.
+        if not link:
+            return link
+        return url_for('image', kind=kind, id=id, size=size, v=link_version(link))
+
+    def _lock(self, key):
+        return self._locks[int(key[:8], 16) % len(self._locks)]
+
+    def _digest(self, version):
+        # The content hash of the image behind `version`, if it was fetched.
+        pointer = self.cache.read('links/{}/{}'.format(version[:2], version))
+        return pointer.decode().split() if pointer is not None else (None, None)
+
+    def _original(self, kind, id, version):
+        # (digest, bytes, content type) of the image behind `version`,
+        # fetched on the first request for it; None if the link is unknown
+        # or failing.
+        digest, content_type = self._digest(version)
+        if digest is not None:
+            data = self.cache.read(_original_name(digest))
+            if data is not None:
+                return digest, data, content_type
+
+        model = self.MODELS[kind]
+        link = db.session.query(model.image_link).filter(model.id == id).scalar()
+        if not link or link_version(link) != version:
+            return None
+        if self.failures.get(version, 0) > time.monotonic():
+            return None
+        try:
+            data, content_type = self.fetcher(link)
+        except FetchError as e:
+            current_app.logger.warning('image proxy: %s', e)
+            if len(self.failures) > 10000:
+                self.failures.clear()
+            self.failures[version] = time.monotonic() + current_app.config['IMAGE_FETCH_RETRY_SECONDS']
+            return None
+        digest = hashlib.sha256(data).hexdigest()
+        self.cache.put(_original_name(digest), data)
+        self.cache.put('links/{}/{}'.format(version[:2], version),
+                       '{} {}'.format(digest, content_type).encode())
+        return digest, data, content_type
+
+    def _thumbnail(self, digest, data, size, format):
+        # The path of a thumbnail, made unless it's cached. Call under the
+        # lock of its link.
+        path = self.cache.get(_thumbnail_name(digest, size, format))
+        if path is None:
+            thumbnail = make_thumbnail(data, current_app.config['IMAGE_SIZES'][size], format)
+            path = self.cache.put(_thumbnail_name(digest, size, format), thumbnail)
+        return path
+
+    def view(self, kind, id, size):
+        version = request.args.get('v', '')
+        if (kind not in self.MODELS or size not in current_app.config['IMAGE_SIZES']
+                or not re.fullmatch('[0-9a-f]{16}', version)):
+            abort(404)
+        # WebP only when asked for by name: every browser sends */* too.
+        webp = any(value == 'image/webp' and quality for value, quality in request.accept_mimetypes)
+        format = 'webp' if webp else 'jpeg'
+
+        # A thumbnail already made is served without touching the database.
+        digest, _ = self._digest(version)
+        path = digest and self.cache.get(_thumbnail_name(digest, size, format))
+        if not path:
+            with self._lock(version):
+                original = self._original(kind, id, version)
+                if original is None:
+                    abort(404)
+                digest, data, content_type = original
+                try:
+                    path = self._thumbnail(digest, data, size, format)
+                except ImportError:
+                    # Without Pillow the original is served as it is.
+                    return self._send(self.cache.path(_original_name(digest)), content_type,
+                                      digest, vary=False)
+                except OSError as e:
+                    current_app.logger.warning('image proxy: cannot read %s %s: %s', kind, id, e)
+                    abort(404)
+        return self._send(path, FORMATS[format], '{}-{}-{}'.format(digest, size, format), vary=True)
+
+    def warm(self, kind, id, version):
+        # Fetches the image behind `version` and makes every thumbnail of
+        # it, so the first page showing it doesn't wait. Raises FetchError
+        # to be retried; a link that has changed since is skipped.
+        with self._lock(version):
+            # The job's retries have their own backoff.
+            self.failures.pop(version, None)
+            original = self._original(kind, id, version)
+            if original is None:
+                if version in self.failures:
+                    raise FetchError('cannot fetch the image of {} {}'.format(kind, id))
+                return
+            digest, data, _ = original
+            try:
+                for size in current_app.config['IMAGE_SIZES']:
+                    for format in FORMATS:
+                        self._thumbnail(digest, data, size, format)
+            except ImportError:
+                pass
+            except OSError as e:
+                current_app.logger.warning('image proxy: cannot read %s %s: %s', kind, id, e)
+
+    def _send(self, path, mimetype, etag, vary):
+        response = send_file(path, mimetype=mimetype, etag=etag,
+                             max_age=current_app.config['IMAGE_MAX_AGE'], conditional=True)
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        if vary:
+            response.vary.add('Accept')
+        return response
+
+
+images = ImageProxy()
+
+
+@job('images.warm')
+def warm(kind, id, version):
+    images.warm(kind, id, version)
+
+
+def warm_later(kind, id, link):
+    # Queues the thumbnails of a venue's or artist's new image_link; call
+    # before committing the write that sets it.
+    if link:
+        version = link_version(link)
+        jobs.enqueue('images.warm', key='images.warm:{}:{}:{}'.format(kind, id, version),
+                     kind=kind, id=id, version=version)
@@ -0,0 +1,378 @@
+import heapq
+import itertools
+import json
+import threading
+import time
+import traceback
+from collections import OrderedDict, deque
+from datetime import timedelta
+
+import click
+from flask import current_app, jsonify
+from flask.cli import AppGroup
+from sqlalchemy import case, delete, event, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from models import db, Job
+from routing import RoutingSession
+
+#----------------------------------------------------------------------------#
+# Background jobs.
+#----------------------------------------------------------------------------#
+
+# Work a write makes necessary but its response doesn't wait for (image
+# thumbnails so far) is enqueued by the write and run by a worker. A job is
+# a function registered with @job(name) and called with the keyword
+# arguments it was enqueued with, in an app context of its own; what it
+# writes is committed when it returns. enqueue() joins the current
+# transaction: the job is queued when the session commits and dropped if it
+# rolls back. Jobs run at least once, so they must be safe to repeat. One
+# that raises is retried after JOBS_RETRY_BASE_SECONDS, doubling each time,
+# up to its max_attempts. Enqueueing under an idempotency key is a no-op
+# while a job with that key is known: queued, running, or finished and not
+# yet pruned (forgotten, for the local backend).
+#
+# JOBS_BACKEND picks where jobs wait: 'database' keeps them in the Job table
+# for `flask jobs work` processes, 'local' runs them on threads of the web
+# process and loses whatever is queued when it exits.
+
+handlers = {}
+
+
+def job(name, max_attempts=None):
+    def register(fn):
+        handlers[name] = (fn, max_attempts)
+        return fn
+    return register
+
+
+def _backoff(config, attempts):
+    return min(config['JOBS_RETRY_BASE_SECONDS'] * 2 ** (attempts - 1), config['JOBS_RETRY_MAX_SECONDS'])
+
+
+def _run(app, name, args):
+    # Runs a job; returns None, or the error to record.
+    with app.app_context():
+        try:
+            fn, _ = handlers[name]
+        except KeyError:
+            return 'no job named {!r}'.format(name)
+        try:
+            fn(**args)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            app.logger.exception('job %s failed', name)
+            return traceback.format_exc(limit=5)
+    return None
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    if not samples:
+        return {'p50': None, 'p95': None, 'max': None}
+    return {
+        'p50': samples[int(len(samples) * 0.5)] * 1000,
+        'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+        'max': samples[-1] * 1000,
+    }
+
+#----------------------------------------------------------------------------#
+# Database backend.
+#----------------------------------------------------------------------------#
+
+class DatabaseQueue:
+    name = 'database'
+
+    def __init__(self, app):
+        self.app = app
+
+    def enqueue(self, session, entry):
+        session.execute(insert(Job).values(
+            name=entry['name'], args=entry['args'], key=entry['key'],
+            max_attempts=entry['max_attempts'],
+            run_at=func.now() + timedelta(seconds=entry['delay'])
+        ).on_conflict_do_nothing(index_elements=['key']))
+
+    def requeue_stale(self):
+        # Running jobs older than JOBS_TIMEOUT_SECONDS are taken to have
+        # died with their worker: queued again, or failed if that was their
+        # last attempt.
+        stale = func.now() - timedelta(seconds=self.app.config['JOBS_TIMEOUT_SECONDS'])
+        last = Job.attempts >= Job.max_attempts
+        result = db.session.execute(update(Job).where(
+            Job.status == 'running', Job.started_at < stale
+        ).values(
+            status=case((last, 'failed'), else_='queued'),
+            finished_at=case((last, func.now()), else_=None),
+            last_error='timed out'
+        ).execution_options(synchronize_session=False))
+        db.session.commit()
+        return result.rowcount
+
+    def claim(self):
+        # The next due job, marked running in a transaction of its own;
+        # SKIP LOCKED lets any number of workers claim side by side.
+        due = select(Job.id).where(Job.status == 'queued', Job.run_at <= func.now()).order_by(
+            Job.run_at).limit(1).with_for_update(skip_locked=True).scalar_subquery()
+        row = db.session.execute(update(Job).where(Job.id == due).values(
+            status='running', started_at=func.now(), attempts=Job.attempts + 1
+        ).returning(Job.id, Job.name, Job.args, Job.attempts, Job.max_attempts).execution_options(
+            synchronize_session=False)).first()
+        db.session.commit()
+        return row
+
+    def finish(self, row, error):
+        if error is None:
+            values = {'status': 'done', 'finished_at': func.now(), 'last_error': None}
+        elif row.attempts < row.max_attempts:
+            delay = timedelta(seconds=_backoff(self.app.config, row.attempts))
+            values = {'status': 'queued', 'run_at': func.now() + delay, 'last_error': error}
+        else:
+            values = {'status': 'failed', 'finished_at': func.now(), 'last_error': error}
+        # Unless it was taken over in the meantime.
+        db.session.execute(update(Job).where(
+            Job.id == row.id, Job.status == 'running', Job.attempts == row.attempts
+        ).values(**values).execution_options(synchronize_session=False))
+        db.session.commit()
+
+    def prune(self):
+        keep = func.now() - timedelta(hours=self.app.config['JOBS_KEEP_FINISHED_HOURS'])
+        result = db.session.execute(delete(Job).where(
+            Job.status.in_(('done', 'failed')), Job.finished_at < keep
+        ).execution_options(synchronize_session=False))
+        db.session.commit()
+        return result.rowcount
+
+    def work(self, burst=False):
+        # Runs jobs until interrupted, or until none is due with `burst`.
+        # Returns the number run.
+        poll = self.app.config['JOBS_POLL_SECONDS']
+        ran, pruned_at = 0, 0
+        self.requeue_stale()
+        while True:
+            row = self.claim()
+            if row is None:
+                if time.monotonic() - pruned_at > 3600:
+                    self.prune()
+                    pruned_at = time.monotonic()
+                if burst:
+                    return ran
+                time.sleep(poll)
+                self.requeue_stale()
+                continue
+            self.finish(row, _run(self.app, row.name, row.args))
+            ran += 1
+
+    def stats(self):
+        # Queue depth now, and outcomes and latencies of the jobs that
+        # finished within JOBS_STATS_MINUTES, across all workers.
+        window = func.now() - timedelta(minutes=self.app.config['JOBS_STATS_MINUTES'])
+        depth = db.session.execute(select(
+            Job.name, Job.status, func.count(),
+            func.count().filter(Job.run_at <= func.now()),
+            func.extract('epoch', func.now() - func.min(Job.run_at))
+        ).where(Job.status.in_(('queued', 'running'))).group_by(Job.name, Job.status)).all()
+        by_name = {}
+        for name, status, count, due, _ in depth:
+            by_name.setdefault(name, {'queued': 0, 'running': 0})[status] = count
+        queued = [row for row in depth if row[1] == 'queued']
+
+        wait = func.extract('epoch', Job.started_at - Job.run_at)
+        run = func.extract('epoch', Job.finished_at - Job.started_at)
+        finished = db.session.execute(select(
+            func.count().filter(Job.status == 'done'),
+            func.count().filter(Job.status == 'failed'),
+            func.percentile_cont(0.5).within_group(wait), func.percentile_cont(0.95).within_group(wait),
+            func.max(wait),
+            func.percentile_cont(0.5).within_group(run), func.percentile_cont(0.95).within_group(run),
+            func.max(run)
+        ).where(Job.status.in_(('done', 'failed')), Job.finished_at >= window)).one()
+
+        def ms(value):
+            return None if value is None else float(value) * 1000
+
+        return {
+            'backend': self.name,
+            'queued': sum(row[2] for row in queued),
+            'due': sum(row[3] for row in queued),
+            'running': sum(row[2] for row in depth if row[1] == 'running'),
+            'oldest_queued_seconds': max((float(row[4]) for row in queued), default=None),
+            'by_name': by_name,
+            'window_minutes': self.app.config['JOBS_STATS_MINUTES'],
+            'done': finished[0],
+            'failed': finished[1],
+            'wait_ms': {'p50': ms(finished[2]), 'p95': ms(finished[3]), 'max': ms(finished[4])},
+            'run_ms': {'p50': ms(finished[5]), 'p95': ms(finished[6]), 'max': ms(finished[7])},
+        }
+
+#----------------------------------------------------------------------------#
+# Local backend.
+#----------------------------------------------------------------------------#
+
+class LocalQueue:
+    # A heap of jobs by due time, served by JOBS_LOCAL_WORKERS threads of
+    # this process, started on the first job. Stats cover this process
+    # only, like /cache/stats and /debug/pool.
+    name = 'local'
+    KEEP_KEYS = 10000
+    SAMPLES = 1024
+
+    def __init__(self, app):
+        self.app = app
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._threads = []
+        self._keys = OrderedDict()
+        self._running = 0
+        self._counts = {'done': 0, 'failed': 0, 'retried': 0}
+        self._waits = deque(maxlen=self.SAMPLES)
+        self._runs = deque(maxlen=self.SAMPLES)
+
+    def enqueue(self, session, entry):
+        session.info.setdefault(_PENDING, []).append((self, entry))
+
+    def submit(self, entry):
+        with self._cond:
+            key = entry['key']
+            if key is not None:
+                if key in self._keys:
+                    return
+                self._keys[key] = True
+                if len(self._keys) > self.KEEP_KEYS:
+                    self._keys.popitem(last=False)
+            entry = dict(entry, attempts=0, run_at=time.monotonic() + entry['delay'])
+            heapq.heappush(self._heap, (entry['run_at'], next(self._seq), entry))
+            while len(self._threads) < self.app.config['JOBS_LOCAL_WORKERS']:
+                thread = threading.Thread(target=self._work, name='jobs-{}'.format(len(self._threads)),
+                                          daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            self._cond.notify()
+
+    def _next(self):
+        with self._cond:
+            while not self._heap or self._heap[0][0] > time.monotonic():
+                self._cond.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+            _, _, entry = heapq.heappop(self._heap)
+            self._running += 1
+            return entry
+
+    def _work(self):
+        while True:
+            entry = self._next()
+            started = time.monotonic()
+            error = _run(self.app, entry['name'], entry['args'])
+            finished = time.monotonic()
+            with self._cond:
+                self._running -= 1
+                self._waits.append(started - entry['run_at'])
+                self._runs.append(finished - started)
+                entry['attempts'] += 1
+                if error is None:
+                    self._counts['done'] += 1
+                elif entry['attempts'] < entry['max_attempts']:
+                    self._counts['retried'] += 1
+                    entry['run_at'] = finished + _backoff(self.app.config, entry['attempts'])
+                    heapq.heappush(self._heap, (entry['run_at'], next(self._seq), entry))
+                    self._cond.notify()
+                else:
+                    self._counts['failed'] += 1
+
+    def stats(self):
+        with self._cond:
+            now = time.monotonic()
+            by_name = {}
+            for _, _, entry in self._heap:
+                by_name.setdefault(entry['name'], {'queued': 0, 'running': 0})['queued'] += 1
+            due = [entry for run_at, _, entry in self._heap if run_at <= now]
+            return dict(self._counts, **{
+                'backend': self.name,
+                'queued': len(self._heap),
+                'due': len(due),
+                'running': self._running,
+                'oldest_queued_seconds': max((now - entry['run_at'] for entry in due), default=None),
+                'by_name': by_name,
+                'samples': len(self._runs),
+                'wait_ms': _percentiles(self._waits),
+                'run_ms': _percentiles(self._runs),
+            })
+
+
+# Jobs the local backend queues once the session commits.
+_PENDING = 'pending_jobs'
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _submit_pending(session):
+    for queue, entry in session.info.pop(_PENDING, ()):
+        queue.submit(entry)
+
+
+@event.listens_for(RoutingSession, 'after_transaction_end')
+def _drop_pending(session, transaction):
+    # Whatever is left when the outermost transaction ends was rolled back.
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
+
+#----------------------------------------------------------------------------#
+# Extension.
+#----------------------------------------------------------------------------#
+
+BACKENDS = {'database': DatabaseQueue, 'local': LocalQueue}
+
+
+class JobQueue:
+    def __init__(self):
+        self.backend = None
+
+    def init_app(self, app):
+        self.backend = BACKENDS[app.config['JOBS_BACKEND']](app)
+        app.extensions['jobs'] = self
+        # `flask jobs stats` reports the same outside debug mode.
+        if app.debug or app.config.get('DIAGNOSTICS_ENDPOINTS'):
+            app.add_url_rule('/jobs/stats', 'job_stats', self.stats_view)
+
+    def enqueue(self, name, key=None, delay=0, **args):
+        # Queues job `name` with `args` (JSON values) when the current
+        # transaction commits, due `delay` seconds after that.
+        _, max_attempts = handlers[name]
+        self.backend.enqueue(db.session, {
+            'name': name, 'args': args, 'key': key, 'delay': delay,
+            'max_attempts': max_attempts or current_app.config['JOBS_MAX_ATTEMPTS'],
+        })
+
+    def stats(self):
+        return self.backend.stats()
+
+    def stats_view(self):
+        return jsonify(self.stats())
+
+
+jobs = JobQueue()
+
+#----------------------------------------------------------------------------#
+# Commands.
+#----------------------------------------------------------------------------#
+
+jobs_cli = AppGroup('jobs', help='Run and inspect background jobs.')
+
+
+@jobs_cli.command('work')
+@click.option('--burst', is_flag=True, help='Exit once no job is due instead of waiting for more.')
+def work_command(burst):
+    """Run jobs from the Job table (JOBS_BACKEND=database)."""
+    if not isinstance(jobs.backend, DatabaseQueue):
+        raise click.UsageError('JOBS_BACKEND is {}: jobs run in the web process'.format(jobs.backend.name))
+    try:
+        ran = jobs.backend.work(burst)
+    except KeyboardInterrupt:
+        return
+    click.echo('{} jobs run'.format(ran))
+
+
+@jobs_cli.command('stats')
+def stats_command():
+    """Print queue depth and job latencies."""
+    click.echo(json.dumps(jobs.stats(), indent=2, default=str))
@@ -0,0 +1,30 @@
+"""city and genre search indexes
+
+Revision ID: 16eb629885ae
+Revises: 4c7562df4158
+Create Date: 2026-10-18 11:02:54.881276
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '16eb629885ae'
+down_revision = '4c7562df4158'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ('Venue', 'Artist'):
+        op.create_index('ix_{}_city_trgm'.format(table), table, ['city'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'city': 'gin_trgm_ops'})
+        op.create_index('ix_{}_genres'.format(table), table, ['genres'], unique=False,
+                        postgresql_using='gin')
+
+
+def downgrade():
+    for table in ('Artist', 'Venue'):
+        op.drop_index('ix_{}_genres'.format(table), table_name=table)
+        op.drop_index('ix_{}_city_trgm'.format(table), table_name=table)
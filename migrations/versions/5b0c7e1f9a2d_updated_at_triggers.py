@@ -0,0 +1,30 @@
+"""updated_at triggers
+
+Revision ID: 5b0c7e1f9a2d
+Revises: d41c7a9e3b10
+Create Date: 2026-10-18 23:12:40.381522
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b0c7e1f9a2d'
+down_revision = 'd41c7a9e3b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$ '
+               'BEGIN NEW.updated_at = now(); RETURN NEW; END; $$ LANGUAGE plpgsql')
+    for table in ('Venue', 'Artist', 'Show'):
+        op.execute('CREATE TRIGGER "{0}_updated_at" BEFORE UPDATE ON "{0}" '
+                   'FOR EACH ROW EXECUTE PROCEDURE set_updated_at()'.format(table))
+
+
+def downgrade():
+    for table in ('Show', 'Artist', 'Venue'):
+        op.execute('DROP TRIGGER "{0}_updated_at" ON "{0}"'.format(table))
+    op.execute('DROP FUNCTION set_updated_at()')
@@ -0,0 +1,27 @@
+"""updated_at columns
+
+Revision ID: 63126d25afce
+Revises: b968b22a993f
+Create Date: 2026-10-18 12:36:50.217448
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '63126d25afce'
+down_revision = 'b968b22a993f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ('Venue', 'Artist', 'Show'):
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True),
+                                       server_default=sa.text('now()'), nullable=False))
+
+
+def downgrade():
+    for table in ('Show', 'Artist', 'Venue'):
+        op.drop_column(table, 'updated_at')
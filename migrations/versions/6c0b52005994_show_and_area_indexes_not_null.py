@@ -0,0 +1,48 @@
+"""show and area indexes, not null columns
+
+Revision ID: 6c0b52005994
+Revises: 63126d25afce
+Create Date: 2026-10-18 15:02:41.308117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '6c0b52005994'
+down_revision = '63126d25afce'
+branch_labels = None
+depends_on = None
+
+# Columns the venue, artist and show forms require. Fails if existing rows
+# have NULLs there; fix those rows first.
+REQUIRED = [
+    ('Venue', 'name', sa.String()),
+    ('Venue', 'city', sa.String(length=120)),
+    ('Venue', 'state', sa.String(length=120)),
+    ('Venue', 'address', sa.String(length=120)),
+    ('Venue', 'genres', postgresql.ARRAY(sa.String())),
+    ('Artist', 'name', sa.String()),
+    ('Artist', 'city', sa.String(length=120)),
+    ('Artist', 'state', sa.String(length=120)),
+    ('Artist', 'genres', postgresql.ARRAY(sa.String())),
+    ('Show', 'start_time', sa.DateTime()),
+]
+
+
+def upgrade():
+    op.create_index('ix_Show_venue_id_start_time', 'Show', ['venue_id', 'start_time'], unique=False)
+    op.create_index('ix_Show_artist_id_start_time', 'Show', ['artist_id', 'start_time'], unique=False)
+    op.create_index('ix_Venue_city_state', 'Venue', ['city', 'state', 'name', 'id'], unique=False)
+    for table, column, type_ in REQUIRED:
+        op.alter_column(table, column, existing_type=type_, nullable=False)
+
+
+def downgrade():
+    for table, column, type_ in reversed(REQUIRED):
+        op.alter_column(table, column, existing_type=type_, nullable=True)
+    op.drop_index('ix_Venue_city_state', table_name='Venue')
+    op.drop_index('ix_Show_artist_id_start_time', table_name='Show')
+    op.drop_index('ix_Show_venue_id_start_time', table_name='Show')
@@ -0,0 +1,44 @@
+"""job queue
+
+Revision ID: 82d1f5dfe000
+Revises: 6c0b52005994
+Create Date: 2026-10-18 19:21:07.514203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '82d1f5dfe000'
+down_revision = '6c0b52005994'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('Job',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('name', sa.String(length=120), nullable=False),
+        sa.Column('args', sa.JSON(), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=16), server_default='queued', nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('run_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('key')
+    )
+    op.create_index('ix_Job_queued_run_at', 'Job', ['run_at'], unique=False,
+                    postgresql_where=sa.text("status = 'queued'"))
+    op.create_index('ix_Job_status_finished_at', 'Job', ['status', 'finished_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_Job_status_finished_at', table_name='Job')
+    op.drop_index('ix_Job_queued_run_at', table_name='Job')
+    op.drop_table('Job')
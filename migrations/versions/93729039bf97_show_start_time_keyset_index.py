@@ -0,0 +1,24 @@
+"""show start_time keyset index
+
+Revision ID: 93729039bf97
+Revises: 6e79b283ab2b
+Create Date: 2026-10-18 09:40:05.672913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '93729039bf97'
+down_revision = '6e79b283ab2b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_Show_start_time_id', 'Show', ['start_time', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_Show_start_time_id', table_name='Show')
@@ -0,0 +1,34 @@
+"""show counter columns
+
+Revision ID: b968b22a993f
+Revises: 16eb629885ae
+Create Date: 2026-10-18 11:48:19.530642
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b968b22a993f'
+down_revision = '16eb629885ae'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table, column in (('Venue', 'venue_id'), ('Artist', 'artist_id')):
+        op.add_column(table, sa.Column('upcoming_shows_count', sa.Integer(), server_default='0', nullable=False))
+        op.add_column(table, sa.Column('past_shows_count', sa.Integer(), server_default='0', nullable=False))
+        op.execute(
+            'UPDATE "{table}" SET '
+            'upcoming_shows_count = (SELECT count(*) FROM "Show" WHERE "Show".{column} = "{table}".id '
+            'AND "Show".start_time > LOCALTIMESTAMP), '
+            'past_shows_count = (SELECT count(*) FROM "Show" WHERE "Show".{column} = "{table}".id '
+            'AND "Show".start_time <= LOCALTIMESTAMP)'.format(table=table, column=column))
+
+
+def downgrade():
+    for table in ('Artist', 'Venue'):
+        op.drop_column(table, 'past_shows_count')
+        op.drop_column(table, 'upcoming_shows_count')
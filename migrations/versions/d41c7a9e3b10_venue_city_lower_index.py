@@ -0,0 +1,24 @@
+"""venue city lower index
+
+Revision ID: d41c7a9e3b10
+Revises: 82d1f5dfe000
+Create Date: 2026-10-18 20:04:52.118730
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41c7a9e3b10'
+down_revision = '82d1f5dfe000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_Venue_city_lower', 'Venue', [sa.text('lower(city)')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_Venue_city_lower', table_name='Venue')
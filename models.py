@@ -1,18 +1,13 @@
-from flask_sqlalchemy import SQLAlchemy
-from flask import Flask
-from flask_moment import Moment
-from flask_migrate import Migrate
+from routing import RoutingSQLAlchemy
 
 
 #----------------------------------------------------------------------------#
-# App Config.
+# Database.
 #----------------------------------------------------------------------------#
 
-app = Flask(__name__)
-moment = Moment(app)
-app.config.from_object('config')
-db = SQLAlchemy(app)
-migrate = Migrate(app, db)
+# Bound to the app in app.create_app(); importing the models doesn't build
+# (or need) the web app.
+db = RoutingSQLAlchemy()
 
 #----------------------------------------------------------------------------#
 # Models.
@@ -20,42 +15,125 @@ migrate = Migrate(app, db)
 
 class Venue(db.Model):
     __tablename__ = 'Venue'
+    __table_args__ = (
+        db.Index('ix_Venue_name_trgm', 'name', postgresql_using='gin',
+                 postgresql_ops={'name': 'gin_trgm_ops'}),
+        db.Index('ix_Venue_city_trgm', 'city', postgresql_using='gin',
+                 postgresql_ops={'city': 'gin_trgm_ops'}),
+        db.Index('ix_Venue_genres', 'genres', postgresql_using='gin'),
+        # /venues reads venues in area order through a cursor; this lets
+        # it stream rows straight off the index instead of sorting first.
+        db.Index('ix_Venue_city_state', 'city', 'state', 'name', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String)
-    city = db.Column(db.String(120))
-    state = db.Column(db.String(120))
-    address = db.Column(db.String(120))
+    name = db.Column(db.String, nullable=False)
+    city = db.Column(db.String(120), nullable=False)
+    state = db.Column(db.String(120), nullable=False)
+    address = db.Column(db.String(120), nullable=False)
     phone = db.Column(db.String(120))
     image_link = db.Column(db.String(500))
     facebook_link = db.Column(db.String(120))
-    genres = db.Column(db.ARRAY(db.String))
+    genres = db.Column(db.ARRAY(db.String), nullable=False)
     website_link = db.Column(db.String(120))
     seeking_talent = db.Column(db.Boolean)
     seeking_description = db.Column(db.String(120))
+    # Maintained by counters.py; see `flask shows rollover`.
+    upcoming_shows_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    past_shows_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False,
+                           server_default=db.func.now(), onupdate=db.func.now())
+    shows = db.relationship('Show', back_populates='venue', order_by='Show.start_time',
+                            cascade='all, delete-orphan')
+
+# The venues of a city, for /shows?city= (queries.show_window).
+db.Index('ix_Venue_city_lower', db.func.lower(Venue.city))
 
 class Artist(db.Model):
     __tablename__ = 'Artist'
+    __table_args__ = (
+        db.Index('ix_Artist_name_trgm', 'name', postgresql_using='gin',
+                 postgresql_ops={'name': 'gin_trgm_ops'}),
+        db.Index('ix_Artist_city_trgm', 'city', postgresql_using='gin',
+                 postgresql_ops={'city': 'gin_trgm_ops'}),
+        db.Index('ix_Artist_genres', 'genres', postgresql_using='gin'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String)
-    city = db.Column(db.String(120))
-    state = db.Column(db.String(120))
+    name = db.Column(db.String, nullable=False)
+    city = db.Column(db.String(120), nullable=False)
+    state = db.Column(db.String(120), nullable=False)
     phone = db.Column(db.String(120))
-    genres = db.Column(db.ARRAY(db.String))
+    genres = db.Column(db.ARRAY(db.String), nullable=False)
     facebook_link = db.Column(db.String(120))
     image_link = db.Column(db.String(500))
     website_link = db.Column(db.String(120))
     seeking_venue = db.Column(db.Boolean)
     seeking_description = db.Column(db.String(120))
+    # Maintained by counters.py; see `flask shows rollover`.
+    upcoming_shows_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    past_shows_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False,
+                           server_default=db.func.now(), onupdate=db.func.now())
+    shows = db.relationship('Show', back_populates='artist', order_by='Show.start_time',
+                            cascade='all, delete-orphan')
 
     # TODO: implement any missing fields, as a database migration using Flask-Migrate
 
 # TODO Implement Show and Artist models, and complete all model relationships and properties, as a database migration.
 class Show(db.Model):
     __tablename__ = 'Show'
+    __table_args__ = (
+        # Seek index for keyset pagination on /shows.
+        db.Index('ix_Show_start_time_id', 'start_time', 'id'),
+        # A venue's or artist's shows in date order, for the detail pages.
+        db.Index('ix_Show_venue_id_start_time', 'venue_id', 'start_time'),
+        db.Index('ix_Show_artist_id_start_time', 'artist_id', 'start_time'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    start_time = db.Column(db.DateTime)
+    start_time = db.Column(db.DateTime, nullable=False)
     artist_id = db.Column(db.Integer, db.ForeignKey('Artist.id'), nullable=False)
-    venue_id = db.Column(db.Integer, db.ForeignKey('Venue.id'), nullable=False)
\ No newline at end of file
+    venue_id = db.Column(db.Integer, db.ForeignKey('Venue.id'), nullable=False)
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False,
+                           server_default=db.func.now(), onupdate=db.func.now())
+    artist = db.relationship('Artist', back_populates='shows')
+    venue = db.relationship('Venue', back_populates='shows')
+
+# updated_at is set by a Postgres trigger on every UPDATE, including ones
+# that don't go through SQLAlchemy (psql, other services); onupdate covers
+# other databases. create_all() adds the trigger too, like migration
+# 5b0c7e1f9a2d.
+db.event.listen(db.metadata, 'before_create', db.DDL(
+    'CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$ '
+    'BEGIN NEW.updated_at = now(); RETURN NEW; END; $$ LANGUAGE plpgsql'
+).execute_if(dialect='postgresql'))
+for _model in (Venue, Artist, Show):
+    db.event.listen(_model.__table__, 'after_create', db.DDL(
+        'CREATE TRIGGER "{0}_updated_at" BEFORE UPDATE ON "{0}" '
+        'FOR EACH ROW EXECUTE PROCEDURE set_updated_at()'.format(_model.__tablename__)
+    ).execute_if(dialect='postgresql'))
+
+class Job(db.Model):
+    # Background jobs of the 'database' backend; see jobs.py.
+    __tablename__ = 'Job'
+    __table_args__ = (
+        # What workers claim from, in due order; finished jobs drop out.
+        db.Index('ix_Job_queued_run_at', 'run_at', postgresql_where=db.text("status = 'queued'")),
+        # Stale running jobs, the stats window and pruning.
+        db.Index('ix_Job_status_finished_at', 'status', 'finished_at'),
+    )
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    name = db.Column(db.String(120), nullable=False)
+    args = db.Column(db.JSON, nullable=False)
+    # Idempotency key: one job per key until the job is pruned.
+    key = db.Column(db.String(255), unique=True)
+    status = db.Column(db.String(16), nullable=False, default='queued', server_default='queued')
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    max_attempts = db.Column(db.Integer, nullable=False)
+    run_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=db.func.now())
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=db.func.now())
+    started_at = db.Column(db.DateTime(timezone=True))
+    finished_at = db.Column(db.DateTime(timezone=True))
+    last_error = db.Column(db.Text)
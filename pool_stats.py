@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+from collections import deque
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+
+#----------------------------------------------------------------------------#
+# Pool instrumentation.
+#----------------------------------------------------------------------------#
+
+# Every pool keeps its own stats, so the primary and each replica are
+# reported apart. Stats are per process, i.e. per gunicorn worker;
+# /debug/pool reports the worker that served the request, tagged with its
+# pid.
+
+class PoolStats:
+    def __init__(self, pool, samples=1024):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=samples)
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+        self.pool = pool
+
+    def record_checkout(self, wait, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self._waits.append(wait)
+            if self.pool.overflow() > 0:
+                self.overflow_checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.pool.checkedout())
+
+    def snapshot(self):
+        with self._lock:
+            waits = sorted(self._waits)
+            pool = self.pool
+            capacity = pool.size() + pool._max_overflow
+
+            def percentile(p):
+                if not waits:
+                    return None
+                return waits[min(len(waits) - 1, int(len(waits) * p))] * 1000
+
+            return {
+                'pool_size': pool.size(),
+                'max_overflow': pool._max_overflow,
+                'checked_out': pool.checkedout(),
+                'peak_checked_out': self.peak_checked_out,
+                'saturation': pool.checkedout() / capacity if capacity else None,
+                'peak_saturation': self.peak_checked_out / capacity if capacity else None,
+                'checkouts': self.checkouts,
+                'overflow_checkouts': self.overflow_checkouts,
+                'timeouts': self.timeouts,
+                'checkout_wait_ms': {
+                    'p50': percentile(0.50),
+                    'p95': percentile(0.95),
+                    'p99': percentile(0.99),
+                    'max': waits[-1] * 1000 if waits else None,
+                },
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    # QueuePool that records how long each checkout waited for a connection.
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats(self)
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; its stats carry on.
+        pool = super().recreate()
+        pool.stats = self.stats
+        pool.stats.pool = pool
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except TimeoutError:
+            self.stats.record_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record_checkout(time.perf_counter() - start)
+        return connection
+
+
+def snapshot(engines):
+    # Stats for {name: engine}. Pools that aren't instrumented (NullPool)
+    # report their class only.
+    report = {'pid': os.getpid(), 'engines': {}}
+    for name, engine in engines.items():
+        stats = getattr(engine.pool, 'stats', None)
+        entry = stats.snapshot() if stats is not None else {}
+        entry.update(url=repr(engine.url), pool_class=type(engine.pool).__name__)
+        report['engines'][name] = entry
+    return report
@@ -0,0 +1,139 @@
+import json
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+from flask import current_app, g, has_request_context, jsonify, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+#----------------------------------------------------------------------------#
+# Fingerprints.
+#----------------------------------------------------------------------------#
+
+_literals = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_bind_lists = re.compile(r'\(\s*(?:%\(\w+\)s|\?|:\w+)(?:\s*,\s*(?:%\(\w+\)s|\?|:\w+))*\s*\)')
+_bind_names = re.compile(r'%\((\w+?)(?:_\d+)?\)s')
+_whitespace = re.compile(r'\s+')
+
+
+def fingerprint(statement):
+    # Same text for every execution of a query shape: literals, bind names
+    # and IN lists are collapsed, so an N+1 loop shows up as one repeated
+    # fingerprint.
+    statement = _literals.sub('?', statement)
+    statement = _bind_lists.sub('(...)', statement)
+    statement = _bind_names.sub(r'%(\1)s', statement)
+    return _whitespace.sub(' ', statement).strip()
+
+#----------------------------------------------------------------------------#
+# Profiler.
+#----------------------------------------------------------------------------#
+
+class QueryProfiler:
+    # Counts queries and DB time per request, and aggregates them per
+    # endpoint for the /debug/queries report.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = defaultdict(lambda: {
+            'requests': 0,
+            'queries': 0,
+            'db_time_ms': 0.0,
+            'max_queries': 0,
+            'slowest': [],
+            'repeated': Counter(),
+        })
+
+    def init_app(self, app):
+        self.slow_ms = app.config.get('SQL_SLOW_QUERY_MS', 100)
+        self.repeat_threshold = app.config.get('SQL_REPEAT_THRESHOLD', 5)
+        self.keep_slowest = app.config.get('SQL_KEEP_SLOWEST', 5)
+        # Engine-wide listeners, added once however many apps are made.
+        if not event.contains(Engine, 'before_cursor_execute', self._before_execute):
+            event.listen(Engine, 'before_cursor_execute', self._before_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_execute)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        if app.debug or app.config.get('DIAGNOSTICS_ENDPOINTS'):
+            app.add_url_rule('/debug/queries', 'query_report', self.report_view)
+        app.extensions['query_profiler'] = self
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if has_request_context() and 'sql_queries' in g:
+            conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not (has_request_context() and 'sql_queries' in g):
+            return
+        starts = conn.info.get('query_start')
+        if not starts:
+            return
+        elapsed = (time.perf_counter() - starts.pop()) * 1000
+        g.sql_queries.append((elapsed, statement))
+
+    def _start_request(self):
+        g.sql_queries = []
+
+    def _finish_request(self, response):
+        queries = g.pop('sql_queries', None)
+        if queries is None:
+            return response
+
+        total_ms = sum(elapsed for elapsed, _ in queries)
+        fingerprints = Counter(fingerprint(statement) for _, statement in queries)
+        repeated = {fp: n for fp, n in fingerprints.items() if n >= self.repeat_threshold}
+        slowest = sorted(queries, key=lambda query: query[0], reverse=True)[:self.keep_slowest]
+        endpoint = request.endpoint or request.path
+
+        with self._lock:
+            stats = self._endpoints[endpoint]
+            stats['requests'] += 1
+            stats['queries'] += len(queries)
+            stats['db_time_ms'] += total_ms
+            stats['max_queries'] = max(stats['max_queries'], len(queries))
+            stats['repeated'].update(repeated)
+            stats['slowest'] = sorted(
+                stats['slowest'] + [(ms, fingerprint(s)) for ms, s in slowest],
+                reverse=True)[:self.keep_slowest]
+
+        record = {
+            'endpoint': endpoint,
+            'method': request.method,
+            'status': response.status_code,
+            'queries': len(queries),
+            'db_time_ms': round(total_ms, 2),
+        }
+        if repeated:
+            record['repeated'] = repeated
+        slow = [(ms, fingerprint(s)) for ms, s in slowest if ms >= self.slow_ms]
+        if slow:
+            record['slow'] = [{'ms': round(ms, 2), 'statement': s} for ms, s in slow]
+        level = 'warning' if (repeated or slow) else 'info'
+        getattr(current_app.logger, level)('sql %s', json.dumps(record))
+
+        if current_app.debug:
+            response.headers['X-Query-Count'] = str(len(queries))
+            response.headers['X-Query-Time-Ms'] = '{:.2f}'.format(total_ms)
+        return response
+
+    def report(self):
+        with self._lock:
+            return {endpoint: {
+                'requests': stats['requests'],
+                'queries': stats['queries'],
+                'queries_per_request': stats['queries'] / stats['requests'],
+                'max_queries': stats['max_queries'],
+                'db_time_ms': round(stats['db_time_ms'], 2),
+                'db_time_ms_per_request': round(stats['db_time_ms'] / stats['requests'], 2),
+                'slowest': [{'ms': round(ms, 2), 'statement': s} for ms, s in stats['slowest']],
+                'repeated': [{'count': n, 'statement': s}
+                             for s, n in stats['repeated'].most_common()],
+            } for endpoint, stats in sorted(self._endpoints.items())}
+
+    def report_view(self):
+        return jsonify(self.report())
+
+
+profiler = QueryProfiler()
@@ -0,0 +1,361 @@
+import base64
+import calendar
+from datetime import MAXYEAR, MINYEAR, date, datetime as dt, time, timedelta
+from itertools import groupby
+
+from sqlalchemy import Date, cast, func, select, tuple_
+
+from models import db, Venue, Artist, Show
+from readmodels import (Area, AreaVenue, ListedArtist, ListedShow, ArtistShow, VenueShow,
+                        VenuePage, ArtistPage, ShowWindow, CalendarDay, CalendarMonth,
+                        VENUE_PAGE_FIELDS, ARTIST_PAGE_FIELDS)
+
+# Pages are read with column-only selects and built into the records of
+# readmodels.py; no ORM instances are loaded for them.
+
+#----------------------------------------------------------------------------#
+# Venue directory.
+#----------------------------------------------------------------------------#
+
+def venue_directory_select():
+    # Every venue with its stored upcoming show count, already ordered by
+    # area so the rows can be folded into areas in one pass.
+    return select(
+        Venue.id, Venue.name, Venue.city, Venue.state,
+        Venue.upcoming_shows_count.label('num_upcoming_shows')
+    ).order_by(
+        Venue.city, Venue.state, Venue.name, Venue.id
+    )
+
+
+def venue_directory(chunk=500):
+    # One query, read through a server-side cursor `chunk` rows at a time.
+    rows = db.session.execute(venue_directory_select().execution_options(yield_per=chunk))
+    return venue_areas(rows)
+
+
+def venue_areas(rows):
+    # Areas are yielded as they complete; each area's `venues` is an
+    # iterator that has to be consumed before moving on to the next area.
+    for (city, state), venues in groupby(rows, key=lambda row: (row.city, row.state)):
+        yield Area(city, state, (AreaVenue(venue.id, venue.name, venue.num_upcoming_shows)
+                                 for venue in venues))
+
+def upcoming_show_counts(model, ids):
+    # {id: upcoming show count} for a page of venues or artists, read from
+    # the counters maintained by counters.py.
+    if not ids:
+        return {}
+    return dict(db.session.query(model.id, model.upcoming_shows_count).filter(
+        model.id.in_(ids)
+    ).all())
+
+#----------------------------------------------------------------------------#
+# Detail pages.
+#----------------------------------------------------------------------------#
+
+def detail_select(model, id):
+    # The fields of a venue or artist page, less its shows.
+    if model is Venue:
+        fields, names = VENUE_FIELDS, VENUE_PAGE_FIELDS
+    else:
+        fields, names = ARTIST_FIELDS, ARTIST_PAGE_FIELDS
+    return select(*[fields[name] for name in names]).where(model.id == id)
+
+
+def detail_page(model, row, past_shows, upcoming_shows):
+    # A row of detail_select and its shows as a VenuePage or ArtistPage.
+    return (VenuePage if model is Venue else ArtistPage)(
+        *row, past_shows, upcoming_shows, len(past_shows), len(upcoming_shows))
+
+
+def _detail(model, id, now):
+    # Two queries: the entity's columns, then its shows with the other
+    # side's id, name and image.
+    row = db.session.execute(detail_select(model, id)).first()
+    if row is None:
+        return None
+    return detail_page(model, row, *related_shows(model, [id], now)[id])
+
+
+def venue_detail(venue_id, now=None):
+    return _detail(Venue, venue_id, now)
+
+
+def artist_detail(artist_id, now=None):
+    return _detail(Artist, artist_id, now)
+
+#----------------------------------------------------------------------------#
+# Entity listings.
+#----------------------------------------------------------------------------#
+
+# Public field name -> column, in the same shape as the detail pages. The
+# counts come from the counters maintained by counters.py.
+
+VENUE_FIELDS = {
+    'id': Venue.id,
+    'name': Venue.name,
+    'genres': Venue.genres,
+    'address': Venue.address,
+    'city': Venue.city,
+    'state': Venue.state,
+    'phone': Venue.phone,
+    'website': Venue.website_link,
+    'facebook_link': Venue.facebook_link,
+    'seeking_talent': Venue.seeking_talent,
+    'seeking_description': Venue.seeking_description,
+    'image_link': Venue.image_link,
+    'past_shows_count': Venue.past_shows_count,
+    'upcoming_shows_count': Venue.upcoming_shows_count,
+}
+
+ARTIST_FIELDS = {
+    'id': Artist.id,
+    'name': Artist.name,
+    'genres': Artist.genres,
+    'city': Artist.city,
+    'state': Artist.state,
+    'phone': Artist.phone,
+    'website': Artist.website_link,
+    'facebook_link': Artist.facebook_link,
+    'seeking_venue': Artist.seeking_venue,
+    'seeking_description': Artist.seeking_description,
+    'image_link': Artist.image_link,
+    'past_shows_count': Artist.past_shows_count,
+    'upcoming_shows_count': Artist.upcoming_shows_count,
+}
+
+
+def encode_id_cursor(id):
+    return base64.urlsafe_b64encode(str(id).encode()).decode().rstrip('=')
+
+
+def decode_id_cursor(cursor):
+    try:
+        return int(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode())
+    except ValueError as e:
+        raise ValueError('invalid cursor: {!r}'.format(cursor)) from e
+
+
+def entity_rows(model, fields, after_id=None, limit=None, chunk=500):
+    # Yields {field: value} for `fields` (names from VENUE_FIELDS or
+    # ARTIST_FIELDS) in id order after `after_id`, fetched `chunk` rows at a
+    # time through a server-side cursor. `id` is always included.
+    columns = VENUE_FIELDS if model is Venue else ARTIST_FIELDS
+    names = ['id'] + [name for name in fields if name != 'id']
+    query = db.session.query(*[columns[name].label(name) for name in names])
+    if after_id is not None:
+        query = query.filter(model.id > after_id)
+    query = query.order_by(model.id).limit(limit)
+    for row in query.yield_per(chunk):
+        yield row._asdict()
+
+
+def artist_listing(chunk=500):
+    # Every artist's id and name in id order, through a server-side cursor.
+    rows = db.session.execute(
+        select(Artist.id, Artist.name).order_by(Artist.id).execution_options(yield_per=chunk))
+    for id, name in rows:
+        yield ListedArtist(id, name)
+
+
+def related_shows_select(model):
+    # (statement, owner column) for the shows of venues or artists, with the
+    # other side's id, name and image, in start time order. Callers filter
+    # on the owner column.
+    if model is Venue:
+        other, key, relationship = Artist, Show.venue_id, Show.artist
+    else:
+        other, key, relationship = Venue, Show.artist_id, Show.venue
+    statement = select(
+        key.label('owner_id'), other.id, other.name, other.image_link, Show.start_time
+    ).join(other, relationship).order_by(Show.start_time)
+    return statement, key
+
+
+def related_show(model, row):
+    # The ArtistShow or VenueShow for a row of related_shows_select(model).
+    return (ArtistShow if model is Venue else VenueShow)(row.id, row.name, row.image_link, row.start_time)
+
+
+def related_shows(model, ids, now=None):
+    # {id: (past_shows, upcoming_shows)} for a batch of venues or artists,
+    # with the same show records as the detail pages, in one query.
+    now = now or dt.now()
+    statement, key = related_shows_select(model)
+
+    shows = {id: ([], []) for id in ids}
+    for row in db.session.execute(statement.where(key.in_(ids))):
+        past_shows, upcoming_shows = shows[row.owner_id]
+        (upcoming_shows if row.start_time > now else past_shows).append(related_show(model, row))
+    return shows
+
+
+#----------------------------------------------------------------------------#
+# Shows listing.
+#----------------------------------------------------------------------------#
+
+def encode_cursor(start_time, show_id):
+    raw = '{}|{}'.format(start_time.isoformat(), show_id)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    # Returns (start_time, id), raising ValueError on a malformed cursor.
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        start_time, show_id = raw.split('|')
+        return dt.fromisoformat(start_time), int(show_id)
+    except ValueError as e:
+        raise ValueError('invalid cursor: {!r}'.format(cursor)) from e
+
+
+def show_page_select(per_page, after=None, before=None, window=None):
+    # Seek pagination on (start_time, id), backed by ix_Show_start_time_id.
+    # `after`/`before` are cursors from a previous page; at most one is used,
+    # and a malformed one raises ValueError. A ShowWindow limits the shows
+    # to its days and city. Returns (statement, backwards); the statement
+    # reads one row past the page to tell if there is more.
+    key = tuple_(Show.start_time, Show.id)
+    statement = select(
+        Show.id, Show.start_time, Show.venue_id, Venue.name.label('venue_name'),
+        Show.artist_id, Artist.name.label('artist_name'),
+        Artist.image_link.label('artist_image_link')
+    ).join(Venue, Show.venue).join(Artist, Show.artist)
+    if window is not None:
+        statement = statement.where(*_window_filter(window))
+
+    backwards = before is not None and after is None
+    if backwards:
+        statement = statement.where(key < tuple_(*decode_cursor(before)))
+        statement = statement.order_by(Show.start_time.desc(), Show.id.desc())
+    else:
+        if after is not None:
+            statement = statement.where(key > tuple_(*decode_cursor(after)))
+        statement = statement.order_by(Show.start_time, Show.id)
+    return statement.limit(per_page + 1), backwards
+
+
+def show_page(per_page, after=None, before=None, chunk=500, window=None):
+    # Returns (shows, pager): `shows` yields ListedShows read through a
+    # server-side cursor, and `pager` gets its prev_cursor and next_cursor
+    # once `shows` has been consumed.
+    statement, backwards = show_page_select(per_page, after, before, window)
+    pager = {'prev_cursor': None, 'next_cursor': None}
+
+    def rows():
+        yield from db.session.execute(statement.execution_options(yield_per=chunk))
+
+    return show_page_rows(rows(), per_page, after, backwards, pager), pager
+
+
+def show_page_rows(rows, per_page, after, backwards, pager):
+    # Turns the rows of show_page_select into ListedShows and fills in
+    # `pager`. Backward pages are read in full first, since they are
+    # fetched in reverse.
+    has_more = False
+    if backwards:
+        rows = list(rows)
+        has_more = len(rows) > per_page
+        rows = reversed(rows[:per_page])
+
+    first = last = None
+    for i, row in enumerate(rows):
+        if i == per_page:
+            has_more = True
+            break
+        last = ListedShow(*row)
+        if first is None:
+            first = last
+        yield last
+
+    if first is None:
+        return
+    first = encode_cursor(first.start_time, first.id)
+    last = encode_cursor(last.start_time, last.id)
+    if backwards:
+        pager['prev_cursor'], pager['next_cursor'] = (first if has_more else None), last
+    else:
+        pager['prev_cursor'] = first if after is not None else None
+        pager['next_cursor'] = last if has_more else None
+
+#----------------------------------------------------------------------------#
+# Calendar.
+#----------------------------------------------------------------------------#
+
+# /shows?from=&to=&city= lists the shows of a range of days, optionally at
+# the venues of one city, above a month grid of the number of shows per day.
+# Days are those of Show.start_time, which is naive local time. Both read
+# one range of ix_Show_start_time_id; with a city, Postgres can instead find
+# its venues through ix_Venue_city_lower and read each venue's range of
+# ix_Show_venue_id_start_time. A range is at most max_days long, so neither
+# query grows with the history behind it.
+
+def _check_year(day):
+    # The first and last years are out of range: the calendar pads their
+    # months with days of the years around them, which date can't hold.
+    if not MINYEAR < day.year < MAXYEAR:
+        raise ValueError('dates must be in the years {} to {}'.format(MINYEAR + 1, MAXYEAR - 1))
+
+
+def show_window(start=None, end=None, city=None, today=None, default_days=31, max_days=92):
+    # The ShowWindow for the query parameters, all optional strings (ISO
+    # dates for `start` and `end`): from today, or `start`, through `end` or
+    # for `default_days`. None when none is given; ValueError when a date
+    # is malformed or out of range, or the range is empty or longer than
+    # `max_days`.
+    city = (city or '').strip() or None
+    if not (start or end or city):
+        return None
+    start = date.fromisoformat(start) if start else today or date.today()
+    _check_year(start)
+    end = date.fromisoformat(end) if end else start + timedelta(days=default_days - 1)
+    _check_year(end)
+    if end < start:
+        raise ValueError('the range ends before it starts')
+    if (end - start).days >= max_days:
+        raise ValueError('the range is longer than {} days'.format(max_days))
+    return ShowWindow(start, end, city)
+
+
+def window_args(window):
+    # The query parameters of a ShowWindow, for links.
+    args = {'from': window.start.isoformat(), 'to': window.end.isoformat()}
+    if window.city:
+        args['city'] = window.city
+    return args
+
+
+def _window_filter(window):
+    # WHERE clauses on Show, and on Venue for the city.
+    clauses = [Show.start_time >= dt.combine(window.start, time()),
+               Show.start_time < dt.combine(window.end + timedelta(days=1), time())]
+    if window.city:
+        clauses.append(func.lower(Venue.city) == window.city.lower())
+    return clauses
+
+
+def show_days_select(window):
+    # (day, shows) for each day of the window that has any, in day order.
+    day = cast(Show.start_time, Date)
+    statement = select(day.label('day'), func.count().label('shows')).select_from(Show)
+    if window.city:
+        statement = statement.join(Venue, Show.venue)
+    return statement.where(*_window_filter(window)).group_by(day).order_by(day)
+
+
+def show_days(window):
+    return db.session.execute(show_days_select(window)).all()
+
+
+def show_calendar(window, days):
+    # CalendarMonths covering the window, from the rows of show_days_select.
+    counts = dict(days)
+    months, month = [], window.start.replace(day=1)
+    while month <= window.end:
+        weeks = [[CalendarDay(day, counts.get(day, 0), day.month == month.month
+                              and window.start <= day <= window.end) for day in week]
+                 for week in calendar.Calendar().monthdatescalendar(month.year, month.month)]
+        months.append(CalendarMonth(month, weeks))
+        month = (month + timedelta(days=31)).replace(day=1)
+    return months
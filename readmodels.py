@@ -0,0 +1,63 @@
+from collections import namedtuple
+
+#----------------------------------------------------------------------------#
+# Read models.
+#----------------------------------------------------------------------------#
+
+# What the listing and detail pages render, built straight from column-only
+# rows (see queries.py) instead of ORM instances copied into dicts. Each is
+# a namedtuple: attribute access for the templates, and _asdict() for the
+# JSON API (json itself would write them as arrays).
+
+#----------------------------------------------------------------------------#
+# Listings.
+#----------------------------------------------------------------------------#
+
+# A city of the venue directory; `venues` is an iterator of AreaVenue.
+Area = namedtuple('Area', 'city state venues')
+
+AreaVenue = namedtuple('AreaVenue', 'id name num_upcoming_shows')
+
+ListedArtist = namedtuple('ListedArtist', 'id name')
+
+# In the column order of queries.show_page_select.
+ListedShow = namedtuple('ListedShow', 'id start_time venue_id venue_name artist_id artist_name '
+                                      'artist_image_link')
+
+#----------------------------------------------------------------------------#
+# Detail pages.
+#----------------------------------------------------------------------------#
+
+# A show on a venue's page.
+ArtistShow = namedtuple('ArtistShow', 'artist_id artist_name artist_image_link start_time')
+
+# A show on an artist's page.
+VenueShow = namedtuple('VenueShow', 'venue_id venue_name venue_image_link start_time')
+
+# The entity fields of the detail pages, named as in queries.VENUE_FIELDS
+# and ARTIST_FIELDS.
+VENUE_PAGE_FIELDS = ('id', 'name', 'genres', 'address', 'city', 'state', 'phone', 'website',
+                     'facebook_link', 'seeking_talent', 'seeking_description', 'image_link')
+ARTIST_PAGE_FIELDS = ('id', 'name', 'genres', 'city', 'state', 'phone', 'website',
+                      'facebook_link', 'seeking_venue', 'seeking_description', 'image_link')
+SHOW_PAGE_FIELDS = ('past_shows', 'upcoming_shows', 'past_shows_count', 'upcoming_shows_count')
+
+VenuePage = namedtuple('VenuePage', VENUE_PAGE_FIELDS + SHOW_PAGE_FIELDS)
+
+ArtistPage = namedtuple('ArtistPage', ARTIST_PAGE_FIELDS + SHOW_PAGE_FIELDS)
+
+#----------------------------------------------------------------------------#
+# Calendar.
+#----------------------------------------------------------------------------#
+
+# The range of /shows?from=&to=&city=: first and last day (dates, both
+# included) and a city, or None for every city.
+ShowWindow = namedtuple('ShowWindow', 'start end city')
+
+# A cell of the month grid; `in_window` is False for the days of
+# neighbouring months and those outside the range.
+CalendarDay = namedtuple('CalendarDay', 'day shows in_window')
+
+# `month` is its first day; `weeks` are lists of seven CalendarDays, Monday
+# first.
+CalendarMonth = namedtuple('CalendarMonth', 'month weeks')
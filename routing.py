@@ -0,0 +1,91 @@
+import random
+import time
+from functools import wraps
+
+from flask import current_app, g, has_request_context, session
+from flask_sqlalchemy import SQLAlchemy, SignallingSession
+from sqlalchemy import create_engine, event, orm
+
+#----------------------------------------------------------------------------#
+# Replica routing.
+#----------------------------------------------------------------------------#
+
+# Views marked @read_only read from one of SQLALCHEMY_REPLICA_URIS, picked
+# once per request. Everything else (writes, CLI commands, unmarked views,
+# any flush) uses the primary. A client whose request committed a write
+# stays on the primary for READ_YOUR_WRITES_SECONDS, so it sees its own
+# changes however far the replicas lag.
+
+STICKY_KEY = '_primary_until'
+_WROTE = 'wrote'
+
+
+class RoutingSession(SignallingSession):
+    def get_bind(self, mapper=None, clause=None):
+        replica = g.get('db_replica') if has_request_context() else None
+        if replica is not None and not self._flushing:
+            return replica
+        return super().get_bind(mapper, clause)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _flushed(session, flush_context):
+    session.info[_WROTE] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _executed(state):
+    # Core-style INSERT/UPDATE/DELETE through the session, which don't flush.
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[_WROTE] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _committed(session):
+    if session.info.pop(_WROTE, False) and has_request_context():
+        g.db_wrote = True
+
+
+@event.listens_for(RoutingSession, 'after_transaction_end')
+def _ended(session, transaction):
+    # Whatever is left when the outermost transaction ends was rolled back.
+    if transaction.parent is None:
+        session.info.pop(_WROTE, None)
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    def create_session(self, options):
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+    def init_app(self, app):
+        super().init_app(app)
+        options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+        app.extensions['db_replicas'] = [
+            create_engine(uri, **options) for uri in app.config.get('SQLALCHEMY_REPLICA_URIS', [])
+        ]
+        app.after_request(_stick_after_write)
+
+
+def _sticky():
+    return session.get(STICKY_KEY, 0) > time.time()
+
+
+def _stick_after_write(response):
+    # Only requests that committed a write count: not the search forms, nor
+    # a form that failed validation and was rendered again.
+    if current_app.extensions['db_replicas'] and g.get('db_wrote'):
+        session[STICKY_KEY] = time.time() + current_app.config['READ_YOUR_WRITES_SECONDS']
+    return response
+
+
+def read_only(view):
+    # Sends the view's queries to a replica. Put it right under the route
+    # decorator so conditional and cached lookups are routed too.
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.db_read_only = True
+        replicas = current_app.extensions['db_replicas']
+        if replicas and not _sticky():
+            g.db_replica = random.choice(replicas)
+        return view(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,157 @@
+from datetime import datetime as dt, timedelta
+from itertools import groupby
+
+from flask import current_app
+from sqlalchemy import (ARRAY, DateTime, Integer, bindparam, column, func, insert, literal,
+                        select, true, union_all)
+
+from cache import cache
+from counters import shows_added
+from models import db, Venue, Artist, Show
+
+#----------------------------------------------------------------------------#
+# Show scheduling.
+#----------------------------------------------------------------------------#
+
+# Shows have no end time, so each one holds its venue and its artist for
+# SHOW_LENGTH_MINUTES from start_time; two shows of the same venue or the
+# same artist closer together than that are double-booked. A batch is
+# scheduled all or nothing: if any row is rejected, no show is added.
+
+FIELDS = ('venue_id', 'artist_id', 'start_time')
+
+
+def _parse(row):
+    # (values, errors) for one requested show.
+    values, errors = {}, {}
+    if not isinstance(row, dict):
+        return None, {'row': ['Expected an object with {}.'.format(', '.join(FIELDS))]}
+    for field in ('venue_id', 'artist_id'):
+        try:
+            values[field] = int(row[field])
+        except (KeyError, TypeError, ValueError):
+            errors[field] = ['This field is required and must be an integer.']
+    start_time = row.get('start_time')
+    if isinstance(start_time, str):
+        try:
+            start_time = dt.fromisoformat(start_time.strip())
+        except ValueError:
+            start_time = None
+    if isinstance(start_time, dt):
+        if start_time.tzinfo is not None:
+            start_time = start_time.astimezone().replace(tzinfo=None)
+        values['start_time'] = start_time
+    else:
+        errors['start_time'] = ['This field is required, as YYYY-MM-DD HH:MM:SS.']
+    return values, errors
+
+
+def _lock(model, ids):
+    # The ids that exist, row-locked until commit so concurrent batches for
+    # the same venue or artist check and insert one after the other.
+    return {id for id, in db.session.execute(
+        select(model.id).where(model.id.in_(sorted(ids))).order_by(model.id)
+        .with_for_update(key_share=True))}
+
+
+def _batch(shows):
+    # The requested shows as a table, from one array parameter per column,
+    # so the statements compile (and cache) the same for any batch size.
+    return func.unnest(
+        bindparam('n', [n for n, _ in shows], type_=ARRAY(Integer)),
+        bindparam('venue_id', [show['venue_id'] for _, show in shows], type_=ARRAY(Integer)),
+        bindparam('artist_id', [show['artist_id'] for _, show in shows], type_=ARRAY(Integer)),
+        bindparam('start_time', [show['start_time'] for _, show in shows], type_=ARRAY(DateTime))
+    ).table_valued(
+        column('n', Integer), column('venue_id', Integer), column('artist_id', Integer),
+        column('start_time', DateTime)
+    ).render_derived(name='batch')
+
+
+def _booked(batch, length):
+    # [(n, ref, show_id)] for each requested show that overlaps a stored
+    # show of the same venue or artist, in one query over the batch. The
+    # LATERAL ... LIMIT 1 makes each lookup an index probe on
+    # (venue_id|artist_id, start_time) instead of a join against all shows.
+    lookups = []
+    for ref, key in (('venue', Show.venue_id), ('artist', Show.artist_id)):
+        clash = select(Show.id).where(
+            key == batch.c[ref + '_id'],
+            Show.start_time > batch.c.start_time - length,
+            Show.start_time < batch.c.start_time + length
+        ).limit(1).lateral()
+        lookups.append(select(batch.c.n, literal(ref).label('ref'), clash.c.id).join(clash, true()))
+    return db.session.execute(union_all(*lookups)).all()
+
+
+def _overlapping(shows, length):
+    # [(n, ref, other_n)] for requested shows that overlap each other.
+    found = []
+    for ref in ('venue', 'artist'):
+        ordered = sorted(shows, key=lambda item: (item[1][ref + '_id'], item[1]['start_time']))
+        for _, group in groupby(ordered, key=lambda item: item[1][ref + '_id']):
+            previous = None
+            for n, show in group:
+                if previous and show['start_time'] - previous[1]['start_time'] < length:
+                    found.append((n, ref, previous[0]))
+                previous = n, show
+    return found
+
+
+def schedule_shows(rows, now=None):
+    # Validates and inserts a batch of {venue_id, artist_id, start_time}
+    # rows in one transaction. Returns (shows, rejects): the created shows
+    # with their ids, or no shows and a {'index', 'errors'} entry for each
+    # rejected row (index is the row's position in `rows`).
+    length = timedelta(minutes=current_app.config['SHOW_LENGTH_MINUTES'])
+    rejects = {}
+
+    def reject(n, field, message):
+        rejects.setdefault(n, {}).setdefault(field, []).append(message)
+
+    shows = []
+    for n, row in enumerate(rows):
+        values, errors = _parse(row)
+        if errors:
+            rejects[n] = errors
+        else:
+            shows.append((n, values))
+    if not shows:
+        return [], _rejects(rejects)
+
+    try:
+        for model, ref in ((Venue, 'venue'), (Artist, 'artist')):
+            known = _lock(model, {show[ref + '_id'] for _, show in shows})
+            for n, show in shows:
+                if show[ref + '_id'] not in known:
+                    reject(n, ref + '_id', 'No such {}.'.format(ref))
+        batch = _batch(shows)
+        for n, ref, show_id in _booked(batch, length):
+            reject(n, 'start_time', 'The {} is booked for show {} at this time.'.format(ref, show_id))
+        # Only rows that stand on their own are checked against each
+        # other: a row already rejected doesn't take its slot.
+        for n, ref, other in _overlapping([(n, show) for n, show in shows if n not in rejects], length):
+            reject(n, 'start_time', 'The {} is also booked by row {} at this time.'.format(ref, other))
+        if rejects:
+            db.session.rollback()
+            return [], _rejects(rejects)
+
+        created = [dict(row._mapping) for row in db.session.execute(
+            insert(Show).from_select(
+                FIELDS, select(batch.c.venue_id, batch.c.artist_id, batch.c.start_time).order_by(batch.c.n)
+            ).returning(Show.id, Show.venue_id, Show.artist_id, Show.start_time))]
+        shows_added([(show['venue_id'], show['artist_id'], show['start_time']) for show in created],
+                    now)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    cache.invalidate('venues', 'shows',
+                     *['venue:{}'.format(id) for id in sorted({show['venue_id'] for show in created})],
+                     *['artist:{}'.format(id) for id in sorted({show['artist_id'] for show in created})])
+    return created, []
+
+
+def _rejects(rejects):
+    return [{'index': n, 'errors': errors} for n, errors in sorted(rejects.items())]
@@ -0,0 +1,251 @@
+import threading
+from collections import namedtuple
+
+from flask import current_app
+from sqlalchemy import and_, case, event, false, func, literal, or_, union_all
+
+from forms import genre_choices, state_choices
+from models import db, Venue, Artist
+from queries import upcoming_show_counts
+
+_states = {value for value, _ in state_choices}
+_genres = {value.lower(): value for value, _ in genre_choices}
+
+#----------------------------------------------------------------------------#
+# Trigram similarity.
+#----------------------------------------------------------------------------#
+
+def _trigrams(text):
+    # Same decomposition as pg_trgm: lowercased words, padded with two
+    # leading spaces and one trailing space.
+    grams = set()
+    for word in text.lower().split():
+        padded = '  ' + word + ' '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a, b):
+    a, b = _trigrams(a), _trigrams(b)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+#----------------------------------------------------------------------------#
+# Backends.
+#----------------------------------------------------------------------------#
+
+def _like_pattern(term):
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return '%{}%'.format(escaped)
+
+
+def _trigram_search(model, term, limit):
+    # ILIKE is served by the gin_trgm_ops index on name; similarity() ranks.
+    return db.session.query(model.id, model.name).filter(
+        model.name.ilike(_like_pattern(term), escape='\\')
+    ).order_by(
+        func.similarity(model.name, term).desc(), model.name, model.id
+    ).limit(limit).all()
+
+
+class MemoryIndex:
+    # In-process name index for databases without pg_trgm (SQLite, tests).
+    # Built lazily and dropped whenever this process writes to the model
+    # through the ORM; Core statements on the table must call invalidate()
+    # themselves. Writes made by other processes are only seen after a
+    # rebuild.
+
+    def __init__(self, model):
+        self.model = model
+        self._entries = None
+        self._lock = threading.Lock()
+        for name in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(model, name, self._on_write)
+
+    def _on_write(self, mapper, connection, target):
+        self.invalidate()
+
+    def invalidate(self):
+        self._entries = None
+
+    def _load(self):
+        with self._lock:
+            if self._entries is None:
+                model = self.model
+                rows = db.session.query(
+                    model.id, model.name, model.city, model.state, model.genres
+                ).all()
+                self._entries = [_Entry(id, name or '', (name or '').lower(), city or '',
+                                        (city or '').lower(), state, set(genres or ()))
+                                 for id, name, city, state, genres in rows]
+            return self._entries
+
+    def search(self, term, limit):
+        needle = term.lower()
+        hits = [(similarity(term, entry.name), entry.name, entry.id)
+                for entry in self._load() if needle in entry.lowered_name]
+        hits.sort(key=lambda hit: (-hit[0], hit[1], hit[2]))
+        return [(id, name) for _, name, id in hits[:limit]]
+
+    def match(self, query):
+        # Yields (score, entry) scored the same way as _combined_select().
+        needle, city = query.term.lower(), query.city.lower()
+        for entry in self._load():
+            score = 0.0
+            if needle and needle in entry.lowered_name:
+                score += 2 + similarity(query.term, entry.name)
+            if _location_hit(query, city in entry.lowered_city, entry.state):
+                score += 1 + similarity(query.city, entry.city)
+            if query.genre in entry.genres:
+                score += 1
+            if score:
+                yield score, entry
+
+
+_Entry = namedtuple('_Entry', 'id name lowered_name city lowered_city state genres')
+
+
+_memory_indexes = {
+    Venue: MemoryIndex(Venue),
+    Artist: MemoryIndex(Artist),
+}
+
+
+def invalidate(model):
+    # Drops this process's memory index of Venue or Artist after a Core
+    # write to it, which the mapper events don't see.
+    _memory_indexes[model].invalidate()
+
+
+def _backend():
+    backend = current_app.config.get('SEARCH_BACKEND', 'auto')
+    if backend == 'auto':
+        return 'trigram' if db.engine.dialect.name == 'postgresql' else 'memory'
+    return backend
+
+
+def _search(model, term):
+    limit = current_app.config['SEARCH_RESULT_LIMIT']
+    if _backend() == 'trigram':
+        rows = _trigram_search(model, term, limit)
+    else:
+        rows = _memory_indexes[model].search(term, limit)
+
+    counts = upcoming_show_counts(model, [id for id, _ in rows])
+    data = [{
+        'id': id,
+        'name': name,
+        'num_upcoming_shows': counts.get(id, 0)
+    } for id, name in rows]
+    return {
+        'count': len(data),
+        'data': data
+    }
+
+#----------------------------------------------------------------------------#
+# Search.
+#----------------------------------------------------------------------------#
+
+def find_venues(term):
+    return _search(Venue, term)
+
+
+def find_artists(term):
+    return _search(Artist, term)
+
+
+#----------------------------------------------------------------------------#
+# Combined search.
+#----------------------------------------------------------------------------#
+
+SearchQuery = namedtuple('SearchQuery', 'term city state genre')
+
+
+def parse_query(term):
+    # "San Francisco, CA" searches city + state, "CA" searches state, and a
+    # genre name ("jazz") also searches the genres array.
+    term = term.strip()
+    city, state = term, None
+    head, sep, tail = term.rpartition(',')
+    if sep and tail.strip().upper() in _states:
+        city, state = head.strip(), tail.strip().upper()
+    elif term.upper() in _states:
+        city, state = '', term.upper()
+    return SearchQuery(term, city, state, _genres.get(term.lower()))
+
+
+def _location_hit(query, city_hit, state):
+    if query.state is None:
+        return bool(query.city) and city_hit
+    return state == query.state and (city_hit or not query.city)
+
+
+def _combined_select(model, kind, query):
+    # One ranked SELECT per model: name matches weigh most, then location,
+    # then genre. Served by the name/city trigram and genres GIN indexes.
+    name_hit = model.name.ilike(_like_pattern(query.term), escape='\\') if query.term else false()
+    city_hit = model.city.ilike(_like_pattern(query.city), escape='\\') if query.city else false()
+    if query.state is None:
+        location_hit = city_hit
+    elif query.city:
+        location_hit = and_(model.state == query.state, city_hit)
+    else:
+        location_hit = model.state == query.state
+    genre_hit = model.genres.contains([query.genre]) if query.genre else false()
+
+    score = (
+        case((name_hit, 2 + func.similarity(model.name, query.term)), else_=0)
+        + case((location_hit, 1 + func.similarity(model.city, query.city)), else_=0)
+        + case((genre_hit, 1), else_=0)
+    )
+    return db.session.query(
+        literal(kind).label('kind'), model.id.label('id'), model.name.label('name'),
+        model.city.label('city'), model.state.label('state'), score.label('score')
+    ).filter(or_(name_hit, location_hit, genre_hit))
+
+
+def _combined_rows(query, offset, limit):
+    if _backend() == 'trigram':
+        combined = union_all(
+            _combined_select(Venue, 'venue', query).statement,
+            _combined_select(Artist, 'artist', query).statement
+        ).subquery()
+        total = db.session.query(func.count()).select_from(combined).scalar()
+        rows = db.session.query(combined).order_by(
+            combined.c.score.desc(), combined.c.name, combined.c.kind, combined.c.id
+        ).offset(offset).limit(limit).all()
+        return total, [(row.kind, row.id, row.name, row.city, row.state) for row in rows]
+
+    hits = [(score, 'venue', entry) for score, entry in _memory_indexes[Venue].match(query)]
+    hits += [(score, 'artist', entry) for score, entry in _memory_indexes[Artist].match(query)]
+    hits.sort(key=lambda hit: (-hit[0], hit[2].name, hit[1], hit[2].id))
+    return len(hits), [(kind, entry.id, entry.name, entry.city, entry.state)
+                       for _, kind, entry in hits[offset:offset + limit]]
+
+
+def find_all(term, page=1, per_page=None):
+    # Venues and artists in one ranked, paginated result set.
+    per_page = per_page or current_app.config['SEARCH_PER_PAGE']
+    query = parse_query(term)
+    total, rows = _combined_rows(query, (page - 1) * per_page, per_page)
+
+    venue_counts = upcoming_show_counts(
+        Venue, [id for kind, id, *_ in rows if kind == 'venue'])
+    artist_counts = upcoming_show_counts(
+        Artist, [id for kind, id, *_ in rows if kind == 'artist'])
+    data = [{
+        'type': kind,
+        'id': id,
+        'name': name,
+        'city': city,
+        'state': state,
+        'num_upcoming_shows': (venue_counts if kind == 'venue' else artist_counts).get(id, 0)
+    } for kind, id, name, city, state in rows]
+    return {
+        'count': total,
+        'page': page,
+        'per_page': per_page,
+        'pages': (total + per_page - 1) // per_page,
+        'data': data
+    }
@@ -0,0 +1,124 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine, event
+
+# The tests run against a throwaway Postgres database (the models use ARRAY
+# columns and Postgres-only statements), named by TEST_DATABASE_URL. Its
+# public schema is dropped and created again for each session, and every
+# table is emptied after each test. Without TEST_DATABASE_URL the tests are
+# skipped.
+#
+#   TEST_DATABASE_URL=postgresql://localhost:5432/fyyur_test python -m pytest
+
+TEST_DATABASE_URL = os.environ.get('TEST_DATABASE_URL')
+if TEST_DATABASE_URL:
+    # Read by config.py when create_app() first imports it.
+    os.environ['DATABASE_URL'] = TEST_DATABASE_URL
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def settings(**overrides):
+    # config.py's settings with test defaults and `overrides`, as a class
+    # for app.create_app().
+    import config
+    values = {name: getattr(config, name) for name in dir(config) if name.isupper()}
+    values.update(TESTING=True, WTF_CSRF_ENABLED=False, SEARCH_BACKEND='memory',
+                  CACHE_BACKEND='memory', JOBS_BACKEND='local')
+    values.update(overrides)
+    return type('TestConfig', (), values)
+
+
+@pytest.fixture(scope='session')
+def database():
+    if not TEST_DATABASE_URL:
+        pytest.skip('TEST_DATABASE_URL is not set')
+    from models import db
+
+    engine = create_engine(TEST_DATABASE_URL)
+    with engine.begin() as conn:
+        conn.exec_driver_sql('DROP SCHEMA public CASCADE')
+        conn.exec_driver_sql('CREATE SCHEMA public')
+    try:
+        with engine.begin() as conn:
+            conn.exec_driver_sql('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    except Exception:
+        # Without pg_trgm the trigram indexes are left out; the tests
+        # search through the memory backend anyway.
+        for table in db.metadata.tables.values():
+            for index in list(table.indexes):
+                if index.dialect_options['postgresql'].get('ops'):
+                    table.indexes.discard(index)
+    db.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def make_app(database, tmp_path, monkeypatch):
+    # create_app() with settings(**overrides); the database is emptied
+    # and the apps' engines are closed after the test.
+    from app import create_app
+    from models import db
+
+    # Outside debug mode create_app() logs to error.log in the working
+    # directory.
+    monkeypatch.chdir(tmp_path)
+    apps = []
+
+    def make(**overrides):
+        overrides.setdefault('IMAGE_CACHE_DIR', str(tmp_path / 'images'))
+        app = create_app(settings(**overrides))
+        apps.append(app)
+        return app
+
+    yield make
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            db.get_engine().dispose()
+            for engine in app.extensions['db_replicas']:
+                engine.dispose()
+    with database.begin() as conn:
+        conn.exec_driver_sql('TRUNCATE {} RESTART IDENTITY CASCADE'.format(
+            ', '.join('"{}"'.format(table.name) for table in db.metadata.sorted_tables)))
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+class Statements(list):
+    # The SQL statements an engine runs while recording.
+
+    def __init__(self, engine):
+        super().__init__()
+        self.engine = engine
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+
+@pytest.fixture
+def statements(app):
+    # statements() records the app's primary engine, statements(engine)
+    # another one, such as a replica.
+    from models import db
+
+    with app.app_context():
+        primary = db.get_engine()
+    return lambda engine=None: Statements(engine or primary)
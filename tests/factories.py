@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta
+
+from models import db, Venue, Artist, Show
+
+
+def venue(**values):
+    values = dict({'name': 'The Musical Hop', 'city': 'San Francisco', 'state': 'CA',
+                   'address': '1015 Folsom Street', 'genres': ['Jazz']}, **values)
+    return _add(Venue(**values))
+
+
+def artist(**values):
+    values = dict({'name': 'Guns N Petals', 'city': 'San Francisco', 'state': 'CA',
+                   'genres': ['Rock n Roll']}, **values)
+    return _add(Artist(**values))
+
+
+def show(venue, artist, days=1, **values):
+    # A show `days` from now (negative for a past show).
+    values.setdefault('start_time', (datetime.now() + timedelta(days=days)).replace(microsecond=0))
+    return _add(Show(venue_id=venue.id, artist_id=artist.id, **values))
+
+
+def _add(instance):
+    db.session.add(instance)
+    db.session.flush()
+    return instance
+
+
+def venue_form(**values):
+    return dict({'name': 'The Musical Hop', 'city': 'San Francisco', 'state': 'CA',
+                 'address': '1015 Folsom Street', 'phone': '123-123-1234', 'genres': ['Jazz'],
+                 'facebook_link': 'https://www.facebook.com/TheMusicalHop', 'image_link': '',
+                 'website_link': 'https://www.themusicalhop.com', 'seeking_description': ''},
+                **values)
@@ -0,0 +1,51 @@
+import asyncio
+
+from models import db
+from tests import factories
+
+
+def _get(application, path):
+    # (status, body, number of body messages) for a GET through the ASGI app.
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+             'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+             'root_path': '', 'headers': [(b'host', b'localhost')], 'client': ('127.0.0.1', 1),
+             'server': ('localhost', 80)}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    async def get():
+        import async_queries
+        await application(scope, receive, send)
+        await async_queries.dispose_engine()
+
+    asyncio.run(get())
+    bodies = [message for message in messages if message['type'] == 'http.response.body']
+    return messages[0]['status'], b''.join(message['body'] for message in bodies), len(bodies)
+
+
+def test_listings_stream_their_rows(app, monkeypatch):
+    # asgi.py serves the module-level app of app.py, on the same database.
+    import asgi
+    with app.app_context():
+        for n in range(5):
+            factories.venue(name='Venue {}'.format(n), city='City {}'.format(n % 2))
+            factories.artist(name='Artist {}'.format(n))
+        db.session.commit()
+    monkeypatch.setitem(asgi.app.config, 'LISTING_CHUNK', 2)
+    monkeypatch.setitem(asgi.app.config, 'STREAM_BUFFER_SIZE', 1)
+
+    status, body, writes = _get(asgi.application, '/venues')
+    assert status == 200 and writes > 2
+    assert body.index(b'City 0') < body.index(b'Venue 4') < body.index(b'City 1')
+    assert body.count(b'<h5>') == 5
+    assert body.rstrip().endswith(b'</html>')
+
+    status, body, writes = _get(asgi.application, '/artists')
+    assert status == 200 and writes > 2
+    assert [body.index('Artist {}'.format(n).encode()) for n in range(5)] == sorted(
+        body.index('Artist {}'.format(n).encode()) for n in range(5))
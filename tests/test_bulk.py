@@ -0,0 +1,115 @@
+import io
+import json
+from datetime import datetime
+
+from bulk import Importer, read_rows
+from models import db, Show, Venue
+from tests import factories
+
+
+def _import(kind, text, format='jsonl'):
+    return Importer(kind, batch_size=2).run(read_rows(io.StringIO(text), format))
+
+
+def _venue(**values):
+    return dict({'name': 'The Dueling Pianos Bar', 'city': 'New York', 'state': 'NY',
+                 'address': '335 Delancey Street', 'genres': ['Classical', 'R&B'],
+                 'facebook_link': 'https://www.facebook.com/theduelingpianos'}, **values)
+
+
+def test_malformed_json_lines_are_rejected_one_by_one(app):
+    lines = [
+        json.dumps(_venue(name='One')),
+        '{"name": "Two", ',
+        '',
+        '["not", "an", "object"]',
+        json.dumps(_venue(name='Three', genres={'Jazz': True})),
+        json.dumps(_venue(name='Four', phone=['123'])),
+        json.dumps(_venue(name='Five')),
+    ]
+    with app.app_context():
+        imported, rejects = _import('venues', '\n'.join(lines) + '\n')
+        assert imported == 2
+        assert sorted(name for name, in Venue.query.with_entities(Venue.name)) == ['Five', 'One']
+
+    assert [reject['line'] for reject in rejects] == [2, 4, 5, 6]
+    assert rejects[0]['row'] == '{"name": "Two", '
+    assert rejects[0]['errors']['row'][0].startswith('Invalid JSON')
+    assert rejects[1]['errors'] == {'row': ['Expected a JSON object, got list.']}
+    assert list(rejects[2]['errors']) == ['genres']
+    assert list(rejects[3]['errors']) == ['phone']
+    json.dumps(rejects)
+
+
+def test_csv_rejects_carry_their_line_numbers(app):
+    text = ('name,city,state,address,genres,facebook_link\n'
+            'One,New York,NY,1 Main Street,"Jazz,Blues",https://www.facebook.com/one\n'
+            ',New York,NY,2 Main Street,Jazz,https://www.facebook.com/two\n')
+    with app.app_context():
+        imported, rejects = _import('venues', text, 'csv')
+    assert imported == 1
+    assert [(reject['line'], list(reject['errors'])) for reject in rejects] == [(3, ['name'])]
+
+
+def test_imported_venues_are_found_by_search(app):
+    from search import find_venues
+
+    with app.app_context():
+        factories.venue(name='The Musical Hop')
+        db.session.commit()
+        assert find_venues('hop')['count'] == 1
+        assert find_venues('pianos')['count'] == 0
+
+        imported, _ = _import('venues', json.dumps(_venue()) + '\n')
+        assert imported == 1
+        assert [venue['name'] for venue in find_venues('pianos')['data']] == ['The Dueling Pianos Bar']
+
+
+def test_imported_shows_are_checked_for_double_booking(app):
+    with app.app_context():
+        venue, other_venue = factories.venue(), factories.venue(name='Park Square Live Music & Coffee')
+        artist, other_artist = factories.artist(), factories.artist(name='Matt Quevedo')
+        factories.show(venue, artist, start_time=datetime(2035, 4, 1, 20, 0))
+        db.session.commit()
+        ids = venue.id, other_venue.id, artist.id, other_artist.id
+
+    venue_id, other_venue_id, artist_id, other_artist_id = ids
+    rows = [
+        # The venue already has a show at 20:00.
+        {'venue_id': venue_id, 'artist_id': other_artist_id, 'start_time': '2035-04-01 20:30:00'},
+        {'venue_id': other_venue_id, 'artist_id': other_artist_id, 'start_time': '2035-04-02 20:00:00'},
+        # Overlaps the row above, for the same artist.
+        {'venue_id': venue_id, 'artist_id': other_artist_id, 'start_time': '2035-04-02 20:30:00'},
+        {'venue_id': venue_id, 'artist_id': artist_id, 'start_time': '2035-04-03 20:00:00'},
+        {'venue_id': other_venue_id, 'artist_id': artist_id, 'start_time': '2035-04-05 20:00:00'},
+    ]
+    with app.app_context():
+        imported, rejects = _import('shows', ''.join(json.dumps(row) + '\n' for row in rows))
+        assert imported == 3
+        assert Show.query.count() == 4
+
+    assert [(reject['line'], list(reject['errors'])) for reject in rejects] == [
+        (1, ['start_time']), (3, ['start_time'])]
+
+
+def test_rows_rejected_on_their_own_do_not_block_later_rows(app):
+    with app.app_context():
+        venue, artist = factories.venue(), factories.artist()
+        factories.show(venue, artist, start_time=datetime(2035, 4, 1, 18, 0))
+        db.session.commit()
+        venue_id, artist_id = venue.id, artist.id
+
+    rows = [
+        # Clashes with the stored 18:00 show.
+        {'venue_id': venue_id, 'artist_id': artist_id, 'start_time': '2035-04-01 19:00:00'},
+        # Would only overlap the rejected row above.
+        {'venue_id': venue_id, 'artist_id': artist_id, 'start_time': '2035-04-01 20:30:00'},
+        # Unknown venue, at the same time as the row above.
+        {'venue_id': 9999, 'artist_id': artist_id, 'start_time': '2035-04-01 20:45:00'},
+    ]
+    with app.app_context():
+        imported, rejects = _import('shows', ''.join(json.dumps(row) + '\n' for row in rows))
+        assert imported == 1
+        assert Show.query.filter(Show.start_time == datetime(2035, 4, 1, 20, 30)).count() == 1
+    assert [(reject['line'], list(reject['errors'])) for reject in rejects] == [
+        (1, ['start_time']), (3, ['venue_id'])]
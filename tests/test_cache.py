@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+
+from models import db, Artist
+from tests import factories
+
+
+def _seed(app):
+    with app.app_context():
+        venue = factories.venue(name='The Musical Hop')
+        artist = factories.artist()
+        factories.show(venue, artist, days=3)
+        db.session.commit()
+        return venue.id, artist.id
+
+
+def _warm(client, path):
+    client.get(path)
+    response = client.get(path)
+    assert response.headers['X-Cache'] == 'HIT'
+    return response
+
+
+def test_pages_are_served_from_the_cache(app, client):
+    venue_id, _ = _seed(app)
+    first = client.get('/venues/{}'.format(venue_id))
+    assert first.headers['X-Cache'] == 'MISS'
+    second = client.get('/venues/{}'.format(venue_id))
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.data == first.data
+
+
+def test_editing_a_venue_invalidates_the_pages_that_show_it(app, client):
+    venue_id, artist_id = _seed(app)
+    paths = ['/venues', '/venues/{}'.format(venue_id), '/artists/{}'.format(artist_id), '/shows']
+    for path in paths:
+        assert b'The Musical Hop' in _warm(client, path).data
+
+    response = client.post('/venues/{}/edit'.format(venue_id),
+                           data=factories.venue_form(name='The Dueling Pianos Bar'))
+    assert response.status_code == 302
+    # The redirect target renders the flash message, outside the cache.
+    client.get(response.headers['Location'])
+
+    for path in paths:
+        response = client.get(path)
+        assert response.headers['X-Cache'] == 'MISS', path
+        assert b'The Dueling Pianos Bar' in response.data, path
+        assert b'The Musical Hop' not in response.data, path
+
+
+def test_editing_a_venue_leaves_unrelated_pages_cached(app, client):
+    venue_id, artist_id = _seed(app)
+    with app.app_context():
+        other = factories.venue(name='Park Square Live Music & Coffee').id
+        db.session.commit()
+    _warm(client, '/venues/{}'.format(other))
+    _warm(client, '/artists')
+
+    response = client.post('/venues/{}/edit'.format(venue_id),
+                           data=factories.venue_form(name='The Dueling Pianos Bar'))
+    assert response.status_code == 302
+    client.get(response.headers['Location'])
+
+    assert client.get('/venues/{}'.format(other)).headers['X-Cache'] == 'HIT'
+    assert client.get('/artists').headers['X-Cache'] == 'HIT'
+
+
+def _started(app):
+    # A show that began a minute ago but is still counted as upcoming, as
+    # between two `flask shows rollover` runs.
+    from counters import shows_added
+    with app.app_context():
+        venue, artist = factories.venue(), factories.artist()
+        show = factories.show(venue, artist, start_time=(datetime.now() - timedelta(minutes=1)).replace(microsecond=0))
+        shows_added([(venue.id, artist.id, show.start_time)], now=show.start_time - timedelta(days=1))
+        db.session.commit()
+        return venue.id, artist.id
+
+
+def _rollover(app):
+    from counters import shows_cli
+    result = app.test_cli_runner().invoke(shows_cli, ['rollover'])
+    assert result.exit_code == 0, result.output
+
+
+def test_rollover_moves_a_started_show_to_past_shows(app, client):
+    venue_id, artist_id = _started(app)
+    paths = ['/venues', '/artists', '/venues/{}'.format(venue_id), '/artists/{}'.format(artist_id)]
+    for path in paths:
+        _warm(client, path)
+    listed = client.get('/api/v1/venues?fields=id,upcoming_shows_count,past_shows_count').json
+    assert listed['data'] == [{'id': venue_id, 'upcoming_shows_count': 1, 'past_shows_count': 0}]
+
+    _rollover(app)
+    listed = client.get('/api/v1/venues?fields=id,upcoming_shows_count,past_shows_count').json
+    assert listed['data'] == [{'id': venue_id, 'upcoming_shows_count': 0, 'past_shows_count': 1}]
+    with app.app_context():
+        assert [(artist.upcoming_shows_count, artist.past_shows_count)
+                for artist in Artist.query.all()] == [(0, 1)]
+    for path in paths:
+        assert client.get(path).headers['X-Cache'] == 'MISS'
+
+
+def test_rollover_reaches_pages_cached_by_another_process(app, client, monkeypatch):
+    # The command's invalidation can't reach a web worker's memory cache;
+    # the page version still moves with the counters.
+    from cache import cache
+    _started(app)
+    _warm(client, '/venues')
+
+    monkeypatch.setattr(cache, 'invalidate', lambda *groups: None)
+    _rollover(app)
+    assert client.get('/venues').headers['X-Cache'] == 'MISS'
@@ -0,0 +1,66 @@
+import time
+
+from sqlalchemy import text
+
+from models import db, Venue
+from tests import factories
+
+
+def _updated_at(venue_id):
+    return db.session.query(Venue.updated_at).filter(Venue.id == venue_id).scalar()
+
+
+def test_updated_at_changes_on_any_update(app):
+    with app.app_context():
+        venue_id = factories.venue().id
+        db.session.commit()
+        stamps = [_updated_at(venue_id)]
+        db.session.commit()
+
+        time.sleep(0.01)
+        db.session.execute(text('UPDATE "Venue" SET past_shows_count = 3 WHERE id = :id'),
+                           {'id': venue_id})
+        db.session.commit()
+        stamps.append(_updated_at(venue_id))
+        assert stamps[1] > stamps[0]
+
+
+def _update_venue_city(app, venue_id, city):
+    # A write the page cache isn't told about, like one from another
+    # worker, the CLI or psql.
+    time.sleep(0.01)
+    with app.app_context():
+        db.session.execute(text('UPDATE "Venue" SET city = :city WHERE id = :id'),
+                           {'city': city, 'id': venue_id})
+        db.session.commit()
+
+
+def test_listing_etag_changes_after_a_plain_sql_update(app, client):
+    with app.app_context():
+        venue_id = factories.venue().id
+        db.session.commit()
+    first = client.get('/venues')
+    assert client.get('/venues').headers['X-Cache'] == 'HIT'
+    etag = first.headers['ETag']
+    assert client.get('/venues', headers={'If-None-Match': etag}).status_code == 304
+
+    _update_venue_city(app, venue_id, 'Oakland')
+    response = client.get('/venues', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert b'Oakland' in response.data
+    assert client.get('/venues', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+
+
+def test_cached_detail_page_is_not_sent_under_a_new_etag(app, client):
+    with app.app_context():
+        venue_id = factories.venue(city='San Francisco').id
+        db.session.commit()
+    path = '/venues/{}'.format(venue_id)
+    client.get(path)
+    assert client.get(path).headers['X-Cache'] == 'HIT'
+
+    _update_venue_city(app, venue_id, 'Oakland')
+    response = client.get(path)
+    assert response.headers['X-Cache'] == 'MISS'
+    assert b'Oakland' in response.data
@@ -0,0 +1,25 @@
+import pytest
+
+ENDPOINTS = ['/debug/queries', '/debug/pool', '/cache/stats', '/jobs/stats']
+
+
+@pytest.mark.parametrize('path', ENDPOINTS)
+def test_diagnostics_are_off_outside_debug_mode(make_app, path):
+    client = make_app(DEBUG=False, DIAGNOSTICS_ENDPOINTS=False).test_client()
+    assert client.get(path).status_code == 404
+
+
+@pytest.mark.parametrize('path', ENDPOINTS)
+@pytest.mark.parametrize('settings', [{'DEBUG': True}, {'DEBUG': False, 'DIAGNOSTICS_ENDPOINTS': True}])
+def test_diagnostics_in_debug_mode_or_when_enabled(make_app, path, settings):
+    client = make_app(**settings).test_client()
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.is_json
+
+
+def test_each_query_is_profiled_once_however_many_apps(make_app):
+    make_app()
+    client = make_app(CACHE_BACKEND='none').test_client()
+    # The version probe and the directory query.
+    assert client.get('/venues').headers['X-Query-Count'] == '2'
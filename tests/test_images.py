@@ -0,0 +1,226 @@
+import http.server
+import io
+import socket
+import threading
+
+import pytest
+
+from images import FetchError, HTTPFetcher, images, link_version
+from models import db
+from tests import factories
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def _png(size, color='red'):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def server():
+    # A local HTTP server answering from `server.files`, {path: (content
+    # type, body)}, or with a redirect from `server.redirects`; the paths
+    # it was asked for are in `server.requests`, their Host headers in
+    # `server.hosts`.
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            httpd.requests.append(self.path)
+            httpd.hosts.append(self.headers['Host'])
+            if self.path in httpd.redirects:
+                self.send_response(302)
+                self.send_header('Location', httpd.redirects[self.path])
+                self.end_headers()
+                return
+            if self.path not in httpd.files:
+                self.send_error(404)
+                return
+            content_type, body = httpd.files[self.path]
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.files, httpd.redirects, httpd.requests, httpd.hosts = {}, {}, [], []
+    httpd.url = 'http://127.0.0.1:{}'.format(httpd.server_port)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+#----------------------------------------------------------------------------#
+# Fetching.
+#----------------------------------------------------------------------------#
+
+@pytest.mark.parametrize('url', [
+    'http://127.0.0.1/a.png',
+    'http://localhost/a.png',
+    'http://10.0.0.1/a.png',
+    'http://169.254.169.254/latest/meta-data/',
+    'http://[::1]/a.png',
+    'file:///etc/passwd',
+    'ftp://example.com/a.png',
+    'http:///a.png',
+])
+def test_fetcher_refuses_non_public_and_non_http_urls(url):
+    with pytest.raises(FetchError):
+        HTTPFetcher()(url)
+
+
+def _resolving(monkeypatch, names):
+    # Resolves each host in `names` to the addresses in turn, one list
+    # per lookup; other hosts as usual.
+    getaddrinfo = socket.getaddrinfo
+    lookups = []
+
+    def resolve(host, port, *args, **kwargs):
+        if host not in names:
+            return getaddrinfo(host, port, *args, **kwargs)
+        lookups.append(host)
+        addresses = names[host].pop(0) if len(names[host]) > 1 else names[host][0]
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (address, port)) for address in addresses]
+    monkeypatch.setattr(socket, 'getaddrinfo', resolve)
+    return lookups
+
+
+class _PublicFixture(HTTPFetcher):
+    # Lets connections to the fixture server's port through, as if it
+    # were public.
+    def __init__(self, port, **kwargs):
+        super().__init__(**kwargs)
+        self.port = port
+
+    def _resolve(self, host, port):
+        if port == self.port:
+            return ['127.0.0.1']
+        return super()._resolve(host, port)
+
+
+def test_fetcher_refuses_redirects_to_private_addresses(server):
+    server.redirects['/a.png'] = 'http://127.0.0.1:1/internal'
+    with pytest.raises(FetchError, match='non-public'):
+        _PublicFixture(server.server_port)(server.url + '/a.png')
+    assert server.requests == ['/a.png']
+
+
+def test_fetcher_connects_to_the_address_it_checked(server, monkeypatch):
+    # A name that resolves to a public address when checked and to
+    # loopback afterwards (DNS rebinding) is fetched from the public one.
+    lookups = _resolving(monkeypatch, {'rebind.example': [['93.184.216.34'], ['127.0.0.1']]})
+    connected = []
+
+    def create_connection(address, *args, **kwargs):
+        connected.append(address)
+        raise ConnectionRefusedError(address)
+    monkeypatch.setattr(socket, 'create_connection', create_connection)
+
+    url = 'http://rebind.example:{}/a.png'.format(server.server_port)
+    with pytest.raises(FetchError):
+        HTTPFetcher()(url)
+    assert lookups == ['rebind.example']
+    assert connected == [('93.184.216.34', server.server_port)]
+    assert server.requests == []
+
+
+def test_fetcher_keeps_the_host_name_of_the_url(server, monkeypatch):
+    _resolving(monkeypatch, {'images.example': [['127.0.0.1']]})
+    server.files['/a.png'] = ('image/png', _png((8, 8)))
+    url = 'http://images.example:{}/a.png'.format(server.server_port)
+    assert HTTPFetcher(allow_private=True)(url)[1] == 'image/png'
+    assert server.hosts == ['images.example:{}'.format(server.server_port)]
+
+
+def test_fetcher_refuses_non_images_and_large_bodies(server):
+    server.files['/page.html'] = ('text/html', b'<html></html>')
+    server.files['/a.png'] = ('image/png', _png((64, 64)))
+    fetcher = HTTPFetcher(allow_private=True, max_bytes=100)
+    with pytest.raises(FetchError, match='not an image'):
+        fetcher(server.url + '/page.html')
+    with pytest.raises(FetchError, match='larger than'):
+        fetcher(server.url + '/a.png')
+    content_type, body = server.files['/a.png']
+    assert HTTPFetcher(allow_private=True)(server.url + '/a.png') == (body, content_type)
+
+#----------------------------------------------------------------------------#
+# Serving.
+#----------------------------------------------------------------------------#
+
+@pytest.fixture
+def app(make_app):
+    return make_app(IMAGE_FETCH_ALLOW_PRIVATE=True)
+
+
+def _venue_image(app, link):
+    with app.app_context():
+        venue = factories.venue(image_link=link)
+        db.session.commit()
+        return '/images/venue/{}/tile?v={}'.format(venue.id, link_version(link))
+
+
+def test_images_are_fetched_once_and_resized_to_fit(app, client, server):
+    server.files['/wide.png'] = ('image/png', _png((2000, 1000)))
+    path = _venue_image(app, server.url + '/wide.png')
+
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.mimetype == 'image/jpeg'
+    assert 'immutable' in response.headers['Cache-Control']
+    with Image.open(io.BytesIO(response.data)) as image:
+        assert image.format == 'JPEG'
+        assert image.size == (640, 320)
+
+    response = client.get(path, headers={'Accept': 'image/webp,*/*'})
+    assert response.mimetype == 'image/webp'
+    with Image.open(io.BytesIO(response.data)) as image:
+        assert image.size == (640, 320)
+    assert server.requests == ['/wide.png']
+
+    etag = response.headers['ETag'].strip('"')
+    response = client.get(path, headers={'Accept': 'image/webp', 'If-None-Match': etag})
+    assert response.status_code == 304
+
+
+def test_small_images_are_not_enlarged(app, client, server):
+    server.files['/small.png'] = ('image/png', _png((100, 50)))
+    response = client.get(_venue_image(app, server.url + '/small.png'))
+    with Image.open(io.BytesIO(response.data)) as image:
+        assert image.size == (100, 50)
+
+
+def test_proxy_only_fetches_stored_links(app, client, server):
+    server.files['/a.png'] = ('image/png', _png((64, 64)))
+    path = _venue_image(app, server.url + '/a.png')
+    other = link_version(server.url + '/other.png')
+    assert client.get(path.split('?')[0] + '?v=' + other).status_code == 404
+    assert client.get(path.replace('/tile', '/huge')).status_code == 404
+    assert client.get(path.replace('/venue/', '/user/')).status_code == 404
+    assert server.requests == []
+
+
+def test_private_links_are_not_fetched_by_default(make_app, server):
+    app = make_app(IMAGE_FETCH_ALLOW_PRIVATE=False)
+    server.files['/a.png'] = ('image/png', _png((64, 64)))
+    path = _venue_image(app, server.url + '/a.png')
+    assert app.test_client().get(path).status_code == 404
+    assert server.requests == []
+
+
+def test_undecodable_images_are_not_found(app, client, server):
+    server.files['/broken.png'] = ('image/png', b'not a png')
+    path = _venue_image(app, server.url + '/broken.png')
+    assert client.get(path).status_code == 404
+
+
+def test_decompression_bombs_are_not_found(app, client, server, monkeypatch):
+    # Pillow refuses images over twice MAX_IMAGE_PIXELS.
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', 1000)
+    server.files['/bomb.png'] = ('image/png', _png((100, 100)))
+    path = _venue_image(app, server.url + '/bomb.png')
+    assert client.get(path).status_code == 404
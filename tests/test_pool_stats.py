@@ -0,0 +1,34 @@
+import pytest
+
+from tests.conftest import TEST_DATABASE_URL
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app(SQLALCHEMY_REPLICA_URIS=[TEST_DATABASE_URL], CACHE_BACKEND='none')
+
+
+def _engines(client):
+    return client.get('/debug/pool').get_json()['engines']
+
+
+def test_pool_stats_are_kept_per_engine(app, client):
+    before = _engines(client)
+    assert sorted(before) == ['primary', 'replica-1']
+
+    for _ in range(3):
+        assert client.get('/venues').status_code == 200
+    after = _engines(client)
+    assert after['replica-1']['checkouts'] == before['replica-1']['checkouts'] + 3
+    assert after['primary']['checkouts'] == before['primary']['checkouts']
+    assert after['replica-1']['pool_class'] == 'InstrumentedQueuePool'
+    assert after['replica-1']['checked_out'] == 0
+
+
+def test_pool_stats_survive_dispose(app, client):
+    client.get('/venues')
+    replica, = app.extensions['db_replicas']
+    replica.dispose()
+    assert _engines(client)['replica-1']['checkouts'] == 1
+    client.get('/venues')
+    assert _engines(client)['replica-1']['checkouts'] == 2
@@ -0,0 +1,29 @@
+import random
+
+import pytest
+
+from benchmarks import explain
+from models import db
+from tests import factories
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app(CACHE_BACKEND='none')
+
+
+def test_read_pages_are_served_by_their_indexes(app):
+    with app.app_context():
+        artists = [factories.artist(name='Artist {}'.format(n)) for n in range(3)]
+        for n in range(6):
+            venue = factories.venue(name='Venue {}'.format(n), city='City {}'.format(n % 2))
+            for day in (-3, 2, 20):
+                factories.show(venue, artists[n % 3], days=day)
+        db.session.commit()
+
+    failures = []
+    for name, path, table, index in explain.build_cases(app, random.Random(0)):
+        passed, scans = explain.check(app, path, table, index, seqscan=False)
+        if not passed:
+            failures.append('{} expects {} on "{}", plans use {}'.format(name, index, table, sorted(set(scans))))
+    assert not failures, '\n'.join(failures)
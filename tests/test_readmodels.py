@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from models import db
+from queries import venue_detail, artist_detail
+from readmodels import ArtistShow, VenueShow
+from tests import factories
+
+PAST, UPCOMING = datetime(2001, 4, 1, 20, 0), datetime(2035, 4, 1, 20, 0)
+
+
+def _seed(app):
+    with app.app_context():
+        venue = factories.venue(image_link='https://example.com/hop.png')
+        artist = factories.artist(image_link='https://example.com/petals.png')
+        factories.show(venue, artist, start_time=PAST)
+        factories.show(venue, artist, start_time=UPCOMING)
+        db.session.commit()
+        return venue.id, artist.id
+
+
+def test_detail_pages_map_their_rows(app):
+    venue_id, artist_id = _seed(app)
+    with app.app_context():
+        venue = venue_detail(venue_id)
+        assert (venue.id, venue.name, venue.city, venue.genres) == (
+            venue_id, 'The Musical Hop', 'San Francisco', ['Jazz'])
+        assert venue.past_shows == [
+            ArtistShow(artist_id, 'Guns N Petals', 'https://example.com/petals.png', PAST)]
+        assert venue.upcoming_shows == [
+            ArtistShow(artist_id, 'Guns N Petals', 'https://example.com/petals.png', UPCOMING)]
+        assert (venue.past_shows_count, venue.upcoming_shows_count) == (1, 1)
+
+        artist = artist_detail(artist_id)
+        assert artist.past_shows[0] == VenueShow(
+            venue_id, 'The Musical Hop', 'https://example.com/hop.png', PAST)
+        assert artist.past_shows[0]._asdict() == {
+            'venue_id': venue_id, 'venue_name': 'The Musical Hop',
+            'venue_image_link': 'https://example.com/hop.png', 'start_time': PAST}
+        assert (artist.past_shows_count, artist.upcoming_shows_count) == (1, 1)
+
+
+def test_api_writes_records_as_objects(app, client):
+    venue_id, artist_id = _seed(app)
+    fields = 'id,name,past_shows_count,upcoming_shows_count'
+    venue = client.get('/api/v1/venues/{}?fields={}&embed=shows'.format(venue_id, fields)).json
+    assert venue['data'] == {
+        'id': venue_id, 'name': 'The Musical Hop', 'past_shows_count': 1, 'upcoming_shows_count': 1,
+        'past_shows': [{'artist_id': artist_id, 'artist_name': 'Guns N Petals',
+                        'artist_image_link': 'https://example.com/petals.png',
+                        'start_time': '2001-04-01T20:00:00'}],
+        'upcoming_shows': [{'artist_id': artist_id, 'artist_name': 'Guns N Petals',
+                            'artist_image_link': 'https://example.com/petals.png',
+                            'start_time': '2035-04-01T20:00:00'}]}
+
+    artists = client.get('/api/v1/artists?fields=id&embed=shows').json
+    assert artists['data'][0]['upcoming_shows'] == [{
+        'venue_id': venue_id, 'venue_name': 'The Musical Hop',
+        'venue_image_link': 'https://example.com/hop.png', 'start_time': '2035-04-01T20:00:00'}]
+
+    shows = client.get('/api/v1/shows?fields=venue_name,artist_name,start_time').json
+    assert {'venue_name': 'The Musical Hop', 'artist_name': 'Guns N Petals',
+            'start_time': '2035-04-01T20:00:00'} in shows['data']
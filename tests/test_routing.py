@@ -0,0 +1,97 @@
+import pytest
+
+import routing
+from models import db, Venue
+from tests import factories
+from tests.conftest import TEST_DATABASE_URL
+
+
+@pytest.fixture
+def app(make_app):
+    # The test database doubles as the replica; what matters is which
+    # engine each query goes through.
+    return make_app(SQLALCHEMY_REPLICA_URIS=[TEST_DATABASE_URL], CACHE_BACKEND='none',
+                    READ_YOUR_WRITES_SECONDS=5)
+
+
+@pytest.fixture
+def venue_id(app):
+    with app.app_context():
+        venue = factories.venue()
+        db.session.commit()
+        return venue.id
+
+
+def _get(client, statements, replica, path):
+    with statements() as on_primary, statements(replica) as on_replica:
+        assert client.get(path).status_code == 200
+    return len(on_primary), len(on_replica)
+
+
+def test_read_only_pages_read_from_a_replica(app, client, statements, venue_id):
+    replica, = app.extensions['db_replicas']
+    for path in ('/venues', '/venues/{}'.format(venue_id), '/shows'):
+        on_primary, on_replica = _get(client, statements, replica, path)
+        assert on_primary == 0, path
+        assert on_replica > 0, path
+
+
+def test_queries_outside_a_request_use_the_primary(app, statements, venue_id):
+    replica, = app.extensions['db_replicas']
+    with statements() as on_primary, statements(replica) as on_replica:
+        with app.app_context():
+            assert db.session.query(Venue).count() == 1
+    assert on_primary and not on_replica
+
+
+def test_a_write_keeps_the_client_on_the_primary_for_a_while(app, client, statements, venue_id,
+                                                            monkeypatch):
+    replica, = app.extensions['db_replicas']
+    with statements() as on_primary, statements(replica) as on_replica:
+        response = client.post('/venues/{}/edit'.format(venue_id),
+                               data=factories.venue_form(name='The Dueling Pianos Bar'))
+    assert response.status_code == 302
+    assert on_primary and not on_replica
+
+    on_primary, on_replica = _get(client, statements, replica, '/venues/{}'.format(venue_id))
+    assert on_primary > 0 and on_replica == 0
+    # Another client has not written anything.
+    other = app.test_client()
+    with statements() as on_primary, statements(replica) as on_replica:
+        other.get('/venues')
+    assert not on_primary and on_replica
+
+    now = routing.time.time()
+    monkeypatch.setattr(routing.time, 'time', lambda: now + 6)
+    on_primary, on_replica = _get(client, statements, replica, '/venues/{}'.format(venue_id))
+    assert on_primary == 0 and on_replica > 0
+
+
+def test_read_only_posts_do_not_stick(app, client, statements, venue_id):
+    replica, = app.extensions['db_replicas']
+    assert client.post('/venues/search', data={'search_term': 'hop'}).status_code == 200
+    on_primary, on_replica = _get(client, statements, replica, '/venues')
+    assert on_primary == 0 and on_replica > 0
+
+
+def test_a_rejected_write_does_not_stick(app, client, statements, venue_id):
+    replica, = app.extensions['db_replicas']
+    # No such artist: the page is rendered with a message, nothing committed.
+    response = client.post('/shows/create', data={'venue_id': venue_id, 'artist_id': 9999,
+                                                  'start_time': '2035-04-01 20:00:00'})
+    assert response.status_code == 200
+    on_primary, on_replica = _get(client, statements, replica, '/venues')
+    assert on_primary == 0 and on_replica > 0
+
+
+def test_a_statement_write_sticks(app, client, statements, venue_id):
+    # schedule_shows() inserts with a Core statement, without a flush.
+    replica, = app.extensions['db_replicas']
+    with app.app_context():
+        artist_id = factories.artist().id
+        db.session.commit()
+    response = client.post('/shows/create', data={'venue_id': venue_id, 'artist_id': artist_id,
+                                                  'start_time': '2035-04-01 20:00:00'})
+    assert response.status_code == 200
+    on_primary, on_replica = _get(client, statements, replica, '/venues')
+    assert on_primary > 0 and on_replica == 0
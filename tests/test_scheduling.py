@@ -0,0 +1,129 @@
+from datetime import datetime
+
+from models import db, Show, Venue, Artist
+from scheduling import schedule_shows
+from tests import factories
+
+NOW = datetime(2035, 1, 1)
+
+
+def _booked(app):
+    # (venue_id, other_venue_id, artist_id, other_artist_id), with one show
+    # of the venue and artist stored at 2035-04-01 20:00.
+    with app.app_context():
+        venue, other_venue = factories.venue(), factories.venue(name='Park Square Live Music & Coffee')
+        artist, other_artist = factories.artist(), factories.artist(name='Matt Quevedo')
+        factories.show(venue, artist, start_time=datetime(2035, 4, 1, 20, 0))
+        db.session.commit()
+        return venue.id, other_venue.id, artist.id, other_artist.id
+
+
+def _counts(model):
+    return sorted((row.id, row.upcoming_shows_count, row.past_shows_count)
+                  for row in model.query.all())
+
+
+def test_shows_are_scheduled_and_counted(app):
+    venue_id, other_venue_id, artist_id, other_artist_id = _booked(app)
+    with app.app_context():
+        created, rejects = schedule_shows([
+            {'venue_id': other_venue_id, 'artist_id': artist_id, 'start_time': '2035-04-02 20:00:00'},
+            {'venue_id': other_venue_id, 'artist_id': other_artist_id, 'start_time': '2035-04-03 20:00:00'},
+        ], now=NOW)
+        assert rejects == []
+        assert [(show['venue_id'], show['artist_id']) for show in created] == [
+            (other_venue_id, artist_id), (other_venue_id, other_artist_id)]
+        assert Show.query.count() == 3
+        assert _counts(Venue) == [(venue_id, 0, 0), (other_venue_id, 2, 0)]
+        assert _counts(Artist) == [(artist_id, 1, 0), (other_artist_id, 1, 0)]
+
+
+def test_a_show_overlapping_a_stored_show_is_rejected(app):
+    venue_id, other_venue_id, artist_id, other_artist_id = _booked(app)
+    with app.app_context():
+        created, rejects = schedule_shows([
+            {'venue_id': venue_id, 'artist_id': other_artist_id, 'start_time': '2035-04-01 20:30:00'},
+            {'venue_id': other_venue_id, 'artist_id': artist_id, 'start_time': '2035-04-01 19:30:00'},
+        ], now=NOW)
+        assert created == []
+        assert rejects == [
+            {'index': 0, 'errors': {'start_time': ['The venue is booked for show 1 at this time.']}},
+            {'index': 1, 'errors': {'start_time': ['The artist is booked for show 1 at this time.']}},
+        ]
+
+
+def test_shows_overlapping_within_the_batch_are_rejected(app):
+    venue_id, other_venue_id, artist_id, other_artist_id = _booked(app)
+    with app.app_context():
+        created, rejects = schedule_shows([
+            {'venue_id': other_venue_id, 'artist_id': other_artist_id, 'start_time': '2035-04-02 20:00:00'},
+            {'venue_id': venue_id, 'artist_id': other_artist_id, 'start_time': '2035-04-02 20:30:00'},
+        ], now=NOW)
+        assert created == []
+        assert rejects == [
+            {'index': 1, 'errors': {'start_time': ['The artist is also booked by row 0 at this time.']}},
+        ]
+
+
+def test_unknown_venues_and_artists_are_rejected(app):
+    venue_id, _, artist_id, _ = _booked(app)
+    with app.app_context():
+        created, rejects = schedule_shows([
+            {'venue_id': 9999, 'artist_id': artist_id, 'start_time': '2035-05-01 20:00:00'},
+            {'venue_id': venue_id, 'artist_id': 9999, 'start_time': '2035-05-02 20:00:00'},
+            {'venue_id': 'one', 'start_time': 'tonight'},
+        ], now=NOW)
+        assert created == []
+        assert rejects[0] == {'index': 0, 'errors': {'venue_id': ['No such venue.']}}
+        assert rejects[1] == {'index': 1, 'errors': {'artist_id': ['No such artist.']}}
+        assert rejects[2]['index'] == 2
+        assert sorted(rejects[2]['errors']) == ['artist_id', 'start_time', 'venue_id']
+
+
+def test_one_rejected_row_schedules_nothing(app):
+    venue_id, other_venue_id, artist_id, other_artist_id = _booked(app)
+    with app.app_context():
+        venues, artists = _counts(Venue), _counts(Artist)
+        created, rejects = schedule_shows([
+            {'venue_id': other_venue_id, 'artist_id': other_artist_id, 'start_time': '2035-05-01 20:00:00'},
+            {'venue_id': other_venue_id, 'artist_id': artist_id, 'start_time': '2035-05-02 20:00:00'},
+            {'venue_id': venue_id, 'artist_id': 9999, 'start_time': '2035-05-03 20:00:00'},
+        ], now=NOW)
+        assert created == []
+        assert [reject['index'] for reject in rejects] == [2]
+        assert Show.query.count() == 1
+        assert _counts(Venue) == venues
+        assert _counts(Artist) == artists
+
+
+def test_api_schedules_a_batch(app, client):
+    _, other_venue_id, artist_id, _ = _booked(app)
+    response = client.post('/api/v1/shows', json={'shows': [
+        {'venue_id': other_venue_id, 'artist_id': artist_id, 'start_time': '2035-04-02T20:00:00'},
+    ]})
+    assert response.status_code == 201
+    assert response.json == {'data': [{'id': 2, 'venue_id': other_venue_id, 'artist_id': artist_id,
+                                       'start_time': '2035-04-02T20:00:00'}]}
+
+
+def test_api_rejects_the_whole_batch(app, client):
+    venue_id, other_venue_id, artist_id, other_artist_id = _booked(app)
+    response = client.post('/api/v1/shows', json=[
+        {'venue_id': other_venue_id, 'artist_id': other_artist_id, 'start_time': '2035-05-01T20:00:00'},
+        # Clashes with the stored show.
+        {'venue_id': venue_id, 'artist_id': other_artist_id, 'start_time': '2035-04-01T21:00:00'},
+        # Clashes with the first row.
+        {'venue_id': other_venue_id, 'artist_id': artist_id, 'start_time': '2035-05-01T20:30:00'},
+        {'venue_id': 9999, 'artist_id': artist_id, 'start_time': '2035-06-01T20:00:00'},
+    ])
+    assert response.status_code == 422
+    assert response.json['error'] == 'no shows were scheduled'
+    assert [(reject['index'], list(reject['errors'])) for reject in response.json['rejects']] == [
+        (1, ['start_time']), (2, ['start_time']), (3, ['venue_id'])]
+    with app.app_context():
+        assert Show.query.count() == 1
+
+
+def test_api_requires_a_list_of_shows(client, database):
+    assert client.post('/api/v1/shows', json={'shows': []}).status_code == 400
+    assert client.post('/api/v1/shows', data='not json', content_type='application/json').status_code == 400
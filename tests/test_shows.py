@@ -0,0 +1,46 @@
+from datetime import date
+
+import queries
+from models import db
+from tests import factories
+
+
+def _today(monkeypatch, day):
+    class Today(date):
+        @classmethod
+        def today(cls):
+            return day
+    monkeypatch.setattr(queries, 'date', Today)
+
+
+def test_calendar_window_from_today_is_not_reused_the_next_day(app, client, monkeypatch):
+    with app.app_context():
+        factories.show(factories.venue(city='Seattle'), factories.artist(), days=1)
+        db.session.commit()
+
+    _today(monkeypatch, date(2030, 5, 1))
+    first = client.get('/shows?city=Seattle')
+    assert first.status_code == 200
+    assert client.get('/shows?city=Seattle').headers['X-Cache'] == 'HIT'
+    repeat = client.get('/shows?city=Seattle', headers={'If-None-Match': first.headers['ETag']})
+    assert repeat.status_code == 304
+
+    _today(monkeypatch, date(2030, 5, 2))
+    later = client.get('/shows?city=Seattle', headers={'If-None-Match': first.headers['ETag']})
+    assert later.status_code == 200
+    assert later.headers['X-Cache'] == 'MISS'
+    assert later.headers['ETag'] != first.headers['ETag']
+    assert b'2030-05-02' in later.data
+
+
+def test_malformed_window_is_a_bad_request(client, database):
+    assert client.get('/shows?from=2030-13-01').status_code == 400
+    assert client.get('/shows?from=2030-05-02&to=2030-05-01').status_code == 400
+
+
+def test_window_at_the_ends_of_the_calendar_is_a_bad_request(client, database):
+    for query in ('from=9999-12-31', 'from=9999-12-01&to=9999-12-31', 'to=0001-01-01',
+                  'from=0001-01-01&to=0001-01-31'):
+        assert client.get('/shows?' + query).status_code == 400
+        assert client.get('/api/v1/shows?' + query).status_code == 400
+        assert client.get('/api/v1/shows/days?' + query).status_code == 400
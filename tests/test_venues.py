@@ -0,0 +1,57 @@
+import pytest
+
+from models import db
+from tests import factories
+
+
+@pytest.fixture
+def app(make_app):
+    # Rows are seeded behind the views' backs, so the response cache is
+    # left out; these tests count the queries of a full render.
+    return make_app(CACHE_BACKEND='none')
+
+
+def _seed(areas, venues_per_area):
+    artist = factories.artist()
+    for area in range(areas):
+        for n in range(venues_per_area):
+            venue = factories.venue(name='Venue {}-{}'.format(area, n), city='City {}'.format(area))
+            factories.show(venue, artist, days=n - 1)
+    db.session.commit()
+
+
+def _directory_queries(statements):
+    return [statement for statement in statements if 'upcoming_shows_count' in statement]
+
+
+def test_venue_directory_is_one_query(app, client, statements):
+    with app.app_context():
+        _seed(areas=3, venues_per_area=4)
+
+    with statements() as run:
+        response = client.get('/venues')
+    assert response.status_code == 200
+    assert response.get_data(as_text=True).count('<h3>') == 3
+    # The conditional-GET version probe, then the directory itself.
+    assert len(_directory_queries(run)) == 1
+    assert len(run) == 2
+
+    with statements() as run:
+        response = client.get('/venues', headers={'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+    assert len(run) == 1
+
+
+def test_venue_directory_queries_do_not_grow_with_venues(app, client, statements):
+    with app.app_context():
+        _seed(areas=2, venues_per_area=2)
+    with statements() as small:
+        client.get('/venues')
+
+    with app.app_context():
+        _seed(areas=10, venues_per_area=5)
+    with statements() as large:
+        response = client.get('/venues')
+    assert response.status_code == 200
+    assert len(large) == len(small)
+    assert len(_directory_queries(large)) == 1
@@ -0,0 +1,554 @@
+#----------------------------------------------------------------------------#
+# Imports
+#----------------------------------------------------------------------------#
+
+from functools import lru_cache
+from flask import Blueprint, current_app, render_template, request, Response, flash, redirect, url_for, abort, jsonify, stream_with_context
+from flask_wtf import Form
+from forms import *
+from models import *
+from queries import (venue_directory, venue_detail, artist_detail, show_page, artist_listing,
+                     show_window, window_args, show_days, show_calendar)
+from search import find_venues, find_artists, find_all
+from counters import venue_removed
+from conditional import conditional, venue_version, artist_version, listing_version
+import pool_stats
+from cache import cache, invalidate_venue, invalidate_artist, invalidate_venue_list, invalidate_artist_list
+from routing import read_only
+from scheduling import schedule_shows
+from images import warm_later
+from datetime import datetime as dt
+
+# The site's pages, registered on the app by app.create_app().
+pages = Blueprint('pages', __name__)
+
+#----------------------------------------------------------------------------#
+# Filters.
+#----------------------------------------------------------------------------#
+
+# babel and dateutil are imported on first use, not at worker start.
+
+@lru_cache(maxsize=None)
+def _datetime_setup():
+  import babel.dates
+  patterns = {
+    'full': babel.dates.parse_pattern("EEEE MMMM, d, y 'at' h:mma"),
+    'medium': babel.dates.parse_pattern("EE MM, dd, y h:mma"),
+  }
+  return babel.dates, patterns, babel.Locale.parse('en')
+
+@lru_cache(maxsize=4096)
+def _format_datetime(value, format):
+  dates, patterns, locale = _datetime_setup()
+  pattern = patterns.get(format)
+  if pattern is None:
+    return dates.format_datetime(value, format, locale=locale)
+  if value.tzinfo is None:
+    value = value.replace(tzinfo=dates.UTC)
+  return pattern.apply(value, locale)
+
+def parse_datetime(value):
+  import dateutil.parser
+  return dateutil.parser.parse(value)
+
+@pages.app_template_filter('datetime')
+def format_datetime(value, format='medium'):
+  # Takes datetimes as loaded from the db; strings are still parsed.
+  if isinstance(value, str):
+    value = parse_datetime(value)
+  return _format_datetime(value, format)
+
+#----------------------------------------------------------------------------#
+# Streaming.
+#----------------------------------------------------------------------------#
+
+def stream_template(template_name, **context):
+  # Flask 2.2's stream_template, for the pinned Flask 2.1: the page is sent
+  # while Jinja renders it, with the request context kept alive for the
+  # queries that run lazily inside the template's loops.
+  current_app.update_template_context(context)
+  template = current_app.jinja_env.get_or_select_template(template_name)
+  return Response(stream_with_context(_buffered(template.generate(context))), mimetype='text/html')
+
+def _buffered(pieces):
+  # Writes of about STREAM_BUFFER_SIZE bytes rather than one per template
+  # fragment. Closing the render generator on the way out (also when the
+  # client goes away) closes its server-side cursors while the request's
+  # session is still open.
+  size = current_app.config['STREAM_BUFFER_SIZE']
+  buffer, buffered = [], 0
+  try:
+    for piece in pieces:
+      buffer.append(piece)
+      buffered += len(piece)
+      if buffered >= size:
+        yield ''.join(buffer)
+        buffer, buffered = [], 0
+    yield ''.join(buffer)
+  finally:
+    pieces.close()
+
+def render_listing(template_name, **context):
+  # Listing pages get their rows as iterators; STREAM_LISTINGS decides
+  # whether the HTML is sent as it renders or built in full first.
+  if current_app.config['STREAM_LISTINGS']:
+    return stream_template(template_name, **context)
+  return render_template(template_name, **context)
+
+#----------------------------------------------------------------------------#
+# Controllers.
+#----------------------------------------------------------------------------#
+
+@pages.route('/')
+@read_only
+def index():
+  return render_template('pages/home.html')
+
+
+#  Search
+#  ----------------------------------------------------------------
+
+@pages.route('/search')
+@read_only
+def search():
+  # venues and artists matched on name, "City, ST" and genre, ranked together
+  search_term = request.args.get('search_term', '')
+  page = max(1, request.args.get('page', 1, type=int))
+  results = find_all(search_term, page=page)
+  return render_template('pages/search.html', results=results, search_term=search_term)
+
+
+#  Venues
+#  ----------------------------------------------------------------
+
+@pages.route('/venues')
+@read_only
+@conditional(lambda: listing_version('venues', Venue))
+@cache.cached('venues')
+def venues():
+  return render_listing('pages/venues.html', areas=venue_directory(current_app.config['LISTING_CHUNK']))
+
+@pages.route('/venues/search', methods=['POST'])
+@read_only
+def search_venues():
+  # case-insensitive partial match on name, ranked by trigram similarity
+  search_term = request.form.get('search_term', '')
+  response = find_venues(search_term)
+  return render_template('pages/search_venues.html', results=response, search_term=search_term)
+
+@pages.route('/venues/<int:venue_id>')
+@read_only
+@conditional(venue_version)
+@cache.cached('venue:{venue_id}')
+def show_venue(venue_id):
+  data = venue_detail(venue_id)
+  if data is None:
+    abort(404)
+  return render_template('pages/show_venue.html', venue=data, form=VenueForm())
+
+#  Create Venue
+#  ----------------------------------------------------------------
+
+@pages.route('/venues/create', methods=['GET'])
+@read_only
+def create_venue_form():
+  form = VenueForm()
+  return render_template('forms/new_venue.html', form=form)
+
+@pages.route('/venues/create', methods=['POST'])
+def create_venue_submission():
+  form = VenueForm()
+
+  # Form validation
+  if not form.validate_on_submit():
+    flash('Please check your inputs!')
+    return render_template('forms/new_venue.html', form=form) 
+
+  name = request.form['name'] 
+  city = request.form['city']
+  state = request.form['state']
+  address = request.form['address']
+  phone = request.form['phone']
+  genres = request.form.getlist('genres')
+  facebook_link = request.form['facebook_link']
+  image_link = request.form['image_link']
+  website_link = request.form['website_link']
+  seeking_talent = request.form.get('seeking_talent', False, type=bool)
+  seeking_description = request.form['seeking_description']
+  # TODO: insert form data as a new Venue record in the db, instead
+
+  try:
+    venue = Venue(name=name, city=city, state=state, address=address, phone=phone, genres=genres,
+                facebook_link=facebook_link, image_link=image_link, website_link=website_link,
+                seeking_talent=seeking_talent, seeking_description=seeking_description)
+    if len(genres) > 4:
+      flash('Please select up to 4 genres')
+      return redirect(url_for('.create_venue_form'))
+    db.session.add(venue)
+    db.session.flush()
+    warm_later('venue', venue.id, image_link)
+    db.session.commit()
+    invalidate_venue_list()
+    # on successful db insert, flash success
+    flash('Venue ' + name + ' was successfully listed!')
+  except:
+    # TODO: on unsuccessful db insert, flash an error instead.
+    flash('An error occurred. Venue ' + name + ' could not be listed.')
+    db.session.rollback()
+    abort(422)
+  finally:
+    db.session.close()
+
+  # TODO: modify data to be the data object returned from db insertion
+
+  
+  
+  # e.g., flash('An error occurred. Venue ' + data.name + ' could not be listed.')
+  # see: http://flask.pocoo.org/docs/1.0/patterns/flashing/
+  return render_template('pages/home.html', form=form)
+
+@pages.route('/venues/<venue_id>', methods=['DELETE'])
+def delete_venue(venue_id):
+  # TODO: Complete this endpoint for taking a venue_id, and using
+  # SQLAlchemy ORM to delete a record. Handle cases where the session commit could fail.
+  try:
+    venue = Venue.query.get(venue_id)
+    artist_ids = [show.artist_id for show in venue.shows]
+    venue_removed(venue.id)
+    db.session.delete(venue)
+    db.session.commit()
+    invalidate_venue(venue_id, artist_ids)
+  except:
+    db.session.rollback()
+    abort(404)
+  finally:
+    db.session.close()
+  # BONUS CHALLENGE: Implement a button to delete a Venue on a Venue Page, have it so that
+  # clicking that button delete it from the db then redirect the user to the homepage
+  return jsonify({'success': True})
+
+#  Artists
+#  ----------------------------------------------------------------
+@pages.route('/artists')
+@read_only
+@conditional(lambda: listing_version('artists', Artist))
+@cache.cached('artists')
+def artists():
+  # id and name only, read through a server-side cursor
+  data = artist_listing(chunk=current_app.config['LISTING_CHUNK'])
+  return render_listing('pages/artists.html', artists=data)
+
+@pages.route('/artists/search', methods=['POST'])
+@read_only
+def search_artists():
+  # case-insensitive partial match on name, ranked by trigram similarity
+  search_term = request.form.get('search_term', '')
+  response = find_artists(search_term)
+  return render_template('pages/search_artists.html', results=response, search_term=search_term)
+
+@pages.route('/artists/<int:artist_id>')
+@read_only
+@conditional(artist_version)
+@cache.cached('artist:{artist_id}')
+def show_artist(artist_id):
+  # shows the artist page with the given artist_id
+  data = artist_detail(artist_id)
+  if data is None:
+    abort(404)
+  return render_template('pages/show_artist.html', artist=data)
+
+#  Update
+#  ----------------------------------------------------------------
+@pages.route('/artists/<int:artist_id>/edit', methods=['GET'])
+@read_only
+def edit_artist(artist_id):
+  form = ArtistForm()
+ 
+  artist = Artist.query.get(artist_id)
+  form.name.data = artist.name
+  form.genres.data = artist.genres
+  form.city.data = artist.city
+  form.state.data = artist.state
+  form.phone.data = artist.phone  
+  form.website_link.data = artist.website_link
+  form.facebook_link.data = artist.facebook_link
+  form.seeking_venue.data = artist.seeking_venue
+  form.seeking_description.data = artist.seeking_description
+  form.image_link.data = artist.image_link
+
+  artist = {
+    'id': artist.id,
+    'name': artist.name,
+    'genres': artist.genres,
+    'city': artist.city,
+    'state': artist.state,
+    'phone': artist.phone,  
+    'website': artist.website_link,
+    'facebook_link': artist.facebook_link,
+    'seeking_venue': artist.seeking_venue,
+    'seeking_description': artist.seeking_description,
+    'image_link': artist.image_link
+  }
+  # TODO: populate form with fields from artist with ID <artist_id>
+  return render_template('forms/edit_artist.html', form=form, artist=artist)
+
+@pages.route('/artists/<int:artist_id>/edit', methods=['POST'])
+def edit_artist_submission(artist_id):
+  # TODO: take values from the form submitted, and update existing
+  # artist record with ID <artist_id> using the new attributes
+  form = ArtistForm()
+
+  if not form.validate_on_submit():
+    flash('Please check your inputs!')
+    return render_template('forms/new_artist.html', form=form)
+
+  try:
+    artist = Artist.query.get(artist_id)
+    artist.name = request.form['name']
+    artist.city = request.form['city']
+    artist.state = request.form['state']
+    artist.address = request.form['address']
+    artist.phone = request.form['phone']
+    artist.genres = request.form.getlist('genres')
+    artist.facebook_link = request.form['facebook_link']
+    artist.image_link = request.form['image_link']
+    artist.website_link = request.form['website_link']
+    artist.seeking_talent = request.form.get('seeking_talent', False, type=bool)
+    artist.seeking_description = request.form['seeking_description']
+    warm_later('artist', artist_id, artist.image_link)
+
+    db.session.commit()
+    invalidate_artist(artist_id)
+
+    flash('Artist ' + artist.name + ' was successfully edited!')
+  except:
+    db.session.rollback()
+    flash('Artist ' + artist.name + ' could not be edited!')
+  finally:
+    db.session.close()
+
+  return redirect(url_for('.show_artist', artist_id=artist_id))
+
+@pages.route('/venues/<int:venue_id>/edit', methods=['GET'])
+@read_only
+def edit_venue(venue_id):
+  form = VenueForm()
+ 
+  venue = Venue.query.get(venue_id)
+  form.name.data = venue.name
+  form.genres.data = venue.genres
+  form.address.data = venue.address
+  form.city.data = venue.city
+  form.state.data = venue.state
+  form.phone.data = venue.phone  
+  form.website_link.data = venue.website_link
+  form.facebook_link.data = venue.facebook_link
+  form.seeking_talent.data = venue.seeking_talent
+  form.seeking_description.data = venue.seeking_description
+  form.image_link.data = venue.image_link
+
+  venue = {
+    'id': venue.id,
+    'name': venue.name,
+    'genres': venue.genres,
+    'address': venue.address,
+    'city': venue.city,
+    'state': venue.state,
+    'phone': venue.phone,  
+    'website': venue.website_link,
+    'facebook_link': venue.facebook_link,
+    'seeking_talent': venue.seeking_talent,
+    'seeking_description': venue.seeking_description,
+    'image_link': venue.image_link
+  }
+  # TODO: populate form with values from venue with ID <venue_id>
+  return render_template('forms/edit_venue.html', form=form, venue=venue)
+
+@pages.route('/venues/<int:venue_id>/edit', methods=['POST'])
+def edit_venue_submission(venue_id):
+  # TODO: take values from the form submitted, and update existing
+  # venue record with ID <venue_id> using the new attributes
+  form = VenueForm()
+
+  # Form validation
+  if not form.validate_on_submit():
+    flash('Please check your inputs!')
+    return render_template('forms/new_venue.html', form=form)
+
+  try:
+    venue = Venue.query.get(venue_id)
+    venue.name = request.form['name']
+    venue.city = request.form['city']
+    venue.state = request.form['state']
+    venue.address = request.form['address']
+    venue.phone = request.form['phone']
+    venue.genres = request.form.getlist('genres')
+    venue.facebook_link = request.form['facebook_link']
+    venue.image_link = request.form['image_link']
+    venue.website_link = request.form['website_link']
+    venue.seeking_talent = request.form.get('seeking_talent', False, type=bool)
+    venue.seeking_description = request.form['seeking_description']
+    warm_later('venue', venue_id, venue.image_link)
+
+    db.session.commit()
+    invalidate_venue(venue_id)
+
+    flash('Venue ' + venue.name + ' was successfully edited!')
+  except:
+    db.session.rollback()
+    flash('Venue ' + venue.name + ' could not be edited!')
+  finally:
+    db.session.close()
+
+  return redirect(url_for('.show_venue', venue_id=venue_id))
+
+#  Create Artist
+#  ----------------------------------------------------------------
+
+@pages.route('/artists/create', methods=['GET'])
+@read_only
+def create_artist_form():
+  form = ArtistForm()
+  return render_template('forms/new_artist.html', form=form)
+
+@pages.route('/artists/create', methods=['POST'])
+def create_artist_submission():
+  # called upon submitting the new artist listing form
+  # TODO: insert form data as a new Venue record in the db, instead
+  # TODO: modify data to be the data object returned from db insertion
+  form = ArtistForm()
+
+  if not form.validate_on_submit():
+    flash('Please check your inputs!')
+    return render_template('forms/new_artist.html', form=form)
+  
+  name = request.form['name'] 
+  city = request.form['city']
+  state = request.form['state']
+  phone = request.form['phone']
+  genres = request.form.getlist('genres')
+  facebook_link = request.form['facebook_link']
+  image_link = request.form['image_link']
+  website_link = request.form['website_link']
+  seeking_venue = request.form.get('seeking_venue', False, type=bool)
+  seeking_description = request.form['seeking_description']
+  try:
+    artist = Artist(name=name, city=city, state=state, phone=phone, genres=genres,
+                facebook_link=facebook_link, image_link=image_link, website_link=website_link,
+                seeking_venue=seeking_venue, seeking_description=seeking_description)
+    db.session.add(artist)
+    db.session.flush()
+    warm_later('artist', artist.id, image_link)
+    db.session.commit()
+    invalidate_artist_list()
+    # on successful db insert, flash success
+    flash('Artist ' + name + ' was successfully listed!')
+  except:
+    # TODO: on unsuccessful db insert, flash an error instead.
+    flash('An error occurred. Artist ' + name + ' could not be listed.')
+    db.session.rollback()
+    abort(500)
+  finally:
+    db.session.close()
+  
+  return render_template('pages/home.html')
+
+
+#  Shows
+#  ----------------------------------------------------------------
+
+def _show_window():
+  # the ShowWindow of the request's from/to/city, or None; ValueError when malformed
+  return show_window(request.args.get('from'), request.args.get('to'), request.args.get('city'),
+                     default_days=current_app.config['CALENDAR_DEFAULT_DAYS'],
+                     max_days=current_app.config['CALENDAR_MAX_DAYS'])
+
+def _show_window_key():
+  # the resolved window for the ETag and the page cache: a missing `from`
+  # means today, so the same query string names another range tomorrow
+  try:
+    window = _show_window()
+  except ValueError:
+    return ''
+  return '{}:{}'.format(window.start, window.end) if window else ''
+
+@pages.route('/shows')
+@read_only
+@conditional(lambda: listing_version('shows', Show, Venue, Artist, vary=_show_window_key()))
+@cache.cached('shows', vary_on_query=True, vary=_show_window_key)
+def shows():
+  # displays list of shows at /shows, one keyset page at a time; with
+  # from/to/city, those of a range of days under their month grid
+  per_page = request.args.get('per_page', current_app.config['SHOWS_PER_PAGE'], type=int)
+  per_page = max(1, min(per_page, current_app.config['SHOWS_MAX_PER_PAGE']))
+  try:
+    window = _show_window()
+    data, pager = show_page(per_page, after=request.args.get('after'), before=request.args.get('before'),
+                            chunk=current_app.config['LISTING_CHUNK'], window=window)
+  except ValueError:
+    abort(400)
+
+  months = show_calendar(window, show_days(window)) if window else None
+  return render_listing('pages/shows.html', shows=data, pager=pager, per_page=per_page,
+                        window=window, window_args=window_args(window) if window else {}, months=months)
+
+@pages.route('/shows/create')
+@read_only
+def create_shows():
+  # renders form. do not touch.
+  form = ShowForm()
+  return render_template('forms/new_show.html', form=form)
+
+@pages.route('/shows/create', methods=['POST'])
+def create_show_submission():
+  # called to create new shows in the db, upon submitting new show listing form
+  # TODO: insert form data as a new Show record in the db, instead
+  form = ShowForm()
+
+  artist_id = request.form['artist_id']
+  venue_id = request.form['venue_id']
+  start_time = request.form['start_time']
+
+  try:
+    start_time = parse_datetime(start_time)
+    # checks that the venue and artist exist and are free at that time
+    created, rejects = schedule_shows([{'artist_id': artist_id, 'venue_id': venue_id, 'start_time': start_time}])
+    if rejects:
+      messages = [message for errors in rejects[0]['errors'].values() for message in errors]
+      flash('Show could not be listed. ' + ' '.join(messages))
+    else:
+      # on successful db insert, flash success
+      flash('Show was successfully listed!')
+  except:
+    db.session.rollback()
+    # TODO: on unsuccessful db insert, flash an error instead.
+    flash('An error occurred. Show could not be listed.')
+  finally:
+    db.session.close()
+  
+  # see: http://flask.pocoo.org/docs/1.0/patterns/flashing/
+  return render_template('pages/home.html')
+
+#  Diagnostics
+#  ----------------------------------------------------------------
+
+def pool_status():
+  # connection pool usage of the worker serving this request, per engine
+  engines = {'primary': db.get_engine()}
+  for n, engine in enumerate(current_app.extensions['db_replicas'], 1):
+    engines['replica-{}'.format(n)] = engine
+  return jsonify(pool_stats.snapshot(engines))
+
+@pages.record
+def _diagnostics(state):
+  # only in debug mode or with DIAGNOSTICS_ENDPOINTS
+  if state.app.debug or state.app.config.get('DIAGNOSTICS_ENDPOINTS'):
+    state.add_url_rule('/debug/pool', view_func=pool_status)
+
+@pages.app_errorhandler(404)
+def not_found_error(error):
+    return render_template('errors/404.html'), 404
+
+@pages.app_errorhandler(500)
+def server_error(error):
+    return render_template('errors/500.html'), 500